@@ -20,6 +20,7 @@ from __future__ import annotations
 import logging
 import os
 import time
+from collections import Counter
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from typing import Any, Optional
@@ -142,6 +143,7 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down Product Expert System...")
+    embedder.close()
 
 
 def _seed_reference_data(repo: InMemoryRepository):
@@ -699,7 +701,7 @@ async def list_products(
     start = (page - 1) * page_size
     page_items = filtered[start:start + page_size]
 
-    return ProductListResponse(
+    return ProductListResponse.model_construct(
         products=[_product_to_response(p) for p in page_items],
         total=total,
         page=page,
@@ -740,7 +742,7 @@ async def list_conflicts(
                 product_model = p.model_number
                 break
 
-        results.append(ConflictResponse(
+        results.append(ConflictResponse.model_construct(
             id=str(c.id),
             product_model=product_model,
             spec_name=c.spec_name,
@@ -877,28 +879,26 @@ async def system_stats(
     """System statistics. Requires sales_engineer+ role."""
     products = list(_state.repo.products.values())
 
-    # Brand distribution
-    brand_counts: dict[str, int] = {}
-    for p in products:
-        for code, b in _state.repo.brands.items():
-            if p.brand_id == b.id:
-                brand_counts[code] = brand_counts.get(code, 0) + 1
-                break
+    # Brand / family distribution: ids are mapped to codes once (the first
+    # code wins if two share an id), then each product is one lookup
+    brand_codes: dict[UUID, str] = {}
+    for code, b in _state.repo.brands.items():
+        brand_codes.setdefault(b.id, code)
+    family_codes: dict[UUID, str] = {}
+    for code, f in _state.repo.families.items():
+        family_codes.setdefault(f.id, code)
 
-    # Family distribution
-    family_counts: dict[str, int] = {}
-    for p in products:
-        for code, f in _state.repo.families.items():
-            if p.family_id == f.id:
-                family_counts[code] = family_counts.get(code, 0) + 1
-                break
+    brand_counts = dict(Counter(
+        code for p in products if (code := brand_codes.get(p.brand_id)) is not None))
+    family_counts = dict(Counter(
+        code for p in products if (code := family_codes.get(p.family_id)) is not None))
 
     pending = sum(
         1 for c in getattr(_state.repo, 'conflicts', [])
         if c.resolution == ConflictResolution.PENDING
     )
 
-    return StatsResponse(
+    return StatsResponse.model_construct(
         total_products=len(products),
         total_documents=len(getattr(_state.repo, 'documents', {})),
         total_chunks=len(getattr(_state.repo, 'chunks', [])),
@@ -965,7 +965,11 @@ async def find_equivalents(
 # ============================================================
 
 def _product_to_response(p: Product) -> ProductResponse:
-    """Convert Product model to API response."""
+    """
+    Convert Product model to API response.
+    Product fields are already typed, so the response is built with
+    model_construct; FastAPI still validates it against response_model.
+    """
     # Resolve brand and family names
     brand_name = ""
     for code, b in _state.repo.brands.items():
@@ -978,7 +982,7 @@ def _product_to_response(p: Product) -> ProductResponse:
             family_name = f.name
             break
 
-    return ProductResponse(
+    return ProductResponse.model_construct(
         model_number=p.model_number,
         brand=brand_name,
         family=family_name,
@@ -997,7 +1001,7 @@ def _product_to_response(p: Product) -> ProductResponse:
         ext_width_in=p.ext_width_in,
         ext_depth_in=p.ext_depth_in,
         ext_height_in=p.ext_height_in,
-        certifications=p.certifications,
+        certifications=list(p.certifications),
         specs={k: v for k, v in p.specs.items() if not k.startswith('_unknown_')},
         revision=p.revision,
         version=p.version,
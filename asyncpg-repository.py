@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import json
 import logging
+import struct
 import uuid
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
@@ -50,16 +51,20 @@ class DatabasePool:
             encoder=self._encode_vector,
             decoder=self._decode_vector,
             schema="public",
-            format="text",
+            format="binary",
         )
 
+    # pgvector binary wire format: int16 dim, int16 unused, then dim
+    # big-endian float4s -- vectors cross the wire as one buffer, with no
+    # per-element str()/float() boxing
     @staticmethod
-    def _encode_vector(v: list[float]) -> str:
-        return "[" + ",".join(str(x) for x in v) + "]"
+    def _encode_vector(v: np.ndarray | list[float]) -> bytes:
+        arr = np.asarray(v, dtype=">f4")
+        return struct.pack(">HH", arr.shape[0], 0) + arr.tobytes()
 
     @staticmethod
-    def _decode_vector(v: str) -> list[float]:
-        return [float(x) for x in v.strip("[]").split(",")]
+    def _decode_vector(v: bytes) -> np.ndarray:
+        return np.frombuffer(v, dtype=">f4", offset=4).astype(np.float32)
 
     @property
     def pool(self) -> asyncpg.Pool:
@@ -102,9 +107,11 @@ class AsyncPGProductRepository:
     - update_document_status(doc_id, status) -> None
     - add_chunks(chunks) -> list[str]
     - add_conflict(conflict_data) -> str
+    - add_conflicts(conflicts) -> list[str]
     - get_pending_conflicts(product_id?) -> list[dict]
     - resolve_conflict(conflict_id, resolution, resolved_by, override_value?) -> None
     - link_document_product(doc_id, product_id) -> None
+    - link_document_products(doc_id, product_ids) -> None
     - get_spec_registry() -> list[dict]
     - upsert_spec_registry(entries) -> None
     """
@@ -360,6 +367,19 @@ class AsyncPGProductRepository:
                 datetime.now(timezone.utc),
             )
 
+    async def link_document_products(self, doc_id: str, product_ids: list[str]) -> None:
+        """Link one document to many products in a single executemany round-trip."""
+        now = datetime.now(timezone.utc)
+        async with self.db.acquire() as conn:
+            await conn.executemany(
+                """
+                INSERT INTO document_products (document_id, product_id, linked_at)
+                VALUES ($1, $2, $3)
+                ON CONFLICT (document_id, product_id) DO NOTHING
+                """,
+                [(doc_id, pid, now) for pid in product_ids],
+            )
+
     # ── Chunks (RAG) ─────────────────────────────────────────────────────
 
     async def add_chunks(self, chunks: list[dict]) -> list[str]:
@@ -392,7 +412,7 @@ class AsyncPGProductRepository:
 
     async def vector_search(
         self,
-        embedding: list[float],
+        embedding: np.ndarray | list[float],
         limit: int = 20,
         product_id: Optional[str] = None,
         model_numbers: Optional[list[str]] = None,
@@ -487,6 +507,34 @@ class AsyncPGProductRepository:
             )
         return conflict_id
 
+    async def add_conflicts(self, conflicts: list[dict]) -> list[str]:
+        """Insert many conflicts in a single executemany round-trip."""
+        now = datetime.now(timezone.utc)
+        rows = [
+            (
+                str(uuid.uuid4()),
+                data["product_id"],
+                data.get("document_id"),
+                data["spec_name"],
+                str(data["existing_value"]),
+                str(data["new_value"]),
+                data.get("severity", "medium"),
+                now,
+            )
+            for data in conflicts
+        ]
+        async with self.db.acquire() as conn:
+            await conn.executemany(
+                """
+                INSERT INTO spec_conflicts 
+                    (id, product_id, document_id, spec_name, existing_value, new_value,
+                     severity, resolution, detected_at)
+                VALUES ($1, $2, $3, $4, $5, $6, $7, 'pending', $8)
+                """,
+                rows,
+            )
+        return [r[0] for r in rows]
+
     async def get_pending_conflicts(
         self, product_id: Optional[str] = None
     ) -> list[dict]:
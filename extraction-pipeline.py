@@ -13,6 +13,7 @@ from __future__ import annotations
 import hashlib
 import logging
 import re
+import sys
 import time
 from pathlib import Path
 from typing import Any, Optional
@@ -621,8 +622,12 @@ class DocumentExtractor:
 
         # Step 8: Track any newly discovered specs
         for spec in all_specs:
-            if spec.canonical_name and spec.canonical_name not in self.spec_registry:
-                self.newly_discovered_specs.append(spec.canonical_name)
+            if spec.canonical_name:
+                # Spec names are a small closed vocabulary; interning lets every
+                # downstream dict lookup on them short-circuit on identity
+                spec.canonical_name = sys.intern(spec.canonical_name)
+                if spec.canonical_name not in self.spec_registry:
+                    self.newly_discovered_specs.append(spec.canonical_name)
 
         # Step 9: Dedup specs (keep highest confidence)
         seen: dict[str, ExtractedSpec] = {}
@@ -14,15 +14,25 @@ Responsibilities:
   8. Chunking for RAG retrieval
 """
 from __future__ import annotations
+import asyncio
 import hashlib
 import logging
+import operator
+import os
 import re
+import sys
 import time
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor
 from datetime import date, datetime, timezone
+from functools import lru_cache
+from itertools import chain, pairwise
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 from uuid import UUID, uuid4
-from dataclasses import dataclass, field
+
+import numpy as np
+from dataclasses import dataclass, field, replace
 from enum import Enum
 
 from models import (
@@ -52,23 +62,26 @@ class IngestionConfig:
     numeric_critical_threshold: float = 0.20      # 20% diff = critical
 
     # Specs where ANY change is critical (safety/compliance)
-    critical_specs: set[str] = field(default_factory=lambda: {
+    critical_specs: frozenset[str] = field(default_factory=lambda: frozenset({
         'voltage_v', 'amperage', 'refrigerant', 'certifications',
         'nsf_ansi_456_certified', 'temp_range_min_c', 'temp_range_max_c',
         'nfpa_compliance', 'intrinsically_safe',
-    })
+    }))
 
     # Specs where minor formatting diffs should be ignored
-    normalize_before_compare: set[str] = field(default_factory=lambda: {
+    normalize_before_compare: frozenset[str] = field(default_factory=lambda: frozenset({
         'compressor_type', 'condenser_type', 'evaporator_type',
         'defrost_type', 'controller_type', 'display_type',
         'exterior_material', 'interior_lighting', 'mounting_type',
-    })
+    }))
 
     # Max chunk size for RAG (tokens approx)
     chunk_max_tokens: int = 512
     chunk_overlap_tokens: int = 64
 
+    # Chunks written per create_chunks call while streaming a document
+    chunk_flush_size: int = 256
+
     # Auto-approve spec updates from newer doc revisions
     auto_accept_newer_revision: bool = True
 
@@ -78,6 +91,21 @@ class IngestionConfig:
     # Whether to create products for unknown model numbers
     auto_create_products: bool = True
 
+    # Max files ingested concurrently within one batch
+    max_concurrency: int = 8
+
+    # Worker processes for CPU-bound extraction/chunking (0 = run inline)
+    cpu_workers: int = 0
+
+    # Dedup checksum: 'sha256' (default), or the faster non-cryptographic
+    # 'blake3' / 'xxh3' (need the blake3 / xxhash packages)
+    checksum_algo: str = 'sha256'
+
+    def __post_init__(self):
+        # Accept any iterable from callers; membership is checked per spec
+        self.critical_specs = frozenset(self.critical_specs)
+        self.normalize_before_compare = frozenset(self.normalize_before_compare)
+
 
 DEFAULT_CONFIG = IngestionConfig()
 
@@ -234,6 +262,14 @@ MODEL_FAMILY_PATTERNS: list[tuple[str, dict[str, Any]]] = [
     }),
 ]
 
+# Intern repeated metadata strings so every resolution shares one object
+_INTERNED_META_KEYS = ('brand_code', 'family_code', 'product_line',
+                       'product_type', 'controller_tier')
+for _pattern, _meta in MODEL_FAMILY_PATTERNS:
+    for _key in _INTERNED_META_KEYS:
+        if _meta.get(_key) is not None:
+            _meta[_key] = sys.intern(_meta[_key])
+
 
 @dataclass
 class ModelResolution:
@@ -250,34 +286,47 @@ class ModelResolution:
     matched_pattern: Optional[str] = None
 
 
+# Per-pattern (compiled regex, resolution template, capacity group, door group, door map),
+# built once so a match only has to fill in the model-specific fields
+_MODEL_RESOLVERS: list[tuple[re.Pattern, ModelResolution,
+                             Optional[int], Optional[int], dict[str, str]]] = [
+    (
+        re.compile(pattern),
+        ModelResolution(
+            model_number='',
+            brand_code=meta['brand_code'],
+            family_code=meta['family_code'],
+            product_line=meta.get('product_line'),
+            product_type=meta.get('product_type', 'refrigerator'),
+            controller_tier=meta.get('controller_tier'),
+            nsf_ansi_456=meta.get('nsf_ansi_456', False),
+            matched_pattern=sys.intern(pattern),
+        ),
+        meta.get('capacity_group'),
+        meta.get('door_group'),
+        meta.get('door_map', {}),
+    )
+    for pattern, meta in MODEL_FAMILY_PATTERNS
+]
+
+
 def resolve_model_number(model: str) -> Optional[ModelResolution]:
     """Match a model number against known patterns to infer product metadata."""
     model = model.strip()
-    for pattern, meta in MODEL_FAMILY_PATTERNS:
-        m = re.match(pattern, model)
+    for regex, template, cap_grp, door_grp, door_map in _MODEL_RESOLVERS:
+        m = regex.match(model)
         if m:
-            res = ModelResolution(
-                model_number=model,
-                brand_code=meta['brand_code'],
-                family_code=meta['family_code'],
-                product_line=meta.get('product_line'),
-                product_type=meta.get('product_type', 'refrigerator'),
-                controller_tier=meta.get('controller_tier'),
-                nsf_ansi_456=meta.get('nsf_ansi_456', False),
-                matched_pattern=pattern,
-            )
+            res = replace(template, model_number=model)
+            groups = m.groups()
+            n_groups = len(groups)
             # Extract capacity from regex group
-            cap_grp = meta.get('capacity_group')
-            if cap_grp and cap_grp <= len(m.groups()):
-                try:
-                    res.inferred_capacity = float(m.group(cap_grp))
-                except (ValueError, TypeError):
-                    pass
+            if cap_grp and cap_grp <= n_groups:
+                cap = groups[cap_grp - 1]
+                if cap and cap.replace('.', '', 1).isdigit():
+                    res.inferred_capacity = float(cap)
             # Extract door type from regex group
-            door_grp = meta.get('door_group')
-            door_map = meta.get('door_map', {})
-            if door_grp and door_grp <= len(m.groups()):
-                code = m.group(door_grp)
+            if door_grp and door_grp <= n_groups:
+                code = groups[door_grp - 1]
                 res.inferred_door_type = door_map.get(code, code.lower())
             return res
     return None
@@ -291,9 +340,14 @@ def normalize_spec_value(val: Any) -> str:
     """Normalize a spec value for comparison."""
     if val is None:
         return ''
-    s = str(val).strip().lower()
-    # Remove extra whitespace
-    s = re.sub(r'\s+', ' ', s)
+    return _normalize_spec_str(str(val))
+
+
+@lru_cache(maxsize=4096)
+def _normalize_spec_str(s: str) -> str:
+    """Cached core of normalize_spec_value — spec values repeat heavily across docs."""
+    # Collapse runs of whitespace (split/join also strips the ends)
+    s = ' '.join(s.lower().split())
     # Normalize common abbreviations
     s = s.replace('non-applicable', 'n/a')
     s = s.replace('non applicable', 'n/a')
@@ -301,6 +355,9 @@ def normalize_spec_value(val: Any) -> str:
     return s
 
 
+_SEPARATORS_RE = re.compile(r'[\s_\-]+')
+
+
 def detect_conflict(
     spec_name: str,
     existing_val: Any,
@@ -324,8 +381,8 @@ def detect_conflict(
     # For normalized-before-compare specs, be lenient
     if spec_name in config.normalize_before_compare:
         # Strip underscores, hyphens, extra words
-        e_clean = re.sub(r'[\s_\-]+', '', e_norm)
-        n_clean = re.sub(r'[\s_\-]+', '', n_norm)
+        e_clean = _SEPARATORS_RE.sub('', e_norm)
+        n_clean = _SEPARATORS_RE.sub('', n_norm)
         if e_clean == n_clean:
             return None
 
@@ -363,35 +420,96 @@ def detect_conflict(
             f'{spec_name}: "{existing_val}" → "{new_val}"')
 
 
+def numeric_within_tolerance(
+    pairs: list[tuple[Any, Any]],
+    config: IngestionConfig = DEFAULT_CONFIG,
+) -> list[bool]:
+    """
+    Vectorized pre-check for detect_conflict over (existing, new) pairs.
+    True means both values are numeric and within
+    numeric_conflict_threshold, i.e. detect_conflict would return None;
+    False means the pair must still go through detect_conflict.
+    """
+    idx: list[int] = []
+    existing: list[float] = []
+    new: list[float] = []
+    for i, (e, n) in enumerate(pairs):
+        try:
+            e_num, n_num = float(e), float(n)
+        except (ValueError, TypeError):
+            continue
+        idx.append(i)
+        existing.append(e_num)
+        new.append(n_num)
+
+    within = [False] * len(pairs)
+    if not idx:
+        return within
+
+    e_arr = np.array(existing, dtype=np.float64)
+    n_arr = np.array(new, dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        denom = np.maximum(np.maximum(np.abs(e_arr), np.abs(n_arr)), 1e-9)
+        ok = np.abs(e_arr - n_arr) / denom <= config.numeric_conflict_threshold
+    for i in np.flatnonzero(ok).tolist():
+        within[idx[i]] = True
+    return within
+
+
+# ============================================================
+# Document Checksums
+# ============================================================
+
+def compute_checksum(data: bytes, algo: str = 'sha256') -> str:
+    """
+    Content checksum used for document dedup.
+    Non-SHA-256 digests are prefixed with the algorithm name so documents
+    hashed under different settings never collide in the checksum index.
+    """
+    if algo == 'sha256':
+        return hashlib.sha256(data).hexdigest()
+    if algo == 'blake3':
+        from blake3 import blake3
+        return f'blake3:{blake3(data).hexdigest()}'
+    if algo == 'xxh3':
+        import xxhash
+        return f'xxh3:{xxhash.xxh3_128_hexdigest(data)}'
+    raise ValueError(f"Unsupported checksum algorithm: {algo}")
+
+
 # ============================================================
 # Document Revision Comparison
 # ============================================================
 
 REVISION_PATTERN = re.compile(
-    r'Rev[_.\s]*(\d{2})[./](\d{2})[./](\d{2,4})', re.IGNORECASE
+    r'Rev[_.\s]*(\d{2})[./](\d{2})[./](\d{2,4})', re.IGNORECASE | re.ASCII
 )
 
+# Separated (Rev_03.18.25) or packed MMDDYYYY (Rev_07232025) in one pass
+_REVISION_COMBINED = re.compile(
+    r'Rev[_.\s]*(?:(\d{2})[./](\d{2})[./](\d{2,4})|(\d{2})(\d{2})(\d{4}))',
+    re.IGNORECASE | re.ASCII,
+)
+
+@lru_cache(maxsize=1024)
 def parse_revision_date(rev: Optional[str]) -> Optional[date]:
     """Parse revision strings like 'Rev_03.18.25' or 'Rev_07232025' into dates."""
     if not rev:
         return None
-    m = REVISION_PATTERN.search(rev)
-    if m:
+    m = _REVISION_COMBINED.search(rev)
+    if not m:
+        return None
+    if m.group(1) is not None:
         mm, dd, yy = int(m.group(1)), int(m.group(2)), int(m.group(3))
         if yy < 100:
             yy += 2000
-        try:
-            return date(yy, mm, dd)
-        except ValueError:
-            return None
-    # Try MMDDYYYY format: Rev_07232025
-    m2 = re.search(r'Rev[_.\s]*(\d{2})(\d{2})(\d{4})', rev, re.IGNORECASE)
-    if m2:
-        try:
-            return date(int(m2.group(3)), int(m2.group(1)), int(m2.group(2)))
-        except ValueError:
-            return None
-    return None
+    else:
+        # MMDDYYYY format: Rev_07232025
+        mm, dd, yy = int(m.group(4)), int(m.group(5)), int(m.group(6))
+    try:
+        return date(yy, mm, dd)
+    except ValueError:
+        return None
 
 
 def is_newer_revision(new_rev: Optional[str], existing_rev: Optional[str]) -> bool:
@@ -426,81 +544,74 @@ SECTION_HEADERS = [
     'PHARMACY', 'VACCINE',
 ]
 
+_SECTION_HEADER_RE = re.compile(
+    rf'^[\s]*({"|".join(re.escape(h) for h in SECTION_HEADERS)})[\s:]*$',
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+# Above this size, _split_by_size works on encoded bytes instead of str slices
+LARGE_DOC_CHARS = 64 * 1024
+
 
 def chunk_document(
     text: str,
     doc_type: DocType,
     max_tokens: int = 512,
     overlap: int = 64,
-) -> list[dict[str, Any]]:
+) -> Iterator[dict[str, Any]]:
     """
     Split document text into retrieval-ready chunks.
     Uses section headers as natural boundaries when possible.
+    Yields chunks lazily so callers can persist them in batches.
     """
     if not text or not text.strip():
-        return []
-
-    chunks = []
+        return
 
     # Try section-based chunking first
     sections = _split_by_sections(text)
-
-    if len(sections) > 1:
-        for sec_title, sec_text in sections:
-            # If section too large, sub-chunk it
-            if _estimate_tokens(sec_text) > max_tokens:
-                sub_chunks = _split_by_size(sec_text, max_tokens, overlap)
-                for i, sc in enumerate(sub_chunks):
-                    chunks.append({
-                        'content': sc,
-                        'section_title': sec_title,
-                        'chunk_type': _classify_chunk(sec_title, sc, doc_type),
-                        'token_count': _estimate_tokens(sc),
-                    })
-            else:
-                chunks.append({
-                    'content': sec_text,
-                    'section_title': sec_title,
-                    'chunk_type': _classify_chunk(sec_title, sec_text, doc_type),
-                    'token_count': _estimate_tokens(sec_text),
-                })
-    else:
+    if len(sections) <= 1:
         # No clear sections — chunk by size
-        raw_chunks = _split_by_size(text, max_tokens, overlap)
-        for rc in raw_chunks:
-            chunks.append({
-                'content': rc,
-                'section_title': None,
-                'chunk_type': _classify_chunk(None, rc, doc_type),
-                'token_count': _estimate_tokens(rc),
-            })
-
-    # Assign indexes
-    for i, c in enumerate(chunks):
-        c['chunk_index'] = i
+        sections = [(None, text)]
+        oversized = True
+    else:
+        oversized = False
 
-    return chunks
+    index = 0
+    for sec_title, sec_text in sections:
+        # If section too large, sub-chunk it
+        if oversized or _estimate_tokens(sec_text) > max_tokens:
+            pieces = _split_by_size(sec_text, max_tokens, overlap)
+        else:
+            pieces = (sec_text,)
+        for piece in pieces:
+            yield {
+                'content': piece,
+                'section_title': sec_title,
+                'chunk_type': _classify_chunk(sec_title, piece, doc_type),
+                'token_count': _estimate_tokens(piece),
+                'chunk_index': index,
+            }
+            index += 1
 
 
 def _split_by_sections(text: str) -> list[tuple[Optional[str], str]]:
     """Split text into (section_title, section_body) tuples."""
-    pattern = '|'.join(re.escape(h) for h in SECTION_HEADERS)
-    header_re = re.compile(rf'^[\s]*({pattern})[\s:]*$', re.IGNORECASE | re.MULTILINE)
-
-    matches = list(header_re.finditer(text))
-    if not matches:
+    matches = _SECTION_HEADER_RE.finditer(text)
+    first = next(matches, None)
+    if first is None:
         return [(None, text)]
 
     sections = []
     # Content before first header
-    if matches[0].start() > 50:
-        sections.append(('Preamble', text[:matches[0].start()].strip()))
+    if first.start() > 50:
+        sections.append(('Preamble', text[:first.start()].strip()))
 
-    for i, m in enumerate(matches):
+    # Stream (header, next_header) pairs; None marks end of text
+    for m, next_m in pairwise(chain((first,), matches, (None,))):
         title = m.group(1).strip().title()
-        start = m.end()
-        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
-        body = text[start:end].strip()
+        end = next_m.start() if next_m is not None else len(text)
+        body = text[m.end():end].strip()
         if body:
             sections.append((title, body))
 
@@ -516,6 +627,9 @@ def _split_by_size(text: str, max_tokens: int, overlap: int) -> list[str]:
     if len(text) <= max_chars:
         return [text]
 
+    if len(text) > LARGE_DOC_CHARS:
+        return _split_bytes_by_size(text.encode('utf-8'), max_chars, overlap_chars)
+
     chunks = []
     start = 0
     while start < len(text):
@@ -540,6 +654,46 @@ def _split_by_size(text: str, max_tokens: int, overlap: int) -> list[str]:
     return chunks
 
 
+def _split_bytes_by_size(buf: bytes, max_len: int, overlap_len: int) -> list[str]:
+    """
+    Byte-offset variant of _split_by_size for very large documents.
+    Slices a memoryview so only the emitted chunks are copied and decoded.
+    """
+    mv = memoryview(buf)
+    n = len(buf)
+    chunks = []
+    start = 0
+    while start < n:
+        end = start + max_len
+        if end < n:
+            para_break = buf.rfind(b'\n\n', start + max_len // 2, end)
+            if para_break > start:
+                end = para_break
+            else:
+                sent_break = buf.rfind(b'. ', start + max_len // 2, end)
+                if sent_break > start:
+                    end = sent_break + 1
+            end = _utf8_char_start(buf, end)
+
+        chunk = str(mv[start:end], 'utf-8', 'replace').strip()
+        if chunk:
+            chunks.append(chunk)
+        start = _utf8_char_start(buf, end - overlap_len)
+
+    return chunks
+
+
+def _utf8_char_start(buf: bytes, pos: int) -> int:
+    """Move pos back to the first byte of the UTF-8 character containing it."""
+    while 0 < pos < len(buf) and buf[pos] & 0xC0 == 0x80:
+        pos -= 1
+    return pos
+
+
+_DIMENSION_RE = re.compile(r'\d+[\s"]\s*[xX×]\s*\d+')
+_SPEC_BLOCK_RE = re.compile(r'(Cu\.?\s*Ft|Defrost|Amps|R\d{3})')
+
+
 def _classify_chunk(
     section: Optional[str], content: str, doc_type: DocType
 ) -> str:
@@ -556,11 +710,11 @@ def _classify_chunk(
             return 'spec_block'
 
     c = content.upper()
-    if re.search(r'\d+[\s"]\s*[xX×]\s*\d+', c):
+    if _DIMENSION_RE.search(c):
         return 'dimensional'
     if any(x in c for x in ['UNIFORMITY', 'STABILITY', 'PROBE']):
         return 'performance_data'
-    if re.search(r'(Cu\.?\s*Ft|Defrost|Amps|R\d{3})', c):
+    if _SPEC_BLOCK_RE.search(c):
         return 'spec_block'
 
     return 'text'
@@ -595,6 +749,15 @@ PRODUCT_FIXED_COLUMNS: dict[str, str] = {
 # Everything else goes into specs JSONB
 # No explicit mapping needed — canonical_name becomes the key
 
+# Accessors resolved once so spec helpers dispatch without string lookups
+_FIXED_GETTERS: dict[str, Any] = {
+    spec: operator.attrgetter(col) for spec, col in PRODUCT_FIXED_COLUMNS.items()
+}
+_FIXED_SETTERS: dict[str, Any] = {
+    spec: (lambda p, v, c=col: setattr(p, c, v))
+    for spec, col in PRODUCT_FIXED_COLUMNS.items()
+}
+
 
 # ============================================================
 # Database Abstraction Layer (Repository Pattern)
@@ -612,6 +775,13 @@ class ProductRepository:
     async def create_document(self, doc: Document) -> Document:
         raise NotImplementedError
 
+    async def get_or_create_document(self, doc: Document) -> tuple[Document, bool]:
+        """Return (document, created). Backends should fuse check + insert."""
+        existing = await self.get_document_by_checksum(doc.checksum_sha256)
+        if existing:
+            return existing, False
+        return await self.create_document(doc), True
+
     async def update_document_status(self, doc_id: UUID, status: DocStatus,
                                       log_entry: Optional[dict] = None) -> None:
         raise NotImplementedError
@@ -619,9 +789,20 @@ class ProductRepository:
     async def get_product_by_model(self, model_number: str) -> Optional[Product]:
         raise NotImplementedError
 
+    async def get_products(self, keys: list[str]) -> dict[str, Product]:
+        """Products by id string or model number, in one call; misses are omitted."""
+        raise NotImplementedError
+
     async def create_product(self, product: Product) -> Product:
         raise NotImplementedError
 
+    async def get_or_create_product(self, product: Product) -> tuple[Product, bool]:
+        """Return (product, created). Backends should fuse check + insert."""
+        existing = await self.get_product_by_model(product.model_number)
+        if existing:
+            return existing, False
+        return await self.create_product(product), True
+
     async def update_product(self, product: Product) -> Product:
         raise NotImplementedError
 
@@ -634,10 +815,25 @@ class ProductRepository:
     async def create_spec_conflict(self, conflict: SpecConflict) -> SpecConflict:
         raise NotImplementedError
 
+    async def create_spec_conflicts(self, conflicts: list[SpecConflict]) -> None:
+        """Bulk insert. Backends should override with executemany / COPY."""
+        for conflict in conflicts:
+            await self.create_spec_conflict(conflict)
+
     async def link_document_product(self, doc_id: UUID, product_id: UUID,
                                      relevance: str, extracted_specs: dict) -> None:
         raise NotImplementedError
 
+    async def link_document_products(
+        self, links: list[tuple[UUID, UUID, str, dict]]
+    ) -> None:
+        """
+        Bulk link from (doc_id, product_id, relevance, extracted_specs) rows.
+        Backends should override with executemany / COPY.
+        """
+        for doc_id, product_id, relevance, extracted_specs in links:
+            await self.link_document_product(doc_id, product_id, relevance, extracted_specs)
+
     async def create_chunks(self, chunks: list[DocumentChunk]) -> None:
         raise NotImplementedError
 
@@ -683,6 +879,13 @@ class InMemoryRepository(ProductRepository):
         self._checksum_index[doc.checksum_sha256] = doc.id
         return doc
 
+    async def get_or_create_document(self, doc: Document) -> tuple[Document, bool]:
+        existing_id = self._checksum_index.setdefault(doc.checksum_sha256, doc.id)
+        if existing_id != doc.id:
+            return self.documents[existing_id], False
+        self.documents[doc.id] = doc
+        return doc, True
+
     async def update_document_status(self, doc_id: UUID, status: DocStatus,
                                       log_entry: Optional[dict] = None) -> None:
         if doc_id in self.documents:
@@ -694,11 +897,32 @@ class InMemoryRepository(ProductRepository):
         pid = self._model_index.get(model_number)
         return self.products.get(pid) if pid else None
 
+    async def get_products(self, keys: list[str]) -> dict[str, Product]:
+        found: dict[str, Product] = {}
+        for key in keys:
+            try:
+                product = self.products.get(UUID(key))
+            except ValueError:
+                product = None
+            if product is None or str(product.id) != key:
+                pid = self._model_index.get(key)
+                product = self.products.get(pid) if pid else None
+            if product is not None:
+                found[key] = product
+        return found
+
     async def create_product(self, product: Product) -> Product:
         self.products[product.id] = product
         self._model_index[product.model_number] = product.id
         return product
 
+    async def get_or_create_product(self, product: Product) -> tuple[Product, bool]:
+        existing_id = self._model_index.setdefault(product.model_number, product.id)
+        if existing_id != product.id:
+            return self.products[existing_id], False
+        self.products[product.id] = product
+        return product, True
+
     async def update_product(self, product: Product) -> Product:
         self.products[product.id] = product
         return product
@@ -713,6 +937,9 @@ class InMemoryRepository(ProductRepository):
         self.conflicts.append(conflict)
         return conflict
 
+    async def create_spec_conflicts(self, conflicts: list[SpecConflict]) -> None:
+        self.conflicts.extend(conflicts)
+
     async def link_document_product(self, doc_id: UUID, product_id: UUID,
                                      relevance: str, extracted_specs: dict) -> None:
         self.doc_product_links.append({
@@ -722,6 +949,19 @@ class InMemoryRepository(ProductRepository):
             'extracted_specs': extracted_specs,
         })
 
+    async def link_document_products(
+        self, links: list[tuple[UUID, UUID, str, dict]]
+    ) -> None:
+        self.doc_product_links.extend(
+            {
+                'document_id': doc_id,
+                'product_id': product_id,
+                'relevance': relevance,
+                'extracted_specs': extracted_specs,
+            }
+            for doc_id, product_id, relevance, extracted_specs in links
+        )
+
     async def create_chunks(self, chunks: list[DocumentChunk]) -> None:
         self.chunks.extend(chunks)
 
@@ -777,6 +1017,47 @@ class IngestionOrchestrator:
         self.repo = repo
         self.config = config
         self.extractor = extractor or DocumentExtractor()
+        self._cpu_pool: Optional[Executor] = (
+            ProcessPoolExecutor(max_workers=config.cpu_workers)
+            if config.cpu_workers > 0 else None
+        )
+        # Brand/family lookups repeat across a batch; cleared per job
+        self._brand_cache: dict[str, Optional[Brand]] = {}
+        self._family_cache: dict[str, Optional[ProductFamily]] = {}
+        # One lock per normalized model number: files in a batch (and models
+        # within a file) run concurrently, and two of them resolving the same
+        # product must not interleave its lookup, create and spec merge.
+        # Weak values: a lock lives only while some task holds or awaits it.
+        self._product_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = (
+            weakref.WeakValueDictionary())
+
+    def shutdown(self) -> None:
+        """Release the CPU worker pool, if one was started."""
+        if self._cpu_pool is not None:
+            self._cpu_pool.shutdown()
+            self._cpu_pool = None
+
+    async def _run_cpu(self, fn, *args):
+        """Run a CPU-bound callable in the worker pool, or inline without one."""
+        if self._cpu_pool is None:
+            return fn(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._cpu_pool, fn, *args)
+
+    async def _extract(
+        self, text: str, filename: str, raw_bytes: bytes | bytearray | memoryview,
+    ) -> tuple[ExtractionResult, list[str]]:
+        """Run extraction; returns (result, spec names not in the registry)."""
+        if self._cpu_pool is None:
+            extraction = self.extractor.extract(text, filename, raw_bytes)
+            # Taken before any await — other files in the batch share this extractor
+            new_specs = list(self.extractor.newly_discovered_specs)
+            self.extractor.newly_discovered_specs.clear()
+            return extraction, new_specs
+        return await self._run_cpu(
+            _extract_worker, type(self.extractor), self.extractor.spec_registry,
+            text, filename, bytes(raw_bytes),  # memoryviews don't pickle
+        )
 
     # ----------------------------------------------------------
     # Public API
@@ -793,8 +1074,11 @@ class IngestionOrchestrator:
 
         Args:
             files: list of dicts with keys:
-                   'filename': str, 'content': bytes | str,
+                   'filename': str,
+                   'content': bytes | bytearray | memoryview | str,
                    'mime_type': str (optional)
+                   Instead of 'content', 'path' may name a file to read
+                   when its turn comes, bounding memory to max_concurrency files.
             submitted_by: user ID
             metadata: optional job metadata
 
@@ -802,24 +1086,33 @@ class IngestionOrchestrator:
             (job_id, stats)
         """
         stats = IngestionStats(total_files=len(files))
+        self._brand_cache.clear()
+        self._family_cache.clear()
 
         job_id = await self.repo.create_ingestion_job({
             'status': 'processing',
             'total_files': len(files),
             'submitted_by': submitted_by,
             'metadata': metadata or {},
-            'started_at': datetime.now(timezone.utc).isoformat(),
+            'started_at': _now(),
         })
 
-        for file_info in files:
-            try:
-                await self._ingest_single_file(file_info, stats)
-                stats.processed_files += 1
-            except Exception as e:
-                stats.failed_files += 1
-                err = f"Failed to ingest {file_info.get('filename', '?')}: {e}"
-                stats.errors.append(err)
-                logger.exception(err)
+        # Files overlap on DB I/O; stats updates never straddle an await,
+        # so sharing one IngestionStats across tasks is safe on the event loop
+        sem = asyncio.Semaphore(self.config.max_concurrency)
+
+        async def _run(file_info: dict) -> None:
+            async with sem:
+                try:
+                    await self._ingest_single_file(file_info, stats)
+                    stats.processed_files += 1
+                except Exception as e:
+                    stats.failed_files += 1
+                    err = f"Failed to ingest {file_info.get('filename', '?')}: {e}"
+                    stats.errors.append(err)
+                    logger.exception(err)
+
+        await asyncio.gather(*(_run(f) for f in files))
 
         # Finalize job
         final_status = 'completed' if stats.failed_files == 0 else (
@@ -833,7 +1126,7 @@ class IngestionOrchestrator:
             'updated_products': stats.updated_products,
             'new_specs_discovered': stats.new_specs_discovered,
             'conflicts_found': stats.conflicts_found,
-            'completed_at': datetime.now(timezone.utc).isoformat(),
+            'completed_at': _now(),
         })
 
         return job_id, stats
@@ -841,7 +1134,7 @@ class IngestionOrchestrator:
     async def ingest_single(
         self,
         filename: str,
-        content: bytes | str,
+        content: bytes | bytearray | memoryview | str,
         mime_type: str = 'application/pdf',
     ) -> tuple[ExtractionResult, IngestionStats]:
         """Convenience: ingest one file directly."""
@@ -851,11 +1144,12 @@ class IngestionOrchestrator:
             'content': content,
             'mime_type': mime_type,
         }
-        await self._ingest_single_file(file_info, stats)
+        result = await self._ingest_single_file(file_info, stats)
         stats.processed_files = 1
-        # Return the extraction result for inspection
-        text = content if isinstance(content, str) else content.decode('utf-8', errors='replace')
-        result = self.extractor.extract(text, filename)
+        if result is None:
+            # Duplicate skipped before extraction; extract only for inspection
+            text = content if isinstance(content, str) else str(content, 'utf-8', 'replace')
+            result, _ = await self._extract(text, filename, b'')
         return result, stats
 
     # ----------------------------------------------------------
@@ -864,27 +1158,37 @@ class IngestionOrchestrator:
 
     async def _ingest_single_file(
         self, file_info: dict, stats: IngestionStats
-    ) -> None:
+    ) -> Optional[ExtractionResult]:
+        """
+        Ingest one file. Returns its extraction result, or None if the file
+        was skipped as a duplicate before extraction.
+        """
         filename = file_info.get('filename', 'unknown')
-        content = file_info['content']
+        content = file_info.get('content')
+        if content is None:
+            # Lazy file: read off the event loop only once a batch slot is free
+            content = await asyncio.to_thread(Path(file_info['path']).read_bytes)
         mime_type = file_info.get('mime_type', 'application/octet-stream')
 
         # --- Step 1: Compute checksum & dedup ---
-        raw_bytes = content if isinstance(content, bytes) else content.encode('utf-8')
-        checksum = hashlib.sha256(raw_bytes).hexdigest()
+        # Bytes-like content (e.g. a pooled upload buffer) is hashed and
+        # decoded in place, without copying it into a new bytes object
+        raw_bytes = content.encode('utf-8') if isinstance(content, str) else content
+        size = memoryview(raw_bytes).nbytes
+        checksum = compute_checksum(raw_bytes, self.config.checksum_algo)
 
         existing_doc = await self.repo.get_document_by_checksum(checksum)
         if existing_doc:
             stats.skipped_duplicate += 1
             stats.warnings.append(f"Duplicate skipped: {filename} (matches {existing_doc.filename})")
             logger.info(f"Skipping duplicate: {filename}")
-            return
+            return None
 
         # --- Step 2: Extract text (in production: PDF→text via PyMuPDF) ---
-        text = content if isinstance(content, str) else content.decode('utf-8', errors='replace')
+        text = content if isinstance(content, str) else str(content, 'utf-8', 'replace')
 
         # --- Step 3: Run extraction pipeline ---
-        extraction = self.extractor.extract(text, filename, raw_bytes)
+        extraction, new_specs = await self._extract(text, filename, raw_bytes)
 
         # --- Step 4: Create document record ---
         doc = Document(
@@ -893,12 +1197,18 @@ class IngestionOrchestrator:
             mime_type=mime_type,
             source_uri=f'ingestion://{filename}',
             checksum_sha256=checksum,
-            file_size_bytes=len(raw_bytes),
+            file_size_bytes=size,
             extracted_text=text[:50000],  # Cap stored text
             status=DocStatus.PROCESSING,
             metadata={'extraction_time_ms': extraction.extraction_time_ms},
         )
-        doc = await self.repo.create_document(doc)
+        doc, created = await self.repo.get_or_create_document(doc)
+        if not created:
+            # Same checksum landed between the lookup above and this insert
+            stats.skipped_duplicate += 1
+            stats.warnings.append(f"Duplicate skipped: {filename} (matches {doc.filename})")
+            logger.info(f"Skipping duplicate: {filename}")
+            return extraction
 
         # --- Step 5: Resolve model numbers → products ---
         if not extraction.model_numbers:
@@ -907,22 +1217,38 @@ class IngestionOrchestrator:
                 doc.id, DocStatus.PROCESSED,
                 {'stage': 'model_resolution', 'status': 'no_models', 'timestamp': _now()})
             # Still chunk for RAG even without product linkage
-            await self._create_chunks(doc, text, extraction)
-            stats.chunks_created += 1
-            return
-
-        for model_num in extraction.model_numbers:
-            await self._process_model(
-                model_num, extraction, doc, stats
+            await asyncio.gather(
+                self._create_chunks(doc, text, extraction, []),
+                *(self._register_new_spec(spec_name, stats) for spec_name in new_specs),
             )
+            stats.chunks_created += 1
+            return extraction
 
-        # --- Step 6: Chunk document for RAG ---
-        await self._create_chunks(doc, text, extraction)
+        products = await asyncio.gather(*(
+            self._process_model(model_num, extraction, doc, stats)
+            for model_num in extraction.model_numbers
+        ))
 
-        # --- Step 7: Handle newly discovered specs ---
-        for spec_name in self.extractor.newly_discovered_specs:
-            await self._register_new_spec(spec_name, stats)
-        self.extractor.newly_discovered_specs.clear()
+        # --- Link document ↔ products in one bulk write ---
+        extracted_specs_dict = {
+            s.canonical_name: {
+                'raw': s.raw_value,
+                'parsed': s.parsed_value,
+                'confidence': s.confidence,
+            }
+            for s in extraction.specs if s.canonical_name
+        }
+        links = [(doc.id, p.id, 'primary', extracted_specs_dict) for p in products if p]
+        if links:
+            await self.repo.link_document_products(links)
+
+        # --- Steps 6 & 7: Chunk for RAG + register newly discovered specs ---
+        # Chunking runs after model resolution so chunks can be tagged with
+        # the products just created.
+        await asyncio.gather(
+            self._create_chunks(doc, text, extraction, products),
+            *(self._register_new_spec(spec_name, stats) for spec_name in new_specs),
+        )
 
         # --- Step 8: Mark document as processed ---
         await self.repo.update_document_status(
@@ -931,6 +1257,7 @@ class IngestionOrchestrator:
              'models': extraction.model_numbers,
              'specs_count': len(extraction.specs),
              'timestamp': _now()})
+        return extraction
 
     async def _process_model(
         self,
@@ -938,42 +1265,42 @@ class IngestionOrchestrator:
         extraction: ExtractionResult,
         doc: Document,
         stats: IngestionStats,
-    ) -> None:
-        """Resolve a single model number and update/create product."""
+    ) -> Optional[Product]:
+        """
+        Resolve a single model number and update/create product.
+        Returns the product to link, or None if it was not created.
+        """
 
         # --- Resolve model metadata ---
         resolution = resolve_model_number(model_num)
 
-        # --- Find or create product ---
-        product = await self.repo.get_product_by_model(model_num)
-
-        if product is None:
-            if not self.config.auto_create_products:
-                stats.warnings.append(f"Unknown model {model_num}, auto-create disabled")
-                return
-
-            product = await self._create_product(
-                model_num, resolution, extraction, doc, stats
-            )
-            stats.new_products += 1
-        else:
-            await self._update_product(
-                product, extraction, doc, stats
-            )
-            stats.updated_products += 1
+        lock_key = model_num.strip().upper()
+        lock = self._product_locks.get(lock_key)
+        if lock is None:
+            lock = self._product_locks[lock_key] = asyncio.Lock()
+        async with lock:
+            # --- Find or create product ---
+            product = await self.repo.get_product_by_model(model_num)
+
+            created = False
+            if product is None:
+                if not self.config.auto_create_products:
+                    stats.warnings.append(f"Unknown model {model_num}, auto-create disabled")
+                    return None
+
+                product, created = await self._create_product(
+                    model_num, resolution, extraction, doc, stats
+                )
+
+            if created:
+                stats.new_products += 1
+            else:
+                await self._update_product(
+                    product, extraction, doc, stats
+                )
+                stats.updated_products += 1
 
-        # --- Link document ↔ product ---
-        extracted_specs_dict = {
-            s.canonical_name: {
-                'raw': s.raw_value,
-                'parsed': s.parsed_value,
-                'confidence': s.confidence,
-            }
-            for s in extraction.specs if s.canonical_name
-        }
-        await self.repo.link_document_product(
-            doc.id, product.id, 'primary', extracted_specs_dict
-        )
+            return product
 
     async def _create_product(
         self,
@@ -982,15 +1309,18 @@ class IngestionOrchestrator:
         extraction: ExtractionResult,
         doc: Document,
         stats: IngestionStats,
-    ) -> Product:
-        """Create a new product from extraction results."""
+    ) -> tuple[Product, bool]:
+        """
+        Create a new product from extraction results.
+        Returns (product, created); created is False if the model already existed.
+        """
 
         # Resolve brand and family IDs
         brand_code = resolution.brand_code if resolution else (extraction.brand_code or 'ABS')
         family_code = resolution.family_code if resolution else 'premier_lab_ref'
 
-        brand = await self.repo.get_brand_by_code(brand_code)
-        family = await self.repo.get_family_by_code(family_code)
+        brand = await self._get_brand(brand_code)
+        family = await self._get_family(family_code)
 
         # Build product from extracted specs
         product = Product(
@@ -1014,9 +1344,10 @@ class IngestionOrchestrator:
             if resolution.inferred_door_type and not product.door_type:
                 product.door_type = resolution.inferred_door_type
 
-        product = await self.repo.create_product(product)
-        logger.info(f"Created product: {model_num} (family={family_code})")
-        return product
+        product, created = await self.repo.get_or_create_product(product)
+        if created:
+            logger.info(f"Created product: {model_num} (family={family_code})")
+        return product, created
 
     async def _update_product(
         self,
@@ -1032,21 +1363,40 @@ class IngestionOrchestrator:
 
         changes_made = False
         specs_to_apply = extraction.specs
+        pending_conflicts: list[SpecConflict] = []
 
+        # Snapshot current values once; changed specs are applied in one pass
+        current = dict(product.specs)
+        current.update({name: get(product) for name, get in _FIXED_GETTERS.items()})
+        changes: dict[str, Any] = {}
+
+        min_confidence = self.config.min_confidence
+        compared: list[tuple[ExtractedSpec, Any]] = []
         for spec in specs_to_apply:
             if not spec.canonical_name or spec.canonical_name.startswith('_unknown_'):
                 continue
-            if spec.confidence < self.config.min_confidence:
+            if spec.confidence < min_confidence:
                 continue
 
-            new_val = spec.parsed_value
-            existing_val = self._get_product_spec_value(product, spec.canonical_name)
+            existing_val = current.get(spec.canonical_name)
 
             # If product doesn't have this spec yet, just apply it
             if existing_val is None:
-                self._set_product_spec_value(product, spec.canonical_name, new_val)
-                changes_made = True
+                changes[spec.canonical_name] = spec.parsed_value
+            elif spec.parsed_value is not None:
+                compared.append((spec, existing_val))
+
+        # Numeric pairs within tolerance are settled in one vectorized pass;
+        # everything else goes through the full detect_conflict rules
+        within = numeric_within_tolerance(
+            [(existing_val, spec.parsed_value) for spec, existing_val in compared],
+            self.config,
+        )
+
+        for (spec, existing_val), settled in zip(compared, within):
+            if settled:
                 continue
+            new_val = spec.parsed_value
 
             # Check for conflict
             conflict = detect_conflict(
@@ -1061,10 +1411,9 @@ class IngestionOrchestrator:
 
             # Auto-accept if newer revision and config allows
             if is_newer and self.config.auto_accept_newer_revision:
-                self._set_product_spec_value(product, spec.canonical_name, new_val)
-                changes_made = True
+                changes[spec.canonical_name] = new_val
                 # Still log the conflict for audit trail
-                await self.repo.create_spec_conflict(SpecConflict(
+                pending_conflicts.append(SpecConflict(
                     product_id=product.id,
                     spec_name=spec.canonical_name,
                     existing_value=str(existing_val),
@@ -1076,7 +1425,7 @@ class IngestionOrchestrator:
                 logger.info(f"Auto-accepted (newer rev): {reason}")
             elif severity in (ConflictSeverity.CRITICAL, ConflictSeverity.HIGH):
                 # Flag for human review, don't auto-apply
-                await self.repo.create_spec_conflict(SpecConflict(
+                pending_conflicts.append(SpecConflict(
                     product_id=product.id,
                     spec_name=spec.canonical_name,
                     existing_value=str(existing_val),
@@ -1089,7 +1438,7 @@ class IngestionOrchestrator:
                 logger.warning(f"Conflict flagged: {reason}")
             else:
                 # Medium/Low — auto-accept from newer, otherwise flag
-                await self.repo.create_spec_conflict(SpecConflict(
+                pending_conflicts.append(SpecConflict(
                     product_id=product.id,
                     spec_name=spec.canonical_name,
                     existing_value=str(existing_val),
@@ -1099,6 +1448,13 @@ class IngestionOrchestrator:
                     resolution=ConflictResolution.PENDING,
                 ))
 
+        if changes:
+            self._apply_spec_changes(product, changes)
+            changes_made = True
+
+        if pending_conflicts:
+            await self.repo.create_spec_conflicts(pending_conflicts)
+
         # Update certifications (union)
         if extraction.certifications:
             merged = sorted(set(product.certifications + extraction.certifications))
@@ -1116,42 +1472,70 @@ class IngestionOrchestrator:
             product = await self.repo.update_product(product)
             logger.info(f"Updated product: {product.model_number} v{product.version}")
 
+    async def _get_brand(self, code: str) -> Optional[Brand]:
+        if code not in self._brand_cache:
+            self._brand_cache[code] = await self.repo.get_brand_by_code(code)
+        return self._brand_cache[code]
+
+    async def _get_family(self, code: str) -> Optional[ProductFamily]:
+        if code not in self._family_cache:
+            self._family_cache[code] = await self.repo.get_family_by_code(code)
+        return self._family_cache[code]
+
     # ----------------------------------------------------------
     # Spec Value Helpers
     # ----------------------------------------------------------
 
     def _get_product_spec_value(self, product: Product, spec_name: str) -> Any:
         """Get a spec value from fixed columns or dynamic specs."""
-        if spec_name in PRODUCT_FIXED_COLUMNS:
-            return getattr(product, PRODUCT_FIXED_COLUMNS[spec_name], None)
+        getter = _FIXED_GETTERS.get(spec_name)
+        if getter is not None:
+            return getter(product)
         return product.specs.get(spec_name)
 
     def _set_product_spec_value(self, product: Product, spec_name: str, value: Any) -> None:
         """Set a spec value to fixed column or dynamic specs."""
-        if spec_name in PRODUCT_FIXED_COLUMNS:
-            col = PRODUCT_FIXED_COLUMNS[spec_name]
-            setattr(product, col, value)
+        setter = _FIXED_SETTERS.get(spec_name)
+        if setter is not None:
+            setter(product, value)
         else:
             product.specs[spec_name] = value
 
+    def _apply_spec_changes(self, product: Product, changes: dict[str, Any]) -> None:
+        """Write a batch of spec changes: fixed columns via setters, the rest in one update."""
+        dynamic = {}
+        for spec_name, value in changes.items():
+            setter = _FIXED_SETTERS.get(spec_name)
+            if setter is not None:
+                setter(product, value)
+            else:
+                dynamic[spec_name] = value
+        product.specs.update(dynamic)
+
     def _apply_specs_to_product(self, product: Product, specs: list[ExtractedSpec]) -> None:
         """Apply all extracted specs to a product."""
-        for spec in specs:
-            if not spec.canonical_name:
-                continue
-            if spec.canonical_name.startswith('_unknown_'):
-                # Store unknowns in specs for later review
-                product.specs[spec.canonical_name] = spec.parsed_value
-                continue
-            if spec.confidence < self.config.min_confidence:
-                continue
+        min_confidence = self.config.min_confidence
+        applicable = [
+            s for s in specs
+            if s.canonical_name
+            and not s.canonical_name.startswith('_unknown_')
+            and s.confidence >= min_confidence
+        ]
+        for spec in applicable:
             self._set_product_spec_value(product, spec.canonical_name, spec.parsed_value)
 
+        # Store unknowns in specs for later review
+        product.specs.update({
+            s.canonical_name: s.parsed_value for s in specs
+            if s.canonical_name and s.canonical_name.startswith('_unknown_')
+        })
+
     def _find_revision(self, extraction: ExtractionResult) -> Optional[str]:
         """Find revision string from extracted specs."""
-        for s in extraction.specs:
-            if s.canonical_name in ('revision', '_unknown_revision'):
-                return str(s.parsed_value)
+        by_name = extraction.specs_by_name
+        s = by_name.get('revision') or by_name.get('_unknown_revision')
+        if s:
+            return str(s.parsed_value)
         # Also check raw text for revision pattern
         if extraction.raw_text:
             m = REVISION_PATTERN.search(extraction.raw_text)
@@ -1168,33 +1552,45 @@ class IngestionOrchestrator:
         doc: Document,
         text: str,
         extraction: ExtractionResult,
+        products: list[Optional[Product]],
     ) -> None:
-        """Create document chunks for RAG retrieval."""
-        raw_chunks = chunk_document(
+        """
+        Create document chunks for RAG retrieval, tagged with the products
+        already resolved for this document (None entries are skipped).
+        """
+        chunk_args = (
             text, extraction.doc_type,
-            max_tokens=self.config.chunk_max_tokens,
-            overlap=self.config.chunk_overlap_tokens,
+            self.config.chunk_max_tokens, self.config.chunk_overlap_tokens,
         )
+        if self._cpu_pool is None:
+            raw_chunks = chunk_document(*chunk_args)
+        else:
+            # Generators don't cross process boundaries; the worker returns a list
+            raw_chunks = await self._run_cpu(_chunk_document_list, *chunk_args)
 
         # Resolve product IDs for chunk tagging
-        product_ids = []
-        for model in extraction.model_numbers:
-            p = await self.repo.get_product_by_model(model)
-            if p:
-                product_ids.append(p.id)
+        product_ids = [p.id for p in products if p]
+        metadata = {
+            'doc_type': extraction.doc_type.value,
+            'brand': extraction.brand_code,
+        }
+        flush_size = self.config.chunk_flush_size
 
-        # Detect which specs are mentioned in each chunk
-        spec_names_set = {s.canonical_name for s in extraction.specs if s.canonical_name}
+        # Detect which specs are mentioned in each chunk; each spec's
+        # display-friendly form is computed once per document, not per chunk
+        spec_terms = sorted(
+            (sn, sn.replace('_', ' '))
+            for sn in {s.canonical_name for s in extraction.specs if s.canonical_name}
+        )
 
         chunks = []
         for rc in raw_chunks:
-            # Find spec names mentioned in this chunk
-            chunk_specs = []
-            for sn in spec_names_set:
-                # Check if the display-friendly version appears
-                readable = sn.replace('_', ' ')
-                if readable in rc['content'].lower() or sn in rc['content'].lower():
-                    chunk_specs.append(sn)
+            # Find spec names (canonical or display-friendly) mentioned in this chunk
+            content_lower = rc['content'].lower()
+            chunk_specs = [
+                sn for sn, readable in spec_terms
+                if readable in content_lower or sn in content_lower
+            ]
 
             chunk = DocumentChunk(
                 document_id=doc.id,
@@ -1204,13 +1600,13 @@ class IngestionOrchestrator:
                 section_title=rc.get('section_title'),
                 product_ids=product_ids,
                 spec_names=chunk_specs,
-                metadata={
-                    'doc_type': extraction.doc_type.value,
-                    'brand': extraction.brand_code,
-                },
+                metadata=dict(metadata),
                 token_count=rc.get('token_count'),
             )
             chunks.append(chunk)
+            if len(chunks) >= flush_size:
+                await self.repo.create_chunks(chunks)
+                chunks = []
 
         if chunks:
             await self.repo.create_chunks(chunks)
@@ -1242,6 +1638,24 @@ class IngestionOrchestrator:
 # Helpers
 # ============================================================
 
+def _extract_worker(
+    extractor_cls: type[DocumentExtractor],
+    spec_registry: dict,
+    text: str,
+    filename: str,
+    raw_bytes: bytes,
+) -> tuple[ExtractionResult, list[str]]:
+    """Process-pool entry point: extraction with a fresh, unshared extractor."""
+    extractor = extractor_cls(spec_registry)
+    extraction = extractor.extract(text, filename, raw_bytes)
+    return extraction, list(extractor.newly_discovered_specs)
+
+
+def _chunk_document_list(*args) -> list[dict[str, Any]]:
+    """Process-pool entry point: chunk_document materialized for pickling."""
+    return list(chunk_document(*args))
+
+
 def _now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
@@ -1265,7 +1679,6 @@ async def ingest_directory(
         config = DEFAULT_CONFIG
 
     orchestrator = IngestionOrchestrator(repo, config)
-    dir_path = Path(directory)
 
     supported = {'.pdf', '.txt', '.md', '.html', '.json'}
     mime_map = {
@@ -1276,15 +1689,27 @@ async def ingest_directory(
         '.json': 'application/json',
     }
 
+    # scandir entries carry d_type, so filtering needs no per-file stat
+    with os.scandir(directory) as it:
+        entries = [
+            e for e in it
+            if e.is_file(follow_symlinks=False)
+            and os.path.splitext(e.name)[1].lower() in supported
+        ]
+    # Shortest first: small files finish while large ones are still running,
+    # instead of a large file landing last and stretching the batch tail
+    entries.sort(key=lambda e: (e.stat(follow_symlinks=False).st_size, e.name))
+
+    # Files are read lazily inside ingest_batch, so at most
+    # config.max_concurrency file bodies are held in memory at once
     files = []
-    for f in sorted(dir_path.iterdir()):
-        if f.suffix.lower() in supported and f.is_file():
-            content = f.read_bytes()
-            files.append({
-                'filename': f.name,
-                'content': content,
-                'mime_type': mime_map.get(f.suffix.lower(), 'application/octet-stream'),
-            })
+    for e in entries:
+        ext = os.path.splitext(e.name)[1].lower()
+        files.append({
+            'filename': e.name,
+            'path': e.path,
+            'mime_type': mime_map.get(ext, 'application/octet-stream'),
+        })
 
     if not files:
         logger.warning(f"No supported files found in {directory}")
@@ -1425,5 +1850,4 @@ async def _example():
 
 
 if __name__ == '__main__':
-    import asyncio
     asyncio.run(_example())
@@ -3,12 +3,15 @@ Product Expert System — Core Pydantic Models
 002_models.py
 """
 from __future__ import annotations
+from dataclasses import dataclass, field
 from datetime import date, datetime
 from enum import Enum
-from typing import Any, Optional
+from functools import cached_property
+from typing import Any, Literal, Optional
 from uuid import UUID, uuid4
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 import re
+import sys
 
 # ============================================================
 # Enums
@@ -132,8 +135,15 @@ class SpecRegistryEntry(BaseModel):
     auto_discovered: bool = False
     approved: bool = True
 
-class Product(BaseModel):
-    id: UUID = Field(default_factory=uuid4)
+# Dynamic specs with a small closed set of values (see Product.__post_init__)
+_INTERNED_SPEC_KEYS = ('product_type', 'brand_code', 'family_code')
+
+# Product and ProductRelationship are created and mutated in bulk by
+# ingestion and scoring, so they are slotted dataclasses; the API layer
+# converts them to Pydantic response models at the boundary.
+@dataclass(slots=True, kw_only=True)
+class Product:
+    id: UUID = field(default_factory=uuid4)
     model_number: str
     brand_id: UUID
     family_id: UUID
@@ -157,22 +167,50 @@ class Product(BaseModel):
     ext_height_in: Optional[float] = None
 
     # Dynamic specs
-    specs: dict[str, Any] = Field(default_factory=dict)
-    certifications: list[str] = Field(default_factory=list)
+    specs: dict[str, Any] = field(default_factory=dict)
+    certifications: list[str] = field(default_factory=list)
 
     # Lifecycle
-    effective_from: date = Field(default_factory=date.today)
+    effective_from: date = field(default_factory=date.today)
     effective_to: Optional[date] = None
     version: int = 1
-    replaced_by: list[UUID] = Field(default_factory=list)
-    replaces: list[UUID] = Field(default_factory=list)
+    replaced_by: list[UUID] = field(default_factory=list)
+    replaces: list[UUID] = field(default_factory=list)
 
     description: Optional[str] = None
     revision: Optional[str] = None
     approval_status: ApprovalStatus = ApprovalStatus.APPROVED
-
-class ProductRelationship(BaseModel):
-    id: UUID = Field(default_factory=uuid4)
+    # (certifications snapshot, normalized set) memo for certification_set
+    _certification_set: Optional[tuple[list[str], frozenset[str]]] = field(
+        default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Enum-like values repeat across the catalog and are compared
+        # against interned literals; interning lets == succeed on identity
+        # (sys.intern rejects str subclasses such as str enums)
+        if type(self.door_type) is str:
+            self.door_type = sys.intern(self.door_type)
+        if type(self.refrigerant) is str:
+            self.refrigerant = sys.intern(self.refrigerant)
+        for key in _INTERNED_SPEC_KEYS:
+            val = self.specs.get(key)
+            if type(val) is str:
+                self.specs[key] = sys.intern(val)
+
+    @property
+    def certification_set(self) -> frozenset[str]:
+        """Upper-cased, underscored certifications; rebuilt when the list changes."""
+        memo = self._certification_set
+        if memo is None or memo[0] != self.certifications:
+            memo = self._certification_set = (
+                list(self.certifications),
+                frozenset(c.upper().replace(' ', '_') for c in self.certifications),
+            )
+        return memo[1]
+
+@dataclass(slots=True, kw_only=True)
+class ProductRelationship:
+    id: UUID = field(default_factory=uuid4)
     source_id: UUID
     target_id: UUID
     relationship: RelationType
@@ -183,9 +221,12 @@ class ProductRelationship(BaseModel):
 # ============================================================
 # Document Models
 # ============================================================
+# Built per file / per chunk on the ingest hot path from trusted pipeline
+# output, so these are slotted dataclasses rather than Pydantic models.
 
-class Document(BaseModel):
-    id: UUID = Field(default_factory=uuid4)
+@dataclass(slots=True, kw_only=True)
+class Document:
+    id: UUID = field(default_factory=uuid4)
     filename: str
     doc_type: DocType
     mime_type: str
@@ -194,30 +235,45 @@ class Document(BaseModel):
     file_size_bytes: Optional[int] = None
     page_count: Optional[int] = None
     extracted_text: Optional[str] = None
-    metadata: dict = Field(default_factory=dict)
+    metadata: dict = field(default_factory=dict)
     brand_id: Optional[UUID] = None
     status: DocStatus = DocStatus.PENDING
-    processing_log: list[dict] = Field(default_factory=list)
+    processing_log: list[dict] = field(default_factory=list)
     version: int = 1
 
-class DocumentChunk(BaseModel):
-    id: UUID = Field(default_factory=uuid4)
+@dataclass(slots=True, kw_only=True)
+class DocumentChunk:
+    id: UUID = field(default_factory=uuid4)
     document_id: UUID
     chunk_index: int
     content: str
     chunk_type: str = "text"
     page_number: Optional[int] = None
     section_title: Optional[str] = None
-    product_ids: list[UUID] = Field(default_factory=list)
-    spec_names: list[str] = Field(default_factory=list)
-    metadata: dict = Field(default_factory=dict)
+    product_ids: list[UUID] = field(default_factory=list)
+    spec_names: list[str] = field(default_factory=list)
+    metadata: dict = field(default_factory=dict)
     token_count: Optional[int] = None
+    # (content, content.lower()) memo for content_lower
+    _content_lower: Optional[tuple[str, str]] = field(
+        default=None, init=False, repr=False, compare=False)
+
+    @property
+    def content_lower(self) -> str:
+        """Lowercased content, computed once per content value."""
+        memo = self._content_lower
+        if memo is None or memo[0] is not self.content:
+            memo = self._content_lower = (self.content, self.content.lower())
+        return memo[1]
 
 # ============================================================
 # Extraction Models (pipeline output)
 # ============================================================
+# Internal, trusted pipeline objects created dozens per document — plain
+# dataclasses skip Pydantic validation. Validate at the API/DB boundary.
 
-class ExtractedSpec(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class ExtractedSpec:
     """A single spec value extracted from a document."""
     name: str                    # raw field name from document
     canonical_name: Optional[str] = None  # mapped canonical name
@@ -228,28 +284,39 @@ class ExtractedSpec(BaseModel):
     page: Optional[int] = None
     section: Optional[str] = None
 
-class ExtractionResult(BaseModel):
+@dataclass(kw_only=True)
+class ExtractionResult:
     """Full extraction output for one document."""
     document_id: UUID
     doc_type: DocType
     brand_code: Optional[str] = None
-    model_numbers: list[str] = Field(default_factory=list)
+    model_numbers: list[str] = field(default_factory=list)
     title: Optional[str] = None
     description: Optional[str] = None
-    specs: list[ExtractedSpec] = Field(default_factory=list)
-    certifications: list[str] = Field(default_factory=list)
-    warnings: list[str] = Field(default_factory=list)
-    errors: list[str] = Field(default_factory=list)
+    specs: list[ExtractedSpec] = field(default_factory=list)
+    certifications: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
     raw_text: Optional[str] = None
     pages_processed: int = 0
     extraction_time_ms: int = 0
 
+    @cached_property
+    def specs_by_name(self) -> dict[str, ExtractedSpec]:
+        """Specs keyed by canonical name (first occurrence wins), built once."""
+        index: dict[str, ExtractedSpec] = {}
+        for s in self.specs:
+            if s.canonical_name:
+                index.setdefault(s.canonical_name, s)
+        return index
+
 # ============================================================
 # Conflict Models
 # ============================================================
 
-class SpecConflict(BaseModel):
-    id: UUID = Field(default_factory=uuid4)
+@dataclass(slots=True, kw_only=True)
+class SpecConflict:
+    id: UUID = field(default_factory=uuid4)
     product_id: UUID
     spec_name: str
     existing_value: Optional[str] = None
@@ -278,7 +345,12 @@ class RecommendRequest(BaseModel):
     include_alternates: bool = True
     include_discontinued: bool = False
 
+# Per-result records built in bulk for every response and never mutated
+_RESULT_CONFIG = ConfigDict(frozen=True, extra='forbid')
+
 class SpecMatchResult(BaseModel):
+    model_config = _RESULT_CONFIG
+
     spec: str
     display_name: str
     value_required: Optional[Any] = None
@@ -288,12 +360,18 @@ class SpecMatchResult(BaseModel):
     within_tolerance: bool = True
     score: float = 1.0
 
+ComplianceStatus = Literal['pass', 'fail', 'warning', 'not_applicable']
+
 class ComplianceResult(BaseModel):
+    model_config = _RESULT_CONFIG
+
     rule: str
-    status: str  # pass, fail, warning, not_applicable
+    status: ComplianceStatus
     details: str
 
 class Citation(BaseModel):
+    model_config = _RESULT_CONFIG
+
     doc_id: str
     filename: str
     page: Optional[int] = None
@@ -313,11 +391,17 @@ class ProductRecommendation(BaseModel):
     notes: Optional[str] = None
 
 class DecisionTrace(BaseModel):
+    model_config = _RESULT_CONFIG
+
     step: str
     detail: str
     products_remaining: int
     timestamp: str
 
+# Identifier-like literals ("pass", "imperial") are interned by the compiler
+# already; the version string is not, so every response shares this one
+MODEL_VERSION = sys.intern("v1.0.0")
+
 class RecommendResponse(BaseModel):
     query_id: str
     products: list[ProductRecommendation]
@@ -326,7 +410,7 @@ class RecommendResponse(BaseModel):
     decision_trace: list[DecisionTrace] = Field(default_factory=list)
     warnings: list[str] = Field(default_factory=list)
     response_time_ms: int = 0
-    model_version: str = "v1.0.0"
+    model_version: str = MODEL_VERSION
 
 class CompareRequest(BaseModel):
     product_ids: list[str]
@@ -369,6 +453,39 @@ FRACTION_MAP = {
     '⅗': 0.6, '⅘': 0.8, '⅙': 0.167, '⅚': 0.833,
 }
 
+# Parser patterns, compiled once at import rather than looked up in the
+# re module cache on every call
+_UNICODE_FRAC_RE = re.compile('[' + ''.join(FRACTION_MAP) + ']')
+_SLASH_FRAC_MIXED_RE = re.compile(r'^(\d+)\s+(\d+)/(\d+)$')
+_SLASH_FRAC_RE = re.compile(r'^(\d+)/(\d+)$')
+_LEADING_DECIMAL_RE = re.compile(r'^(\d+\.?\d*)')
+# Every number, with its C/F unit when one follows
+_TEMP_ANY_RE = re.compile(r'(-?\d+(?:\.\d+)?)\s*°?\s*([CF])?')
+_REFRIGERANT_RE = re.compile(r'(R-?\d{2,4}[a-zA-Z]?)', re.IGNORECASE)
+_VOLT_RANGE_RE = re.compile(r'(\d{2,3})\s*[-–to]+\s*(\d{2,3})\s*V')
+_VOLT_RE = re.compile(r'(\d{2,3})\s*V')
+_HZ_RE = re.compile(r'(\d{2})\s*Hz')
+_AMP_RE = re.compile(r'([\d.]+)\s*[Aa]mp')
+_HP_RE = re.compile(r'(\d+/\d+|\d+\.?\d*)\s*HP', re.IGNORECASE)
+_PHASE_RE = re.compile(r'(\d)\s*PH', re.IGNORECASE)
+_NEMA_RE = re.compile(r'(NEMA[\s-]*\d+-\d+\w?)', re.IGNORECASE)
+_BREAKER_RE = re.compile(r'(\d+)\s*A?\s*breaker', re.IGNORECASE)
+_SHELF_COUNT_RE = re.compile(r'(\d+)\s*(total\s+)?shelv')
+_SHELF_INCREMENT_RE = re.compile(r'adjustable in ([\d½¼¾⅛⅜⅝⅞/\s"]+)\s*increment')
+
+# Matched against upper-cased text
+_CERT_PATTERNS: tuple[tuple[re.Pattern, str], ...] = tuple(
+    (re.compile(pattern), code) for pattern, code in [
+        (r'ETL', 'ETL'), (r'C-?ETL', 'C-ETL'), (r'UL\s*471', 'UL471'),
+        (r'UL\s*60335', 'UL60335'), (r'CSA\s*C22', 'CSA_C22'),
+        (r'ENERGY\s*STAR', 'Energy_Star'), (r'NSF[\s/]*ANSI\s*456', 'NSF_ANSI_456'),
+        (r'FDA', 'FDA'), (r'AABB', 'AABB'), (r'CE\b', 'CE'),
+        (r'EPA\s*SNAP', 'EPA_SNAP'), (r'21\s*CFR', '21CFR_820'),
+        (r'NFPA\s*45', 'NFPA_45'), (r'NFPA\s*30', 'NFPA_30'),
+    ]
+)
+
+
 def parse_fraction(text: str) -> Optional[float]:
     """Parse dimension strings like '23 ¾', '48 5⁄8', '26 7/8' into float."""
     if text is None:
@@ -384,23 +501,24 @@ def parse_fraction(text: str) -> Optional[float]:
         pass
 
     # Unicode fraction: "23 ¾" or "¾"
-    for uf, val in FRACTION_MAP.items():
-        if uf in t:
-            whole = t.replace(uf, '').strip()
-            return (float(whole) if whole else 0) + val
+    m = _UNICODE_FRAC_RE.search(t)
+    if m:
+        uf = m.group()
+        whole = t.replace(uf, '').strip()
+        return (float(whole) if whole else 0) + FRACTION_MAP[uf]
 
     # Slash fraction: "23 3/4" or "26 7/8" or "7⁄8" (unicode fraction slash)
     t = t.replace('⁄', '/')  # normalize unicode fraction slash
-    m = re.match(r'^(\d+)\s+(\d+)/(\d+)$', t)
+    m = _SLASH_FRAC_MIXED_RE.match(t)
     if m:
         return float(m.group(1)) + float(m.group(2)) / float(m.group(3))
 
-    m = re.match(r'^(\d+)/(\d+)$', t)
+    m = _SLASH_FRAC_RE.match(t)
     if m:
         return float(m.group(1)) / float(m.group(2))
 
     # Decimal with trailing junk
-    m = re.match(r'^(\d+\.?\d*)', t)
+    m = _LEADING_DECIMAL_RE.match(t)
     if m:
         return float(m.group(1))
 
@@ -412,20 +530,26 @@ def parse_temp_range(text: str) -> tuple[Optional[float], Optional[float]]:
     if not text:
         return None, None
 
+    # One pass, partitioned by unit
+    c_match, f_match, m = [], [], []
+    for num, unit in _TEMP_ANY_RE.findall(text):
+        m.append(num)
+        if unit == 'C':
+            c_match.append(num)
+        elif unit == 'F':
+            f_match.append(num)
+
     # Prefer Celsius if both present: "36°F – 46°F (2°C – 8°C)"
-    c_match = re.findall(r'(-?\d+(?:\.\d+)?)\s*°?\s*C', text)
     if len(c_match) >= 2:
         vals = sorted([float(x) for x in c_match])
         return vals[0], vals[-1]
 
     # Fahrenheit only — convert
-    f_match = re.findall(r'(-?\d+(?:\.\d+)?)\s*°?\s*F', text)
     if len(f_match) >= 2:
         vals = sorted([(float(x) - 32) * 5 / 9 for x in f_match])
         return round(vals[0], 1), round(vals[-1], 1)
 
     # Plain numbers with "to" / "–"
-    m = re.findall(r'(-?\d+(?:\.\d+)?)', text)
     if len(m) >= 2:
         vals = sorted([float(x) for x in m])
         return vals[0], vals[-1]
@@ -437,7 +561,7 @@ def parse_refrigerant(text: str) -> Optional[str]:
     """Extract refrigerant code from text like 'Hydrocarbon, natural refrigerant (R290)'."""
     if not text:
         return None
-    m = re.search(r'(R-?\d{2,4}[a-zA-Z]?)', text, re.IGNORECASE)
+    m = _REFRIGERANT_RE.search(text)
     return m.group(1).upper().replace('-', '') if m else None
 
 
@@ -448,43 +572,43 @@ def parse_electrical(text: str) -> dict[str, Any]:
         return result
 
     # Voltage: "115V" or "110 - 120V" or "110-120V AC"
-    vm = re.search(r'(\d{2,3})\s*[-–to]+\s*(\d{2,3})\s*V', text)
+    vm = _VOLT_RANGE_RE.search(text)
     if vm:
         result['voltage_min_v'] = int(vm.group(1))
         result['voltage_max_v'] = int(vm.group(2))
         result['voltage_v'] = int(vm.group(2))
     else:
-        vm = re.search(r'(\d{2,3})\s*V', text)
+        vm = _VOLT_RE.search(text)
         if vm:
             result['voltage_v'] = int(vm.group(1))
 
     # Frequency
-    fm = re.search(r'(\d{2})\s*Hz', text)
+    fm = _HZ_RE.search(text)
     if fm:
         result['frequency_hz'] = int(fm.group(1))
 
     # Amps
-    am = re.search(r'([\d.]+)\s*[Aa]mp', text)
+    am = _AMP_RE.search(text)
     if am:
         result['amperage'] = float(am.group(1))
 
     # HP: "1/5 HP" or "1/3 HP" or "0.5 HP"
-    hm = re.search(r'(\d+/\d+|\d+\.?\d*)\s*HP', text, re.IGNORECASE)
+    hm = _HP_RE.search(text)
     if hm:
         result['horsepower'] = hm.group(1)
 
     # Phase
-    pm = re.search(r'(\d)\s*PH', text, re.IGNORECASE)
+    pm = _PHASE_RE.search(text)
     if pm:
         result['phase'] = int(pm.group(1))
 
     # NEMA plug
-    nm = re.search(r'(NEMA[\s-]*\d+-\d+\w?)', text, re.IGNORECASE)
+    nm = _NEMA_RE.search(text)
     if nm:
         result['plug_type'] = nm.group(1).upper().replace(' ', '-')
 
     # Breaker
-    bm = re.search(r'(\d+)\s*A?\s*breaker', text, re.IGNORECASE)
+    bm = _BREAKER_RE.search(text)
     if bm:
         result['breaker_amps'] = int(bm.group(1))
 
@@ -557,7 +681,7 @@ def parse_shelf_config(text: str) -> dict[str, Any]:
             result['shelf_count'] = n
             break
     if 'shelf_count' not in result:
-        m = re.search(r'(\d+)\s*(total\s+)?shelv', t)
+        m = _SHELF_COUNT_RE.search(t)
         if m:
             result['shelf_count'] = int(m.group(1))
 
@@ -568,7 +692,7 @@ def parse_shelf_config(text: str) -> dict[str, Any]:
     elif 'fixed' in t:
         result['shelf_type'] = 'fixed'
 
-    m = re.search(r'adjustable in ([\d½¼¾⅛⅜⅝⅞/\s"]+)\s*increment', t)
+    m = _SHELF_INCREMENT_RE.search(t)
     if m:
         result['shelf_adjustment_increment'] = m.group(1).strip()
 
@@ -582,18 +706,5 @@ def parse_certifications(text: str) -> list[str]:
     """Extract certification codes from text."""
     if not text:
         return []
-    certs = []
     t = text.upper()
-
-    cert_patterns = [
-        (r'ETL', 'ETL'), (r'C-?ETL', 'C-ETL'), (r'UL\s*471', 'UL471'),
-        (r'UL\s*60335', 'UL60335'), (r'CSA\s*C22', 'CSA_C22'),
-        (r'ENERGY\s*STAR', 'Energy_Star'), (r'NSF[\s/]*ANSI\s*456', 'NSF_ANSI_456'),
-        (r'FDA', 'FDA'), (r'AABB', 'AABB'), (r'CE\b', 'CE'),
-        (r'EPA\s*SNAP', 'EPA_SNAP'), (r'21\s*CFR', '21CFR_820'),
-        (r'NFPA\s*45', 'NFPA_45'), (r'NFPA\s*30', 'NFPA_30'),
-    ]
-    for pattern, code in cert_patterns:
-        if re.search(pattern, t):
-            certs.append(code)
-    return sorted(set(certs))
\ No newline at end of file
+    return sorted({code for pattern, code in _CERT_PATTERNS if pattern.search(t)})
\ No newline at end of file
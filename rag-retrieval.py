@@ -11,14 +11,24 @@ Responsibilities:
   6. Grounded response generation with hallucination guards
 """
 from __future__ import annotations
+import asyncio
+import hashlib
+import heapq
 import logging
+import math
 import re
+import sqlite3
 import time
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from operator import attrgetter, itemgetter
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any, Optional, Callable
 from uuid import UUID, uuid4
 
+import numpy as np
+
 from models import (
     DocumentChunk, Document, Product, Citation,
     DocType, SpecRegistryEntry, SpecDataType,
@@ -32,7 +42,7 @@ logger = logging.getLogger(__name__)
 # Configuration
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class RAGConfig:
     """Tunable parameters for retrieval."""
     # Retrieval
@@ -59,6 +69,11 @@ class RAGConfig:
     use_cross_encoder: bool = False  # if True, uses cross-encoder reranker
     cross_encoder_model: str = 'cross-encoder/ms-marco-MiniLM-L-12-v2'
 
+    # Semantic cache of ranked chunks for near-duplicate queries
+    semantic_cache_size: int = 0            # 0 disables; e.g. 1024
+    semantic_cache_ttl_s: float = 300.0
+    semantic_cache_threshold: float = 0.95  # min query-vector similarity
+
 
 DEFAULT_RAG_CONFIG = RAGConfig()
 
@@ -67,7 +82,7 @@ DEFAULT_RAG_CONFIG = RAGConfig()
 # Query Understanding
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class ParsedQuery:
     """Structured representation of a user query."""
     original: str
@@ -92,6 +107,10 @@ _MODEL_PATTERNS = [
     r'(CEL-[\w-]+)',
     r'(CP-[\w-]+)',
 ]
+# parse_query matches model numbers case-insensitively; grounding checks
+# match them exactly as written
+_MODEL_RES_CI = tuple(re.compile(p, re.IGNORECASE) for p in _MODEL_PATTERNS)
+_MODEL_RES = [re.compile(p) for p in _MODEL_PATTERNS]
 
 # Spec synonym map for query expansion
 _SPEC_SYNONYMS: dict[str, list[str]] = {
@@ -146,6 +165,10 @@ _SPEC_SYNONYMS: dict[str, list[str]] = {
     'pulldown_time_min': ['pulldown', 'pull down', 'cool down time'],
     'warranty_general_years': ['warranty', 'guarantee'],
 }
+# (synonym, canonical spec) pairs in _SPEC_SYNONYMS order, for substring checks
+_SPEC_SYNONYM_TERMS = tuple(
+    (syn, canon) for canon, syns in _SPEC_SYNONYMS.items() for syn in syns
+)
 
 # Brand patterns
 _BRAND_PATTERNS = {
@@ -155,6 +178,24 @@ _BRAND_PATTERNS = {
     'Celsius': [r'Celsius\s*Scientific', r'°celsius'],
     'CBS': [r'\bCBS\b', r'CryoSafe'],
 }
+_BRAND_RES = tuple(
+    (brand, tuple(re.compile(p, re.IGNORECASE) for p in pats))
+    for brand, pats in _BRAND_PATTERNS.items()
+)
+
+# Certification patterns, matched against the lower-cased query
+_CERT_QUERY_RES = tuple(
+    (cert, tuple(re.compile(p) for p in pats))
+    for cert, pats in {
+        'NSF_ANSI_456': [r'nsf\s*/?ansi\s*456', r'nsf\s*456'],
+        'Energy_Star': [r'energy\s*star'],
+        'ETL': [r'\betl\b'],
+        'FDA': [r'\bfda\b'],
+        'AABB': [r'\baabb\b'],
+        'NFPA_45': [r'nfpa\s*45'],
+        'EPA_SNAP': [r'epa\s*snap'],
+    }.items()
+)
 
 # Intent classification keywords
 _INTENT_KEYWORDS = {
@@ -181,6 +222,28 @@ _INTENT_KEYWORDS = {
 }
 
 
+# Family hint keywords
+_FAMILY_KEYWORDS = {
+    'premier_lab_ref': ['premier', 'lab refrigerator'],
+    'pharmacy_vaccine_ref': ['pharmacy', 'vaccine'],
+    'pharmacy_nsf_ref': ['nsf', 'vaccine storage'],
+    'chromatography_ref': ['chromatography', 'hplc', 'column'],
+    'blood_bank_ref': ['blood bank', 'blood product'],
+    'flammable_storage_ref': ['flammable', 'solvent'],
+    'manual_defrost_freezer': ['manual defrost', 'freezer'],
+    'auto_defrost_freezer': ['auto defrost', 'frost free'],
+    'cryo_dewar': ['dewar', 'cryogenic', 'liquid nitrogen'],
+}
+
+# (keyword, family) pairs in _FAMILY_KEYWORDS order, for substring checks
+_FAMILY_KEYWORD_TERMS = tuple(
+    (kw, fam) for fam, kws in _FAMILY_KEYWORDS.items() for kw in kws
+)
+_INTENT_KEYWORD_ITEMS = tuple(
+    (intent, tuple(kws)) for intent, kws in _INTENT_KEYWORDS.items()
+)
+
+
 def parse_query(
     query: str,
     spec_registry: Optional[dict[str, SpecRegistryEntry]] = None,
@@ -190,24 +253,21 @@ def parse_query(
     q = query.lower()
 
     # Extract model numbers
-    for pat in _MODEL_PATTERNS:
-        for m in re.finditer(pat, query, re.IGNORECASE):
+    for pat in _MODEL_RES_CI:
+        for m in pat.finditer(query):
             pq.model_numbers.append(m.group(1))
 
     # Detect brands
-    for brand, patterns in _BRAND_PATTERNS.items():
+    for brand, patterns in _BRAND_RES:
         for pat in patterns:
-            if re.search(pat, query, re.IGNORECASE):
+            if pat.search(query):
                 pq.brand_mentions.append(brand)
                 break
 
     # Detect spec mentions via synonyms
-    for canon, syns in _SPEC_SYNONYMS.items():
-        for syn in syns:
-            if syn in q:
-                if canon not in pq.spec_mentions:
-                    pq.spec_mentions.append(canon)
-                break
+    for syn, canon in _SPEC_SYNONYM_TERMS:
+        if syn in q and canon not in pq.spec_mentions:
+            pq.spec_mentions.append(canon)
 
     # Also check registry synonyms
     if spec_registry:
@@ -219,43 +279,20 @@ def parse_query(
                     break
 
     # Detect certifications
-    cert_pats = {
-        'NSF_ANSI_456': [r'nsf\s*/?ansi\s*456', r'nsf\s*456'],
-        'Energy_Star': [r'energy\s*star'],
-        'ETL': [r'\betl\b'],
-        'FDA': [r'\bfda\b'],
-        'AABB': [r'\baabb\b'],
-        'NFPA_45': [r'nfpa\s*45'],
-        'EPA_SNAP': [r'epa\s*snap'],
-    }
-    for cert, pats in cert_pats.items():
+    for cert, pats in _CERT_QUERY_RES:
         for pat in pats:
-            if re.search(pat, q):
+            if pat.search(q):
                 pq.cert_mentions.append(cert)
                 break
 
     # Detect family hints
-    family_kw = {
-        'premier_lab_ref': ['premier', 'lab refrigerator'],
-        'pharmacy_vaccine_ref': ['pharmacy', 'vaccine'],
-        'pharmacy_nsf_ref': ['nsf', 'vaccine storage'],
-        'chromatography_ref': ['chromatography', 'hplc', 'column'],
-        'blood_bank_ref': ['blood bank', 'blood product'],
-        'flammable_storage_ref': ['flammable', 'solvent'],
-        'manual_defrost_freezer': ['manual defrost', 'freezer'],
-        'auto_defrost_freezer': ['auto defrost', 'frost free'],
-        'cryo_dewar': ['dewar', 'cryogenic', 'liquid nitrogen'],
-    }
-    for fam, kws in family_kw.items():
-        for kw in kws:
-            if kw in q:
-                if fam not in pq.family_hints:
-                    pq.family_hints.append(fam)
-                break
+    for kw, fam in _FAMILY_KEYWORD_TERMS:
+        if kw in q and fam not in pq.family_hints:
+            pq.family_hints.append(fam)
 
     # Classify intent
     intent_scores: dict[str, int] = {}
-    for intent, kws in _INTENT_KEYWORDS.items():
+    for intent, kws in _INTENT_KEYWORD_ITEMS:
         for kw in kws:
             if kw in q:
                 intent_scores[intent] = intent_scores.get(intent, 0) + 1
@@ -292,37 +329,155 @@ class EmbeddingProvider:
     to an embedding model service.
     """
 
-    def __init__(self, model: str = 'e5-large-v2', dim: int = 1024):
+    def __init__(
+        self,
+        model: str = 'e5-large-v2',
+        dim: int = 1024,
+        dtype: str = 'float32',
+        cache_size: int = 1024,
+        cache_path: Optional[str] = None,
+        batch_size: int = 64,
+        max_concurrency: int = 8,
+    ):
         self.model = model
         self.dim = dim
-
-    async def embed_query(self, text: str) -> list[float]:
+        self.dtype = np.dtype(dtype)
+        self.batch_size = batch_size
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # LRU of embeddings keyed by prefixed-text digest; repeated queries
+        # and re-indexed chunks skip the embedding call entirely
+        self.cache_size = cache_size
+        self._cache: OrderedDict[bytes, np.ndarray] = OrderedDict()
+        # Optional SQLite store of document embeddings, so re-ingesting after
+        # a restart is a lookup per chunk instead of an embedding call
+        self._disk: Optional[sqlite3.Connection] = None
+        # The model and vector layout are part of the disk key, so one cache
+        # file can be shared across embedding configurations
+        self._disk_hasher = hashlib.blake2b(
+            f"{model}\0{dim}\0{self.dtype.str}\0".encode(), digest_size=16)
+        if cache_path:
+            self._disk = sqlite3.connect(cache_path)
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vec BLOB)")
+
+    async def embed_query(self, text: str) -> np.ndarray:
         """Embed a search query. Adds 'query: ' prefix for e5 models."""
-        # In production: call embedding API
-        # For now, return a mock vector
-        return self._mock_embed(f"query: {text}")
+        return (await self.embed_batch([text], is_query=True))[0]
 
-    async def embed_document(self, text: str) -> list[float]:
+    async def embed_document(self, text: str) -> np.ndarray:
         """Embed a document chunk. Adds 'passage: ' prefix for e5 models."""
-        return self._mock_embed(f"passage: {text}")
-
-    async def embed_batch(self, texts: list[str], is_query: bool = False) -> list[list[float]]:
-        """Embed multiple texts."""
-        prefix = "query: " if is_query else "passage: "
-        return [self._mock_embed(f"{prefix}{t}") for t in texts]
-
-    def _mock_embed(self, text: str) -> list[float]:
-        """Deterministic mock embedding based on text hash."""
-        import hashlib
-        h = hashlib.sha256(text.encode()).hexdigest()
-        # Generate dim-length vector from hash (repeating as needed)
-        vals = []
-        for i in range(self.dim):
-            byte_idx = (i * 2) % len(h)
-            vals.append((int(h[byte_idx:byte_idx+2], 16) - 128) / 128.0)
+        return (await self.embed_batch([text]))[0]
+
+    def close(self) -> None:
+        """Close the disk-cache file, if one is open."""
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+    async def embed_batch(self, texts: list[str], is_query: bool = False) -> np.ndarray:
+        """
+        Embed multiple texts into a (len(texts), dim) array.
+
+        Every embedding goes through here: cached vectors are reused, and
+        the misses are sent to the embedding service in sub-batches of
+        ``batch_size`` with at most ``max_concurrency`` requests in flight.
+        Only document (passage) vectors are written to the disk cache.
+        """
+        # The e5 prefix is fed to each hash ahead of the text rather than
+        # concatenated, so long chunks are never copied just to prepend it
+        prefix = b"query: " if is_query else b"passage: "
+        disk = None if is_query else self._disk
+        out = np.empty((len(texts), self.dim), dtype=self.dtype)
+
+        # Misses keyed by cache key, so repeated texts are embedded once
+        missing: dict[bytes, tuple[bytes, list[int]]] = {}
+        for i, t in enumerate(texts):
+            data = t.encode()
+            h = hashlib.blake2b(prefix, digest_size=16)
+            h.update(data)
+            key = h.digest()
+            vec = self._lookup(key, prefix, data, disk)
+            if vec is not None:
+                out[i] = vec
+            elif key in missing:
+                missing[key][1].append(i)
+            else:
+                missing[key] = (data, [i])
+        if not missing:
+            return out
+
+        items = list(missing.items())
+        subs = [items[i:i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+        results = await asyncio.gather(
+            *(self._embed_sub_batch(prefix, [data for _, (data, _) in sb]) for sb in subs))
+        for sb, vecs in zip(subs, results):
+            vecs.flags.writeable = False  # rows are shared by every cache hit
+            for (key, (data, rows)), vec in zip(sb, vecs):
+                out[rows] = vec
+                self._remember(key, vec)
+                if disk is not None:
+                    # sqlite reads the row's buffer directly; no bytes copy
+                    disk.execute(
+                        "INSERT OR IGNORE INTO embeddings VALUES (?, ?)",
+                        (self._disk_key(prefix, data), memoryview(vec)))
+        if disk is not None:
+            # One transaction per batch: nothing relies on close() being called
+            disk.commit()
+        return out
+
+    def _lookup(
+        self, key: bytes, prefix: bytes, data: bytes,
+        disk: Optional[sqlite3.Connection],
+    ) -> Optional[np.ndarray]:
+        vec = self._cache.get(key)
+        if vec is not None:
+            self._cache.move_to_end(key)
+            return vec
+        if disk is not None:
+            row = disk.execute(
+                "SELECT vec FROM embeddings WHERE key = ?", (self._disk_key(prefix, data),)).fetchone()
+            if row is not None:
+                vec = np.frombuffer(row[0], dtype=self.dtype)
+                self._remember(key, vec)
+        return vec
+
+    def _remember(self, key: bytes, vec: np.ndarray) -> None:
+        if self.cache_size > 0:
+            self._cache[key] = vec
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _disk_key(self, prefix: bytes, data: bytes) -> bytes:
+        h = self._disk_hasher.copy()
+        h.update(prefix)
+        h.update(data)
+        return h.digest()
+
+    async def _embed_sub_batch(self, prefix: bytes, texts: list[bytes]) -> np.ndarray:
+        async with self._semaphore:
+            # In production: call embedding API with the whole sub-batch
+            # For now, return mock vectors
+            return self._mock_embed_batch(prefix, texts)
+
+    @staticmethod
+    def _mock_hash(prefix: bytes, data: bytes) -> bytes:
+        h = hashlib.blake2b(prefix, digest_size=64)
+        h.update(data)
+        return h.digest()
+
+    def _mock_embed_batch(self, prefix: bytes, texts: list[bytes]) -> np.ndarray:
+        """Deterministic mock embeddings based on text hashes, L2-normalized."""
+        # Generate dim-length vectors from the hash bytes (repeating as needed).
+        # A mock only needs a stable spread of bytes, not SHA-256: one 64-byte
+        # BLAKE2b call yields twice the source bytes at a fraction of the cost
+        digests = b"".join(self._mock_hash(prefix, t) for t in texts)
+        vals = np.frombuffer(digests, dtype=np.uint8).reshape(len(texts), -1)
+        vals = np.tile(vals, (1, -(-self.dim // vals.shape[1])))[:, :self.dim]
+        vals = (vals.astype(np.float64) - 128.0) / 128.0
         # Normalize
-        norm = sum(v*v for v in vals) ** 0.5
-        return [v / norm for v in vals] if norm > 0 else vals
+        norms = np.linalg.norm(vals, axis=1, keepdims=True)
+        np.divide(vals, norms, out=vals, where=norms > 0)
+        return vals.astype(self.dtype)
 
 
 # ============================================================
@@ -333,11 +488,15 @@ class VectorStore:
     """
     Abstract vector store. In production, backed by pgvector.
     Supports filtered similarity search.
+
+    Similarity is cosine. Stores are expected to keep vectors at unit
+    length (EmbeddingProvider already returns them L2-normalized), so
+    cosine reduces to a plain inner product with no per-pair norms.
     """
 
     async def search(
         self,
-        query_vector: list[float],
+        query_vector: np.ndarray,
         top_k: int = 20,
         filters: Optional[dict[str, Any]] = None,
     ) -> list[tuple[DocumentChunk, float]]:
@@ -347,84 +506,296 @@ class VectorStore:
         """
         raise NotImplementedError
 
-    async def upsert(self, chunk_id: UUID, vector: list[float]) -> None:
-        """Store or update a chunk embedding."""
+    async def upsert(self, chunk_id: UUID, vector: np.ndarray) -> None:
+        """
+        Store or update a chunk embedding. Implementations normalize once
+        here, at insert time, rather than on every search.
+        """
         raise NotImplementedError
 
+    async def upsert_batch(
+        self, chunk_ids: list[UUID], vectors: np.ndarray,
+    ) -> None:
+        """Store or update many embeddings; vectors is (len(chunk_ids), dim)."""
+        for chunk_id, vector in zip(chunk_ids, vectors):
+            await self.upsert(chunk_id, vector)
+
+
+# Rows widened per block when scoring an int8 store (1 MB of float32 at 1024-d)
+_INT8_BLOCK_ROWS = 256
+
 
 class InMemoryVectorStore(VectorStore):
-    """In-memory vector store for testing."""
+    """
+    In-memory vector store for testing.
+    Embeddings are L2-normalized on upsert and kept as rows of one
+    contiguous matrix, so a search is a single matrix-vector product
+    (exact inner-product search, like a flat IP index).
+
+    Filterable chunk metadata is kept column-wise alongside the matrix
+    (integer-coded chunk_type / doc_type / brand per row, plus a product
+    id -> rows index), so filters become one boolean mask per search
+    instead of dict lookups per chunk.
+
+    With quantization='int8', rows are stored as int8 with one float scale
+    per vector (symmetric scalar quantization, like an 8-bit scalar
+    quantizer index): a quarter of the memory, and the score becomes
+    scale * (codes @ query) with the query kept at full precision.
+    """
 
-    def __init__(self):
-        self.vectors: dict[UUID, list[float]] = {}
+    def __init__(self, dtype: str = 'float32', quantization: Optional[str] = None):
+        if quantization not in (None, 'int8'):
+            raise ValueError(f"Unsupported quantization: {quantization}")
+        self.dtype = np.dtype(dtype)
+        self.quantization = quantization
         self.chunks: dict[UUID, DocumentChunk] = {}
+        self._rows: dict[UUID, int] = {}
+        self._ids: list[UUID] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None  # per-row, int8 only
+
+        # Per-row metadata columns, sized with the matrix. Values are coded
+        # through _codes; doc_type/brand use -1 for "not set", which passes
+        # any filter. _registered is False until register_chunk runs.
+        self._codes: dict[Any, int] = {}
+        self._registered = np.zeros(0, dtype=bool)
+        self._chunk_types = np.zeros(0, dtype=np.int32)
+        self._doc_types = np.zeros(0, dtype=np.int32)
+        self._brands = np.zeros(0, dtype=np.int32)
+        self._pid_rows: dict[str, set[int]] = {}
+        self._row_pids: dict[int, set[str]] = {}
 
     async def search(
         self,
-        query_vector: list[float],
+        query_vector: np.ndarray,
         top_k: int = 20,
         filters: Optional[dict[str, Any]] = None,
     ) -> list[tuple[DocumentChunk, float]]:
-        results = []
-        for cid, vec in self.vectors.items():
-            chunk = self.chunks.get(cid)
-            if not chunk:
-                continue
-
-            # Apply filters
-            if filters:
-                if 'product_ids' in filters:
-                    req_ids = set(str(x) for x in filters['product_ids'])
-                    chunk_ids = set(str(x) for x in chunk.product_ids)
-                    if not req_ids & chunk_ids:
-                        continue
-                if 'chunk_types' in filters:
-                    if chunk.chunk_type not in filters['chunk_types']:
-                        continue
-                if 'doc_types' in filters:
-                    doc_type = chunk.metadata.get('doc_type')
-                    if doc_type and doc_type not in filters['doc_types']:
-                        continue
-                if 'brands' in filters:
-                    brand = chunk.metadata.get('brand')
-                    if brand and brand not in filters['brands']:
-                        continue
-
-            sim = self._cosine_sim(query_vector, vec)
-            results.append((chunk, sim))
-
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results[:top_k]
-
-    async def upsert(self, chunk_id: UUID, vector: list[float]) -> None:
-        self.vectors[chunk_id] = vector
+        if not self._ids or top_k <= 0:
+            return []
+        n = len(self._ids)
+        scores = self._scores(self._normalize(query_vector), n)
+
+        candidates = np.flatnonzero(self._filter_mask(n, filters))
+        cand_scores = scores[candidates]
+        # Partition out the best top_k, keeping every row tied with the
+        # k-th score, then stable-sort only those: ties keep insertion order
+        if top_k < len(candidates):
+            kth = -np.partition(-cand_scores, top_k - 1)[top_k - 1]
+            head = np.flatnonzero(cand_scores >= kth)
+        else:
+            head = np.arange(len(candidates))
+        order = head[np.argsort(-cand_scores[head], kind='stable')][:top_k]
+
+        return [
+            (self.chunks[self._ids[row]], float(scores[row]))
+            for row in candidates[order].tolist()
+        ]
+
+    def _scores(self, query: np.ndarray, n: int) -> np.ndarray:
+        """Inner product of the unit query with the first n rows."""
+        if self._scales is None:
+            return self._matrix[:n] @ query
+        # int8 @ float32 has no BLAS path and upcasting the whole matrix
+        # streams 4x the bytes quantization saved, so widen cache-sized
+        # blocks into one reused float buffer and hand each to BLAS
+        out = np.empty(n, dtype=self.dtype)
+        block_rows = min(n, _INT8_BLOCK_ROWS)
+        buf = np.empty((block_rows, self._matrix.shape[1]), dtype=self.dtype)
+        for start in range(0, n, block_rows):
+            stop = min(start + block_rows, n)
+            block = buf[:stop - start]
+            block[...] = self._matrix[start:stop]
+            np.matmul(block, query, out=out[start:stop])
+        out *= self._scales[:n]
+        return out
+
+    def _filter_mask(self, n: int, filters: Optional[dict[str, Any]]) -> np.ndarray:
+        """Rows that are registered and pass every filter."""
+        mask = self._registered[:n].copy()
+        if not filters:
+            return mask
+        if 'product_ids' in filters:
+            pid_mask = np.zeros(n, dtype=bool)
+            for pid in set(str(x) for x in filters['product_ids']):
+                rows = self._pid_rows.get(pid)
+                if rows:
+                    pid_mask[list(rows)] = True
+            mask &= pid_mask
+        if 'chunk_types' in filters:
+            mask &= np.isin(self._chunk_types[:n], self._wanted(filters['chunk_types']))
+        for key, column in (('doc_types', self._doc_types), ('brands', self._brands)):
+            if key in filters:
+                codes = column[:n]
+                mask &= (codes == -1) | np.isin(codes, self._wanted(filters[key]))
+        return mask
+
+    def _wanted(self, values: list) -> list[int]:
+        return [self._codes[v] for v in values if v in self._codes]
+
+    def _code(self, value: Any) -> int:
+        return self._codes.setdefault(value, len(self._codes))
+
+    async def upsert(self, chunk_id: UUID, vector: np.ndarray) -> None:
+        vec = self._normalize(vector)
+        self._store([self._row_for(chunk_id, vec.shape[0])], vec[None, :])
+
+    async def upsert_batch(
+        self, chunk_ids: list[UUID], vectors: np.ndarray,
+    ) -> None:
+        vecs = np.array(vectors, dtype=self.dtype)  # own copy, normalized in place
+        norms = np.linalg.norm(vecs, axis=1)
+        nonzero = norms > 0
+        vecs[nonzero] /= norms[nonzero, None]
+        # Last vector wins for an id repeated within the batch, as with upsert
+        last = {chunk_id: i for i, chunk_id in enumerate(chunk_ids)}
+        if not last:
+            return
+        rows = [self._row_for(chunk_id, vecs.shape[1]) for chunk_id in last]
+        self._store(rows, vecs[list(last.values())])
+
+    def _row_for(self, chunk_id: UUID, dim: int) -> int:
+        """Row of chunk_id, appending (and growing the matrix) if new."""
+        store_dtype = np.int8 if self.quantization == 'int8' else self.dtype
+        row = self._rows.get(chunk_id)
+        if row is None:
+            row = len(self._ids)
+            if self._matrix is None:
+                self._matrix = np.empty((16, dim), dtype=store_dtype)
+                if self.quantization == 'int8':
+                    self._scales = np.empty(16, dtype=self.dtype)
+                self._grow_columns(16)
+            elif row == self._matrix.shape[0]:
+                # Grow geometrically so appends stay amortized O(dim)
+                grown = np.empty((row * 2, self._matrix.shape[1]), dtype=store_dtype)
+                grown[:row] = self._matrix
+                self._matrix = grown
+                if self._scales is not None:
+                    self._scales = np.resize(self._scales, row * 2)
+                self._grow_columns(row * 2)
+            self._rows[chunk_id] = row
+            self._ids.append(chunk_id)
+            chunk = self.chunks.get(chunk_id)
+            if chunk is not None:
+                self._set_metadata(row, chunk)
+        return row
+
+    def _store(self, rows: list[int], vecs: np.ndarray) -> None:
+        """Write unit vectors into rows, quantizing for int8 stores."""
+        if self._scales is not None:
+            scales = np.abs(vecs).max(axis=1) / 127.0
+            self._scales[rows] = scales
+            self._matrix[rows] = np.rint(vecs / np.where(scales > 0, scales, 1.0)[:, None])
+        else:
+            self._matrix[rows] = vecs
 
     def register_chunk(self, chunk: DocumentChunk) -> None:
         self.chunks[chunk.id] = chunk
-
-    @staticmethod
-    def _cosine_sim(a: list[float], b: list[float]) -> float:
-        dot = sum(x*y for x, y in zip(a, b))
-        na = sum(x*x for x in a) ** 0.5
-        nb = sum(x*x for x in b) ** 0.5
-        return dot / (na * nb) if na > 0 and nb > 0 else 0.0
+        row = self._rows.get(chunk.id)
+        if row is not None:
+            self._set_metadata(row, chunk)
+
+    def _grow_columns(self, size: int) -> None:
+        n = len(self._ids)
+        for name in ('_registered', '_chunk_types', '_doc_types', '_brands'):
+            old = getattr(self, name)
+            grown = np.zeros(size, dtype=old.dtype)
+            grown[:n] = old[:n]
+            setattr(self, name, grown)
+
+    def _set_metadata(self, row: int, chunk: DocumentChunk) -> None:
+        self._registered[row] = True
+        self._chunk_types[row] = self._code(chunk.chunk_type)
+        doc_type = chunk.metadata.get('doc_type')
+        self._doc_types[row] = self._code(doc_type) if doc_type else -1
+        brand = chunk.metadata.get('brand')
+        self._brands[row] = self._code(brand) if brand else -1
+
+        pids = set(str(x) for x in chunk.product_ids)
+        for pid in self._row_pids.get(row, set()) - pids:
+            self._pid_rows[pid].discard(row)
+        for pid in pids:
+            self._pid_rows.setdefault(pid, set()).add(row)
+        self._row_pids[row] = pids
+
+    def _normalize(self, vector: np.ndarray) -> np.ndarray:
+        """Unit-length copy in the store dtype (zero vectors stay zero)."""
+        vec = np.asarray(vector, dtype=self.dtype)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
 
 
 # ============================================================
 # Keyword Search (BM25-style)
 # ============================================================
 
+_WORD_RE = re.compile(r'\b\w+\b')
+_STOPWORDS = frozenset({
+    'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be',
+    'been', 'being', 'have', 'has', 'had', 'do', 'does',
+    'did', 'will', 'would', 'could', 'should', 'may',
+    'might', 'shall', 'can', 'of', 'in', 'to', 'for',
+    'with', 'on', 'at', 'by', 'from', 'it', 'its',
+    'this', 'that', 'and', 'or', 'but', 'not', 'no',
+    'what', 'which', 'who', 'how', 'when', 'where',
+})
+
+# Sort keys for top-k selection
+_BY_SECOND = itemgetter(1)
+_BY_SCORE = attrgetter('score')
+
+
 class KeywordSearcher:
     """
-    Simple keyword search over chunk content.
+    BM25 keyword search over chunk content.
     In production, backed by PostgreSQL full-text search (tsvector).
+
+    Chunks are tokenized once at index time into an inverted index
+    (term -> {chunk_id: term frequency}) with per-chunk lengths, so a
+    search only touches the postings of its query terms.
     """
 
-    def __init__(self):
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
         self.chunks: dict[UUID, DocumentChunk] = {}
+        self._postings: dict[str, dict[UUID, int]] = {}
+        # Distinct terms each chunk was indexed under, so re-indexing
+        # removes exactly those postings even if the content has changed
+        self._chunk_terms: dict[UUID, tuple[str, ...]] = {}
+        self._doc_len: dict[UUID, int] = {}
+        self._total_len = 0
+        # Boost inputs normalized at index time:
+        # (spec names, lowered section title, lowered product id strings)
+        self._boost_features: dict[
+            UUID, tuple[frozenset[str], Optional[str], tuple[str, ...]]] = {}
 
     def index_chunk(self, chunk: DocumentChunk) -> None:
+        if chunk.id in self._doc_len:
+            self._unindex(chunk.id)
         self.chunks[chunk.id] = chunk
+        terms = self._tokens(chunk.content_lower)
+        term_freqs = Counter(terms)
+        for term, tf in term_freqs.items():
+            self._postings.setdefault(term, {})[chunk.id] = tf
+        self._chunk_terms[chunk.id] = tuple(term_freqs)
+        self._doc_len[chunk.id] = len(terms)
+        self._total_len += len(terms)
+        self._boost_features[chunk.id] = (
+            frozenset(sn.lower().replace('_', ' ') for sn in (chunk.spec_names or [])),
+            chunk.section_title.lower() if chunk.section_title else None,
+            tuple(str(pid).lower() for pid in (chunk.product_ids or [])),
+        )
+
+    def _unindex(self, chunk_id: UUID) -> None:
+        for term in self._chunk_terms.pop(chunk_id, ()):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(chunk_id, None)
+            if not postings:
+                del self._postings[term]
+        self._total_len -= self._doc_len.pop(chunk_id)
 
     def search(
         self,
@@ -432,13 +803,34 @@ class KeywordSearcher:
         top_k: int = 20,
         filters: Optional[dict[str, Any]] = None,
     ) -> list[tuple[DocumentChunk, float]]:
-        """BM25-style keyword search."""
-        terms = self._tokenize(query)
-        if not terms:
+        """BM25 keyword search with spec-name, section and model boosts."""
+        # Lowercased once; tokens and the model-number boost both read it
+        query_lower = query.lower()
+        terms = self._tokens(query_lower)
+        if not terms or not self._doc_len:
             return []
 
+        n_docs = len(self._doc_len)
+        avg_len = self._total_len / n_docs or 1.0
+        k1, b = self.k1, self.b
+
+        # BM25 over the postings of the query terms only
+        scores: dict[UUID, float] = {}
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            df = len(postings)
+            idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+            for chunk_id, tf in postings.items():
+                dl = self._doc_len[chunk_id]
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * (
+                    tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl / avg_len)))
+
         results = []
-        for chunk in self.chunks.values():
+        for chunk_id, score in scores.items():
+            chunk = self.chunks[chunk_id]
+
             # Apply filters
             if filters:
                 if 'brands' in filters:
@@ -449,54 +841,35 @@ class KeywordSearcher:
                     if chunk.chunk_type not in filters['chunk_types']:
                         continue
 
-            content_lower = chunk.content.lower()
-            content_terms = self._tokenize(chunk.content)
-
-            # Simple TF scoring
-            score = 0.0
+            spec_names, section, product_ids = self._boost_features[chunk_id]
             for term in terms:
-                tf = content_lower.count(term)
-                if tf > 0:
-                    # Log-normalized TF
-                    score += 1.0 + (tf - 1) * 0.3
-
                 # Boost for exact spec name matches
-                if term in [s.lower().replace('_', ' ') for s in (chunk.spec_names or [])]:
+                if term in spec_names:
                     score += 2.0
 
                 # Boost for section title match
-                if chunk.section_title and term in chunk.section_title.lower():
+                if section and term in section:
                     score += 1.5
 
             # Boost for model number match
-            for model in (chunk.product_ids or []):
-                if str(model).lower() in query.lower():
+            for model in product_ids:
+                if model in query_lower:
                     score += 3.0
 
-            if score > 0:
-                # Normalize by doc length (simple BM25-like)
-                doc_len = len(content_terms) or 1
-                avg_len = 100  # assumed average
-                norm = score / (score + 0.5 * (1 - 0.75 + 0.75 * doc_len / avg_len))
-                results.append((chunk, norm))
+            results.append((chunk, score))
 
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results[:top_k]
+        return heapq.nlargest(top_k, results, key=_BY_SECOND)
 
     @staticmethod
     def _tokenize(text: str) -> list[str]:
         """Simple whitespace tokenizer with stopword removal."""
-        stop = {
-            'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be',
-            'been', 'being', 'have', 'has', 'had', 'do', 'does',
-            'did', 'will', 'would', 'could', 'should', 'may',
-            'might', 'shall', 'can', 'of', 'in', 'to', 'for',
-            'with', 'on', 'at', 'by', 'from', 'it', 'its',
-            'this', 'that', 'and', 'or', 'but', 'not', 'no',
-            'what', 'which', 'who', 'how', 'when', 'where',
-        }
-        words = re.findall(r'\b\w+\b', text.lower())
-        return [w for w in words if w not in stop and len(w) > 1]
+        return KeywordSearcher._tokens(text.lower())
+
+    @staticmethod
+    def _tokens(lowered: str) -> list[str]:
+        """_tokenize for text that is already lowercased."""
+        return [w for w in _WORD_RE.findall(lowered)
+                if len(w) > 1 and w not in _STOPWORDS]
 
 
 # ============================================================
@@ -519,80 +892,92 @@ def reciprocal_rank_fusion(
     vector_weight: float = 0.6,
     keyword_weight: float = 0.3,
     k: int = 60,
+    top_k: Optional[int] = None,
 ) -> list[ScoredChunk]:
     """
     Fuse vector and keyword search results using Reciprocal Rank Fusion.
+    With top_k, only the best top_k fused chunks are returned.
     """
     chunk_scores: dict[UUID, ScoredChunk] = {}
+    get = chunk_scores.get
 
     # Process vector results
     for rank, (chunk, sim) in enumerate(vector_results):
-        rrf = vector_weight / (k + rank + 1)
-        if chunk.id not in chunk_scores:
-            chunk_scores[chunk.id] = ScoredChunk(
+        sc = get(chunk.id)
+        if sc is None:
+            sc = chunk_scores[chunk.id] = ScoredChunk(
                 chunk=chunk, score=0.0, source='vector',
                 vector_rank=rank,
             )
-        chunk_scores[chunk.id].score += rrf
-        chunk_scores[chunk.id].vector_rank = rank
+        sc.score += vector_weight / (k + rank + 1)
+        sc.vector_rank = rank
 
     # Process keyword results
     for rank, (chunk, score) in enumerate(keyword_results):
-        rrf = keyword_weight / (k + rank + 1)
-        if chunk.id not in chunk_scores:
-            chunk_scores[chunk.id] = ScoredChunk(
+        sc = get(chunk.id)
+        if sc is None:
+            sc = chunk_scores[chunk.id] = ScoredChunk(
                 chunk=chunk, score=0.0, source='keyword',
                 keyword_rank=rank,
             )
         else:
-            chunk_scores[chunk.id].source = 'both'
-        chunk_scores[chunk.id].score += rrf
-        chunk_scores[chunk.id].keyword_rank = rank
+            sc.source = 'both'
+        sc.score += keyword_weight / (k + rank + 1)
+        sc.keyword_rank = rank
 
-    results = list(chunk_scores.values())
-    results.sort(key=lambda x: x.score, reverse=True)
-    return results
+    if top_k is not None:
+        return heapq.nlargest(top_k, chunk_scores.values(), key=_BY_SCORE)
+    return sorted(chunk_scores.values(), key=_BY_SCORE, reverse=True)
 
 
 def heuristic_rerank(
     chunks: list[ScoredChunk],
     parsed_query: ParsedQuery,
     config: RAGConfig = DEFAULT_RAG_CONFIG,
+    top_k: Optional[int] = None,
 ) -> list[ScoredChunk]:
     """
     Apply heuristic re-ranking boosts based on query understanding.
-    Used when cross-encoder is disabled.
+    Used when cross-encoder is disabled. With top_k, only the best top_k
+    are returned; otherwise ``chunks`` is sorted in place.
     """
+    perf_specs = {'uniformity_c', 'stability_c', 'energy_kwh_day', 'noise_dba'}
+    dim_specs = {'ext_width_in', 'ext_depth_in', 'ext_height_in'}
+    spec_set = set(parsed_query.spec_mentions)
+    has_perf = bool(perf_specs & spec_set)
+    has_dim = bool(dim_specs & spec_set)
+    models_lower = [m.lower() for m in parsed_query.model_numbers]
+    spec_intent = parsed_query.intent == 'spec_lookup'
+
     for sc in chunks:
         chunk = sc.chunk
         boost = 0.0
 
         # Boost if chunk mentions queried model numbers
-        for model in parsed_query.model_numbers:
-            if model.lower() in chunk.content.lower():
-                boost += 0.15
+        if models_lower:
+            content_lower = chunk.content_lower
+            for model in models_lower:
+                if model in content_lower:
+                    boost += 0.15
 
         # Boost spec_block chunks when query is about specs
-        if parsed_query.intent == 'spec_lookup' and chunk.chunk_type == 'spec_block':
+        if spec_intent and chunk.chunk_type == 'spec_block':
             boost += 0.10
 
         # Boost performance_data chunks for performance queries
-        perf_specs = {'uniformity_c', 'stability_c', 'energy_kwh_day', 'noise_dba'}
-        if perf_specs & set(parsed_query.spec_mentions):
-            if chunk.chunk_type == 'performance_data':
-                boost += 0.12
+        if has_perf and chunk.chunk_type == 'performance_data':
+            boost += 0.12
 
         # Boost dimensional chunks for dimension queries
-        dim_specs = {'ext_width_in', 'ext_depth_in', 'ext_height_in'}
-        if dim_specs & set(parsed_query.spec_mentions):
-            if chunk.chunk_type == 'dimensional':
-                boost += 0.10
+        if has_dim and chunk.chunk_type == 'dimensional':
+            boost += 0.10
 
         # Boost chunks from product_data_sheet docs (more authoritative)
-        if chunk.metadata.get('doc_type') == 'product_data_sheet':
+        doc_type = chunk.metadata.get('doc_type')
+        if doc_type == 'product_data_sheet':
             boost += 0.05
-        elif chunk.metadata.get('doc_type') == 'performance_data_sheet':
-            if perf_specs & set(parsed_query.spec_mentions):
+        elif doc_type == 'performance_data_sheet':
+            if has_perf:
                 boost += 0.08
 
         # Boost chunks that appear in both vector and keyword results
@@ -605,7 +990,9 @@ def heuristic_rerank(
 
         sc.score += boost
 
-    chunks.sort(key=lambda x: x.score, reverse=True)
+    if top_k is not None:
+        return heapq.nlargest(top_k, chunks, key=_BY_SCORE)
+    chunks.sort(key=_BY_SCORE, reverse=True)
     return chunks
 
 
@@ -636,7 +1023,8 @@ def build_context(
     """
     selected: list[ScoredChunk] = []
     citations: list[Citation] = []
-    seen_content: set[str] = set()
+    context_parts: list[str] = []
+    seen_content: set[int] = set()
     token_budget = config.max_context_tokens
     tokens_used = 0
 
@@ -653,19 +1041,22 @@ def build_context(
         seen_content.add(content_sig)
 
         # Check token budget
-        chunk_tokens = (sc.chunk.token_count or _est_tokens(sc.chunk.content))
+        content = sc.chunk.content
+        chunk_tokens = (sc.chunk.token_count or _est_tokens(content))
         chunk_tokens += config.chunk_header_tokens
         if tokens_used + chunk_tokens > token_budget:
-            # Try to fit a truncated version
+            # Try to fit a truncated version. Truncate a copy: the chunk is
+            # shared with the stores and cached rankings.
             remaining = token_budget - tokens_used - config.chunk_header_tokens
             if remaining > 100:
-                sc.chunk.content = sc.chunk.content[:remaining * 4]
+                content = content[:remaining * 4]
                 chunk_tokens = remaining + config.chunk_header_tokens
             else:
                 break
 
         selected.append(sc)
         tokens_used += chunk_tokens
+        context_parts.append(f"{_format_chunk_header(sc, len(selected))}\n{content}")
 
         # Build citation
         citations.append(Citation(
@@ -673,15 +1064,9 @@ def build_context(
             filename='',  # resolved from doc store in production
             page=None,
             section=sc.chunk.section_title,
-            snippet=sc.chunk.content[:200],
+            snippet=content[:200],
         ))
 
-    # Build context text
-    context_parts = []
-    for i, sc in enumerate(selected):
-        header = _format_chunk_header(sc, i + 1)
-        context_parts.append(f"{header}\n{sc.chunk.content}")
-
     context_text = "\n\n---\n\n".join(context_parts)
 
     # Build product context (structured spec summary)
@@ -753,19 +1138,33 @@ def _format_product_context(products: list[Product]) -> str:
             parts.append(f"Certifications: {', '.join(p.certifications)}")
 
         # Dynamic specs
-        for k, v in sorted(p.specs.items()):
-            if not k.startswith('_unknown_') and k != 'product_type':
-                display = k.replace('_', ' ').title()
-                parts.append(f"{display}: {v}")
+        if p.specs:
+            parts.extend(
+                f"{_spec_display_name(k)}: {v}"
+                for k, v in sorted(p.specs.items())
+                if not k.startswith('_unknown_') and k != 'product_type'
+            )
         parts.append("")
 
     return "\n".join(parts)
 
 
-def _content_signature(text: str) -> str:
-    """Generate a signature for dedup. Uses first 100 chars normalized."""
-    sig = re.sub(r'\s+', ' ', text[:200].lower().strip())
-    return sig[:100]
+@lru_cache(maxsize=512)
+def _spec_display_name(name: str) -> str:
+    """'energy_kwh_day' -> 'Energy Kwh Day'; spec names repeat across products."""
+    return name.replace('_', ' ').title()
+
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _content_signature(text: str) -> int:
+    """
+    Generate a signature for dedup: a 64-bit BLAKE2b digest of the first
+    100 chars, normalized, so the seen-set holds ints rather than strings.
+    """
+    sig = _WHITESPACE_RE.sub(' ', text[:200].lower().strip())[:100]
+    return int.from_bytes(hashlib.blake2b(sig.encode(), digest_size=8).digest(), 'little')
 
 
 def _est_tokens(text: str) -> int:
@@ -853,6 +1252,82 @@ def build_prompt(
     return messages
 
 
+# ============================================================
+# Semantic Cache
+# ============================================================
+
+class SemanticCache:
+    """
+    TTL + LRU cache of ranked chunks, looked up by query-vector similarity.
+    Vectors live in one contiguous matrix, so a lookup is a single
+    matrix-vector product. Entries only match within the same `scope`
+    (the parts of the parsed query that steer filtering and re-ranking),
+    so a similar-sounding query about another model never hits.
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        max_size: int = 1024,
+        ttl_s: float = 300.0,
+        threshold: float = 0.95,
+        dtype: str = 'float32',
+    ):
+        self.max_size = max_size
+        self.ttl_s = ttl_s
+        self.threshold = threshold
+        self.dtype = np.dtype(dtype)
+        self._vectors = np.zeros((max_size, dim), dtype=self.dtype)
+        self._expires = np.zeros(max_size)  # 0 = empty slot
+        self._last_used = np.zeros(max_size)
+        self._scope_keys = np.zeros(max_size, dtype=np.int64)
+        self._entries: list[Optional[tuple[Any, Any]]] = [None] * max_size
+
+    def get(self, query_vector: np.ndarray, scope: Any) -> Optional[Any]:
+        """Value of the most similar live entry in scope, if close enough."""
+        slot, sim = self._best(self._normalize(query_vector), scope)
+        if slot is None or sim < self.threshold:
+            return None
+        self._last_used[slot] = time.monotonic()
+        return self._entries[slot][1]
+
+    def put(self, query_vector: np.ndarray, scope: Any, value: Any) -> None:
+        vec = self._normalize(query_vector)
+        now = time.monotonic()
+        slot, sim = self._best(vec, scope)
+        if slot is None or sim < self.threshold:
+            # Reuse an empty or expired slot first, else evict least recently used
+            free = np.flatnonzero(self._expires <= now)
+            slot = int(free[0]) if free.size else int(np.argmin(self._last_used))
+        self._vectors[slot] = vec
+        self._scope_keys[slot] = hash(scope)
+        self._entries[slot] = (scope, value)
+        self._expires[slot] = now + self.ttl_s
+        self._last_used[slot] = now
+
+    def clear(self) -> None:
+        self._expires[:] = 0
+        self._entries = [None] * self.max_size
+
+    def _best(self, vec: np.ndarray, scope: Any) -> tuple[Optional[int], float]:
+        live = np.flatnonzero(
+            (self._expires > time.monotonic()) & (self._scope_keys == hash(scope)))
+        if not len(live):
+            return None, 0.0
+        # Dot products for the live slots of this scope only, not the cache
+        scores = self._vectors[live] @ vec
+        best = int(np.argmax(scores))
+        slot = int(live[best])
+        if self._entries[slot][0] != scope:  # hash collision
+            return None, 0.0
+        return slot, float(scores[best])
+
+    def _normalize(self, vector: np.ndarray) -> np.ndarray:
+        vec = np.asarray(vector, dtype=self.dtype)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
+
+
 # ============================================================
 # Main Retrieval Pipeline
 # ============================================================
@@ -878,6 +1353,15 @@ class RAGPipeline:
         self.product_repo = product_repo
         self.spec_registry = spec_registry or {}
         self.config = config
+        self.semantic_cache = (
+            SemanticCache(
+                embedder.dim,
+                max_size=config.semantic_cache_size,
+                ttl_s=config.semantic_cache_ttl_s,
+                threshold=config.semantic_cache_threshold,
+            )
+            if config.semantic_cache_size > 0 else None
+        )
 
     async def retrieve(
         self,
@@ -902,6 +1386,59 @@ class RAGPipeline:
             expanded_query = f"{query} {' '.join(pq.expanded_terms[:5])}"
         query_vec = await self.embedder.embed_query(expanded_query)
 
+        # Near-duplicate queries reuse the ranked chunks of an earlier one.
+        # The keyword terms and numbers are part of the scope: embeddings of
+        # "26 cu ft" and "49 cu ft" are near-identical, their rankings not.
+        reranked = None
+        if self.semantic_cache is not None:
+            cache_scope = (
+                pq.intent, tuple(pq.model_numbers), tuple(pq.brand_mentions),
+                tuple(pq.spec_mentions), tuple(pq.cert_mentions),
+                tuple(pq.family_hints),
+                tuple(KeywordSearcher._tokenize(query)),
+                tuple(_NUM_TOKEN_RE.findall(query)),
+            )
+            reranked = self.semantic_cache.get(query_vec, cache_scope)
+        if reranked is None:
+            reranked = await self._rank_chunks(query, pq, query_vec)
+            if self.semantic_cache is not None:
+                self.semantic_cache.put(query_vec, cache_scope, reranked)
+
+        # Step 7: Fetch the products named in the query and those referenced
+        # by the top chunks in a single gather. The chunk fan-out no longer
+        # waits on the model lookups; overlaps are dropped afterwards.
+        chunk_pids = list({
+            str(pid): pid
+            for sc in reranked[:5] for pid in (sc.chunk.product_ids or [])
+        }.values())
+        fetched = await asyncio.gather(
+            *(self._get_product(model) for model in pq.model_numbers),
+            *(self._get_product_by_id(pid) for pid in chunk_pids))
+        n_models = len(pq.model_numbers)
+        products = [p for p in fetched[:n_models] if p]
+        seen_pids: set[str] = {str(p.id) for p in products}
+        products.extend(
+            p for pid, p in zip(chunk_pids, fetched[n_models:])
+            if p and str(pid) not in seen_pids)
+
+        # Step 8: Build context
+        context = build_context(
+            reranked, pq, products, self.config)
+
+        # Step 9: Build prompt
+        messages = build_prompt(query, context, conversation_history)
+
+        elapsed = int((time.monotonic() - start) * 1000)
+        logger.info(
+            f"RAG retrieval: {len(reranked)} chunks, "
+            f"{context.total_tokens} tokens, {elapsed}ms")
+
+        return context, messages
+
+    async def _rank_chunks(
+        self, query: str, pq: ParsedQuery, query_vec: np.ndarray,
+    ) -> list[ScoredChunk]:
+        """Steps 3-6: vector + keyword search, fusion and re-ranking."""
         # Step 3: Vector search
         vector_filters = {}
         if pq.brand_mentions:
@@ -915,78 +1452,63 @@ class RAGPipeline:
             vector_filters['chunk_types'] = [
                 'spec_block', 'performance_data', 'description']
 
-        vector_results = await self.vector_store.search(
+        # Started as a task, and given one loop turn to send its query, so a
+        # backend awaiting I/O (pgvector) overlaps with the keyword search
+        # below. The keyword search stays on the event loop: index_chunks
+        # mutates its index from the loop, so a worker thread could see it
+        # mid-update.
+        vector_task = asyncio.create_task(self.vector_store.search(
             query_vec, top_k=self.config.vector_top_k,
             filters=vector_filters if vector_filters else None,
-        )
+        ))
+        await asyncio.sleep(0)
 
         # Step 4: Keyword search
-        keyword_results = self.keyword_searcher.search(
-            query, top_k=self.config.keyword_top_k,
-            filters=vector_filters if vector_filters else None,
-        )
+        try:
+            keyword_results = self.keyword_searcher.search(
+                query, top_k=self.config.keyword_top_k,
+                filters=vector_filters if vector_filters else None,
+            )
+        except BaseException:
+            vector_task.cancel()
+            raise
+        vector_results = await vector_task
 
         # Step 5: Hybrid fusion
+        # (the heuristic boosts can reorder any fused chunk, so fusion only
+        # truncates when the cross-encoder path takes its order as-is)
         fused = reciprocal_rank_fusion(
             vector_results, keyword_results,
             vector_weight=self.config.vector_weight,
             keyword_weight=self.config.keyword_weight,
+            top_k=self.config.final_top_k if self.config.use_cross_encoder else None,
         )
 
         # Step 6: Re-rank
         if self.config.use_cross_encoder:
             # In production: call cross-encoder model
-            reranked = fused[:self.config.final_top_k]
+            reranked = fused
         else:
-            reranked = heuristic_rerank(fused, pq, self.config)
-            reranked = reranked[:self.config.final_top_k]
-
-        # Step 7: Fetch referenced products
-        products = []
-        if pq.model_numbers:
-            for model in pq.model_numbers:
-                p = await self._get_product(model)
-                if p:
-                    products.append(p)
-
-        # Also fetch products referenced by top chunks
-        seen_pids: set[str] = {str(p.id) for p in products}
-        for sc in reranked[:5]:
-            for pid in (sc.chunk.product_ids or []):
-                if str(pid) not in seen_pids:
-                    p = await self._get_product_by_id(pid)
-                    if p:
-                        products.append(p)
-                        seen_pids.add(str(pid))
-
-        # Step 8: Build context
-        context = build_context(
-            reranked, pq, products, self.config)
-
-        # Step 9: Build prompt
-        messages = build_prompt(query, context, conversation_history)
-
-        elapsed = int((time.monotonic() - start) * 1000)
-        logger.info(
-            f"RAG retrieval: {len(reranked)} chunks, "
-            f"{context.total_tokens} tokens, {elapsed}ms")
-
-        return context, messages
+            reranked = heuristic_rerank(
+                fused, pq, self.config, top_k=self.config.final_top_k)
+        return reranked
 
     async def index_chunks(self, chunks: list[DocumentChunk]) -> int:
         """Index chunks into both vector and keyword stores."""
         count = 0
+        # One batched embedding call and one batched store write for the set
+        vecs = await self.embedder.embed_batch([c.content for c in chunks])
+        await self.vector_store.upsert_batch([c.id for c in chunks], vecs)
         for chunk in chunks:
-            # Embed and store in vector store
-            vec = await self.embedder.embed_document(chunk.content)
-            await self.vector_store.upsert(chunk.id, vec)
-
             # Index in keyword store
             if isinstance(self.vector_store, InMemoryVectorStore):
                 self.vector_store.register_chunk(chunk)
             self.keyword_searcher.index_chunk(chunk)
             count += 1
 
+        # Cached rankings predate these chunks
+        if count and self.semantic_cache is not None:
+            self.semantic_cache.clear()
         return count
 
     async def _get_product(self, model: str) -> Optional[Product]:
@@ -1004,6 +1526,31 @@ class RAGPipeline:
 # Grounding Validator
 # ============================================================
 
+_NUMERIC_CLAIM_RE = re.compile(
+    r'(\d+\.?\d*)\s*(cu\.?\s*ft|°[CF]|kWh|dBA|lbs|kg|inches?|in\b|amps?|V\b|Hz|watts?|W\b)',
+    re.IGNORECASE,
+)
+_NUM_TOKEN_RE = re.compile(r'\d+\.?\d*')
+
+_GROUNDING_ATTRS = (
+    'storage_capacity_cuft', 'temp_range_min_c', 'temp_range_max_c',
+    'amperage', 'voltage_v', 'product_weight_lbs',
+    'ext_width_in', 'ext_depth_in', 'ext_height_in',
+)
+
+
+def _product_value_strings(products: list[Product]) -> set[str]:
+    """Stringified fixed-column and spec values of every product."""
+    values: set[str] = set()
+    for p in products:
+        for attr in _GROUNDING_ATTRS:
+            pval = getattr(p, attr, None)
+            if pval is not None:
+                values.add(str(pval))
+        values.update(str(sv) for sv in p.specs.values())
+    return values
+
+
 class GroundingValidator:
     """
     Post-generation validation to check that LLM responses
@@ -1028,42 +1575,27 @@ class GroundingValidator:
         }
 
         # Extract numeric claims from response
-        num_claims = re.findall(
-            r'(\d+\.?\d*)\s*(cu\.?\s*ft|°[CF]|kWh|dBA|lbs|kg|inches?|in\b|amps?|V\b|Hz|watts?|W\b)',
-            response_text, re.IGNORECASE
-        )
+        num_claims = _NUMERIC_CLAIM_RE.findall(response_text)
 
         context_text = context.context_text.lower()
         product_text = (context.product_context or '').lower()
         all_context = f"{context_text} {product_text}"
+        # Every number in the context, scanned once; compared by value so
+        # "26" matches "26.0" but no longer matches inside "126"
+        context_nums = {float(t) for t in _NUM_TOKEN_RE.findall(all_context)}
+        product_values: Optional[set[str]] = None  # built on first miss
 
         for val, unit in num_claims:
             claim = f"{val} {unit}"
             # Check if this value appears in context
-            if val in all_context:
+            if float(val) in context_nums:
                 report['spec_claims'].append({
                     'claim': claim, 'grounded': True})
             else:
                 # Check against product specs
-                found = False
-                for p in products:
-                    for attr in ['storage_capacity_cuft', 'temp_range_min_c',
-                                 'temp_range_max_c', 'amperage', 'voltage_v',
-                                 'product_weight_lbs', 'ext_width_in',
-                                 'ext_depth_in', 'ext_height_in']:
-                        pval = getattr(p, attr, None)
-                        if pval is not None and str(pval) == val:
-                            found = True
-                            break
-                    if not found:
-                        for sv in p.specs.values():
-                            if str(sv) == val:
-                                found = True
-                                break
-                    if found:
-                        break
-
-                if found:
+                if product_values is None:
+                    product_values = _product_value_strings(products)
+                if val in product_values:
                     report['spec_claims'].append({
                         'claim': claim, 'grounded': True})
                 else:
@@ -1073,8 +1605,8 @@ class GroundingValidator:
                         f"Claim '{claim}' not found in retrieved context")
 
         # Check for model numbers not in context
-        for pat in _MODEL_PATTERNS:
-            for m in re.finditer(pat, response_text):
+        for pat in _MODEL_RES:
+            for m in pat.finditer(response_text):
                 model = m.group(1)
                 if model.lower() not in all_context:
                     report['grounded'] = False
@@ -1302,5 +1834,4 @@ async def _example():
 
 
 if __name__ == '__main__':
-    import asyncio
     asyncio.run(_example())
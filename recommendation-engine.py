@@ -12,16 +12,22 @@ Responsibilities:
   7. Citation linkage back to source documents
 """
 from __future__ import annotations
+import asyncio
+import heapq
 import logging
-import re
+import sys
 import time
+from concurrent.futures import Executor
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Optional
+from functools import lru_cache
+from typing import Any, Callable, Optional
 from uuid import UUID, uuid4
 
+import numpy as np
+
 from models import (
-    Product, ProductFamily, Brand, SpecRegistryEntry,
+    Product, ProductFamily, Brand, ProductStatus, SpecRegistryEntry,
     RecommendRequest, RecommendResponse, ProductRecommendation,
     SpecMatchResult, ComplianceResult, Citation, DecisionTrace,
     CompareRequest, CompareResponse,
@@ -35,20 +41,27 @@ logger = logging.getLogger(__name__)
 # Use-Case Profiles
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class UseCaseProfile:
     """Maps a use-case keyword to required/preferred specs and constraints."""
     name: str
     description: str
-    required_families: list[str] = field(default_factory=list)
-    excluded_families: list[str] = field(default_factory=list)
+    required_families: frozenset[str] = field(default_factory=frozenset)
+    excluded_families: frozenset[str] = field(default_factory=frozenset)
     hard_constraints: dict[str, Any] = field(default_factory=dict)
     soft_preferences: dict[str, float] = field(default_factory=dict)
-    required_certifications: list[str] = field(default_factory=list)
+    required_certifications: tuple[str, ...] = ()
     spec_minimums: dict[str, float] = field(default_factory=dict)
     spec_maximums: dict[str, float] = field(default_factory=dict)
     notes: str = ""
 
+    def __post_init__(self):
+        # Profiles are written with lists; families are only membership-
+        # tested, certifications keep their order for messages
+        self.required_families = frozenset(self.required_families)
+        self.excluded_families = frozenset(self.excluded_families)
+        self.required_certifications = tuple(self.required_certifications)
+
 
 USE_CASE_PROFILES: dict[str, UseCaseProfile] = {
     'vaccine_storage': UseCaseProfile(
@@ -218,65 +231,112 @@ USE_CASE_PROFILES: dict[str, UseCaseProfile] = {
 }
 
 
+# Free-text keyword -> USE_CASE_PROFILES key. Built once at import; a query
+# scores one hit per keyword it contains; ties go to the profile listed
+# first.
+_USE_CASE_KEYWORDS: dict[str, str] = {
+    'vaccine': 'vaccine_storage',
+    'vfc': 'vaccine_storage',
+    'cdc': 'vaccine_storage',
+    'immunization': 'vaccine_storage',
+    'pharmacy': 'pharmacy_general',
+    'medication': 'pharmacy_general',
+    'drug storage': 'pharmacy_general',
+    'chromatography': 'chromatography',
+    'hplc': 'chromatography',
+    'fplc': 'chromatography',
+    'column storage': 'chromatography',
+    'blood bank': 'blood_bank',
+    'blood product': 'blood_bank',
+    'transfusion': 'blood_bank',
+    'flammable': 'flammable_storage',
+    'solvent': 'flammable_storage',
+    'nfpa': 'flammable_storage',
+    'explosion': 'flammable_storage',
+    'freezer': 'sample_freezing',
+    'freeze': 'sample_freezing',
+    'frozen': 'sample_freezing',
+    'enzyme': 'sample_freezing',
+    'plasma': 'plasma_storage',
+    'undercounter': 'undercounter',
+    'under counter': 'undercounter',
+    'built-in': 'undercounter',
+    'compact': 'undercounter',
+    'cryogenic': 'cryogenic_storage',
+    'liquid nitrogen': 'cryogenic_storage',
+    'ln2': 'cryogenic_storage',
+    'dewar': 'cryogenic_storage',
+    'vapor shipper': 'cryogenic_storage',
+    'energy': 'energy_efficient',
+    'energy star': 'energy_efficient',
+    'green': 'energy_efficient',
+    'lab': 'laboratory_general',
+    'laboratory': 'laboratory_general',
+    'reagent': 'laboratory_general',
+    'sample': 'laboratory_general',
+    'research': 'laboratory_general',
+}
+
+
+def _nest_keywords(keywords: tuple[str, ...]) -> tuple[tuple[str, tuple[str, ...]], ...]:
+    """
+    Pair each outermost keyword with the keywords it contains
+    ('energy star' -> 'energy'), so a hit on it counts them without
+    scanning. Contained keywords are only scanned when their parent misses.
+    """
+    outer = [kw for kw in keywords if not any(kw != o and kw in o for o in keywords)]
+    nested: dict[str, list[str]] = {kw: [] for kw in outer}
+    for kw in keywords:
+        if kw not in nested:
+            nested[next(o for o in outer if kw in o)].append(kw)
+    return tuple((kw, tuple(inner)) for kw, inner in nested.items())
+
+
+# Grouped once by profile, in order of first appearance, so a query tallies
+# one profile at a time without a per-call scores dict; each group is nested
+# by _nest_keywords
+_USE_CASE_KEYWORD_GROUPS: tuple[tuple[str, tuple[tuple[str, tuple[str, ...]], ...]], ...] = tuple(
+    (profile_key, _nest_keywords(
+        tuple(kw for kw, pk in _USE_CASE_KEYWORDS.items() if pk == profile_key)))
+    for profile_key in dict.fromkeys(_USE_CASE_KEYWORDS.values())
+)
+
+
 def resolve_use_case(text: str) -> Optional[UseCaseProfile]:
     """Match free-text description to a use-case profile."""
     if not text:
         return None
-    t = text.lower()
-
-    keyword_map = {
-        'vaccine': 'vaccine_storage',
-        'vfc': 'vaccine_storage',
-        'cdc': 'vaccine_storage',
-        'immunization': 'vaccine_storage',
-        'pharmacy': 'pharmacy_general',
-        'medication': 'pharmacy_general',
-        'drug storage': 'pharmacy_general',
-        'chromatography': 'chromatography',
-        'hplc': 'chromatography',
-        'fplc': 'chromatography',
-        'column storage': 'chromatography',
-        'blood bank': 'blood_bank',
-        'blood product': 'blood_bank',
-        'transfusion': 'blood_bank',
-        'flammable': 'flammable_storage',
-        'solvent': 'flammable_storage',
-        'nfpa': 'flammable_storage',
-        'explosion': 'flammable_storage',
-        'freezer': 'sample_freezing',
-        'freeze': 'sample_freezing',
-        'frozen': 'sample_freezing',
-        'enzyme': 'sample_freezing',
-        'plasma': 'plasma_storage',
-        'undercounter': 'undercounter',
-        'under counter': 'undercounter',
-        'built-in': 'undercounter',
-        'compact': 'undercounter',
-        'cryogenic': 'cryogenic_storage',
-        'liquid nitrogen': 'cryogenic_storage',
-        'ln2': 'cryogenic_storage',
-        'dewar': 'cryogenic_storage',
-        'vapor shipper': 'cryogenic_storage',
-        'energy': 'energy_efficient',
-        'energy star': 'energy_efficient',
-        'green': 'energy_efficient',
-        'lab': 'laboratory_general',
-        'laboratory': 'laboratory_general',
-        'reagent': 'laboratory_general',
-        'sample': 'laboratory_general',
-        'research': 'laboratory_general',
-    }
-
-    # Score each profile by keyword hits
-    scores: dict[str, int] = {}
-    for kw, profile_key in keyword_map.items():
-        if kw in t:
-            scores[profile_key] = scores.get(profile_key, 0) + 1
-
-    if not scores:
-        return None
+    # Matching is case-insensitive, so the cache is keyed on the lowered
+    # text and phrasings that differ only in case share an entry. Text
+    # that is already lowercase is used as is rather than copied.
+    return _resolve_lowered(text if text.islower() else text.lower())
+
 
-    best = max(scores, key=scores.get)
+@lru_cache(maxsize=2048)
+def _resolve_lowered(t: str) -> Optional[UseCaseProfile]:
+    """
+    resolve_use_case for already-lowercased text.
+
+    Cached per text: the result depends only on the text and the
+    USE_CASE_PROFILES singletons, which are never mutated.
+    """
+    # Score each profile by keyword hits; a strict '>' keeps ties with the
+    # earlier profile
+    best, best_hits = None, 0
+    for profile_key, keywords in _USE_CASE_KEYWORD_GROUPS:
+        hits = 0
+        for kw, inner in keywords:
+            if kw in t:
+                hits += 1 + len(inner)
+            else:
+                for sub in inner:
+                    if sub in t:
+                        hits += 1
+        if hits > best_hits:
+            best, best_hits = profile_key, hits
+
+    if best is None:
+        return None
     return USE_CASE_PROFILES.get(best)
 
 
@@ -284,7 +344,7 @@ def resolve_use_case(text: str) -> Optional[UseCaseProfile]:
 # Scoring Engine
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class ScoringWeights:
     """Configurable weights for the scoring algorithm."""
     hard_match_weight: float = 0.0      # Binary: pass/fail, no partial
@@ -336,6 +396,27 @@ SPEC_IMPORTANCE: dict[str, float] = {
     'vial_capacity_2ml': 0.7,
 }
 
+# Specs numbered once in declaration order. compare() sorts rows by
+# SPEC_RANK: importance first, then spec id, so rows with equal
+# importance come out in the same order on every run.
+SPEC_IDS: dict[str, int] = {name: i for i, name in enumerate(SPEC_IMPORTANCE)}
+SPEC_RANK: dict[str, tuple[float, int]] = {
+    name: (-SPEC_IMPORTANCE[name], i) for name, i in SPEC_IDS.items()
+}
+_UNRANKED_SPEC = (-0.1, len(SPEC_IDS))
+# Known specs in SPEC_RANK order, split around where unranked specs (0.1,
+# ordered by name) fall, so compare() can merge instead of sorting
+_SPEC_ORDER = sorted(SPEC_IDS, key=SPEC_RANK.__getitem__)
+_SPEC_ORDER_HEAD = tuple(s for s in _SPEC_ORDER if SPEC_RANK[s] < _UNRANKED_SPEC)
+_SPEC_ORDER_TAIL = tuple(s for s in _SPEC_ORDER if SPEC_RANK[s] > _UNRANKED_SPEC)
+
+# Public Product columns; _get_spec reads these as attributes, anything
+# else comes from product.specs
+_PRODUCT_FIXED_COLS = frozenset(
+    name for name in Product.__dataclass_fields__ if not name.startswith('_'))
+# SPEC_IMPORTANCE entries stored as Product columns (the rest live in specs)
+_FIXED_SPEC_COLS = tuple(c for c in SPEC_IMPORTANCE if c in _PRODUCT_FIXED_COLS)
+
 
 def score_numeric_match(
     required: float,
@@ -378,10 +459,49 @@ def score_numeric_match(
         return max(0.0, 0.5 - (delta_pct - tolerance_pct) * 1.0)
 
 
+def score_numeric_match_batch(
+    required: float,
+    actual: np.ndarray,
+    tolerance_pct: float = 0.15,
+    prefer_higher: bool = True,
+) -> np.ndarray:
+    """
+    score_numeric_match over an array of product values at once.
+    NaN entries (unknown values) score NaN.
+    """
+    actual = np.asarray(actual, dtype=np.float64)
+    if required == 0:
+        scores = np.where(actual == 0, 1.0, 0.5)
+        scores[np.isnan(actual)] = np.nan
+        return scores
+
+    delta = actual - required
+    delta_pct = np.abs(delta)
+    delta_pct /= abs(required)
+    excess = delta_pct - tolerance_pct
+    # Outside tolerance: slight penalty when off in the acceptable
+    # direction, heavier otherwise. NaN passes through np.maximum.
+    lenient = delta > 0 if prefer_higher else delta < 0
+    scores = np.where(
+        lenient,
+        np.maximum(0.3, 0.7 - excess * 0.5),
+        np.maximum(0.0, 0.5 - excess * 1.0),
+    )
+    # Within tolerance: linear decay, computed only for those entries
+    # (with no tolerance, only exact matches qualify and they score 1.0)
+    if tolerance_pct > 0:
+        within = delta_pct <= tolerance_pct
+        scores[within] = 1.0 - (delta_pct[within] / tolerance_pct) * 0.3
+    scores[delta_pct <= 0.02] = 1.0  # Near-exact match
+    return scores
+
+
 def score_enum_match(required: str, actual: str) -> float:
     """Score an enum/text spec match."""
     if not required or not actual:
         return 0.5  # Can't compare
+    if required == actual:
+        return 1.0  # Already canonical (the usual case); skip normalizing
     r, a = required.lower().strip(), actual.lower().strip()
     if r == a:
         return 1.0
@@ -406,39 +526,45 @@ def score_range_containment(
 
     score = 1.0
 
-    if req_min is not None and prod_min is not None:
-        if prod_min <= req_min:
-            score *= 1.0  # Product can go as low as needed
-        else:
-            gap = prod_min - req_min
-            score *= max(0.0, 1.0 - gap * 0.2)
+    # Each side only costs anything when the product falls short of it
+    if req_min is not None and prod_min > req_min:
+        score = max(0.0, 1.0 - (prod_min - req_min) * 0.2)
 
-    if req_max is not None and prod_max is not None:
-        if prod_max >= req_max:
-            score *= 1.0  # Product can go as high as needed
-        else:
-            gap = req_max - prod_max
-            score *= max(0.0, 1.0 - gap * 0.2)
+    if req_max is not None and prod_max < req_max:
+        score *= max(0.0, 1.0 - (req_max - prod_max) * 0.2)
 
     return score
 
 
+@lru_cache(maxsize=256)
+def _normalized_certs(certs: tuple[str, ...]) -> frozenset[str]:
+    return frozenset(c.upper().replace(' ', '_') for c in certs)
+
+
 def score_certification_match(
-    required: list[str], actual: list[str]
+    required: list[str] | tuple[str, ...], actual: list[str] | frozenset[str]
 ) -> tuple[float, list[str]]:
     """
     Score certification coverage. Returns (score, missing_certs).
     All required certs must be present for a perfect score.
+
+    A frozenset ``actual`` is taken as already normalized
+    (Product.certification_set).
     """
     if not required:
         return 1.0, []
 
-    actual_set = set(c.upper().replace(' ', '_') for c in actual)
-    required_set = set(c.upper().replace(' ', '_') for c in required)
+    if isinstance(actual, frozenset):
+        actual_set = actual
+    else:
+        actual_set = _normalized_certs(tuple(actual))
+    required_set = _normalized_certs(tuple(required))
+
+    # Common case: everything held, answered without building a new set
+    if required_set <= actual_set:
+        return 1.0, []
 
     missing = required_set - actual_set
-    if not missing:
-        return 1.0, []
 
     coverage = 1.0 - len(missing) / len(required_set)
     return coverage, sorted(missing)
@@ -448,7 +574,7 @@ def score_certification_match(
 # Product Scorer
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class ProductScore:
     """Complete scoring result for one product against a request."""
     product: Product
@@ -461,39 +587,234 @@ class ProductScore:
     notes: list[str] = field(default_factory=list)
 
 
-def score_product(
-    product: Product,
-    request: RecommendRequest,
-    use_case: Optional[UseCaseProfile] = None,
-    weights: ScoringWeights = DEFAULT_WEIGHTS,
-) -> ProductScore:
-    """
-    Score a single product against a recommendation request.
-    Returns a ProductScore with full breakdown.
-    """
-    ps = ProductScore(product=product)
-    component_scores: list[tuple[float, float]] = []  # (score, weight)
+# Certifications that earn a scoring bonus beyond the required set
+_BONUS_CERTS = ('Energy_Star', 'EPA_SNAP')
+
+
+# Exterior dimension column -> request key for its maximum
+_DIM_MAX_KEYS = (
+    ('ext_width_in', 'max_width_in'),
+    ('ext_depth_in', 'max_depth_in'),
+    ('ext_height_in', 'max_height_in'),
+)
 
-    # Merge use-case constraints with explicit request
+
+@dataclass(slots=True)
+class _RequestTerms:
+    """Request-level scoring inputs, derived once per request rather than per product."""
+    hard_constraints: dict[str, Any]
+    soft_prefs: dict[str, float]
+    required_certs: tuple[str, ...]
+    spec_mins: dict[str, float]
+    spec_maxs: dict[str, float]
+    req_tmin: Optional[float]
+    req_tmax: Optional[float]
+    # (ext_* column, requested maximum) for dimensional fit scoring
+    dim_maxes: tuple[tuple[str, Any], ...]
+    # Performance specs (uniformity, stability) the request gives weight to
+    perf_specs: tuple[str, ...]
+    # Soft preferences strong enough (> 0.5) to boost the total score
+    boost_prefs: tuple[tuple[str, float], ...]
+
+
+def _request_terms(
+    request: RecommendRequest, use_case: Optional[UseCaseProfile],
+) -> _RequestTerms:
+    """Merge use-case constraints with the explicit request."""
     hard_constraints = dict(request.constraints)
     soft_prefs = dict(request.preferences)
-    required_certs: list[str] = []
+    required_certs: tuple[str, ...] = ()
     spec_mins: dict[str, float] = {}
     spec_maxs: dict[str, float] = {}
-    family_filter = request.family_filter or []
 
     if use_case:
         hard_constraints = {**use_case.hard_constraints, **hard_constraints}
         soft_prefs = {**use_case.soft_preferences, **soft_prefs}
-        required_certs = list(use_case.required_certifications)
+        required_certs = use_case.required_certifications
         spec_mins = dict(use_case.spec_minimums)
         spec_maxs = dict(use_case.spec_maximums)
-        if use_case.required_families and not family_filter:
-            family_filter = use_case.required_families
 
-    # ----------------------------------------------------------
-    # Phase 1: Hard Constraints (binary pass/fail)
-    # ----------------------------------------------------------
+    dim_maxes = []
+    for dim_spec, max_key in _DIM_MAX_KEYS:
+        req_max = request.structured_specs.get(max_key)
+        if not req_max:
+            req_max = spec_maxs.get(dim_spec)
+        if req_max:
+            dim_maxes.append((dim_spec, req_max))
+
+    return _RequestTerms(
+        hard_constraints=hard_constraints,
+        soft_prefs=soft_prefs,
+        required_certs=required_certs,
+        spec_mins=spec_mins,
+        spec_maxs=spec_maxs,
+        req_tmin=spec_mins.get('temp_range_min_c'),
+        req_tmax=spec_maxs.get('temp_range_max_c'),
+        dim_maxes=tuple(dim_maxes),
+        perf_specs=tuple(
+            s for s in ('uniformity_c', 'stability_c') if soft_prefs.get(s, 0) > 0),
+        boost_prefs=tuple((k, w) for k, w in soft_prefs.items() if w > 0.5),
+    )
+
+
+class ProductColumnStore:
+    """
+    Column-per-spec view of a candidate list, for filtering the whole pool
+    with array operations instead of per-product attribute reads.
+
+    Columns are built on first use, so only the specs a request actually
+    constrains are gathered. Numeric columns are float64 with NaN for
+    missing values; text columns are object arrays of _get_spec values.
+    Built per request (or per recommend_many batch, with take() giving each
+    request its rows): products can be edited in place during ingestion.
+    """
+
+    def __init__(self, products: list[Product]):
+        self.products = products
+        # (parent store, row indices) for views made by take()
+        self._parent: Optional[tuple[ProductColumnStore, np.ndarray]] = None
+        self._numeric: dict[str, np.ndarray] = {}
+        self._text: dict[str, np.ndarray] = {}
+        self._normalized: dict[str, np.ndarray] = {}
+        self._as_float: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def take(self, idx: np.ndarray) -> ProductColumnStore:
+        """Store over the given rows; its columns are sliced from this one's."""
+        view = ProductColumnStore([self.products[i] for i in idx.tolist()])
+        view._parent = (self, idx)
+        return view
+
+    def numeric(self, col: str) -> np.ndarray:
+        arr = self._numeric.get(col)
+        if arr is None:
+            if self._parent is not None:
+                parent, idx = self._parent
+                arr = self._numeric[col] = parent.numeric(col)[idx]
+            else:
+                arr = self._numeric[col] = np.array(
+                    [np.nan if (v := getattr(p, col)) is None else v
+                     for p in self.products],
+                    dtype=np.float64)
+        return arr
+
+    def text(self, spec: str) -> np.ndarray:
+        arr = self._text.get(spec)
+        if arr is None:
+            if self._parent is not None:
+                parent, idx = self._parent
+                arr = self._text[spec] = parent.text(spec)[idx]
+            else:
+                arr = self._text[spec] = np.empty(len(self.products), dtype=object)
+                arr[:] = [_get_spec(p, spec) for p in self.products]
+        return arr
+
+    def present(self, spec: str) -> np.ndarray:
+        """True where the product has a value for spec."""
+        return np.fromiter(
+            (v is not None for v in self.text(spec)), dtype=bool, count=len(self))
+
+    def normalized_str(self, spec: str) -> np.ndarray:
+        """normalize_val of each text(spec) value ('' when missing)."""
+        arr = self._normalized.get(spec)
+        if arr is None:
+            arr = self._normalized[spec] = np.empty(len(self.products), dtype=object)
+            arr[:] = [normalize_val(v) for v in self.text(spec)]
+        return arr
+
+    def as_float(self, spec: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        float() of each text(spec) value, plus a mask of the values that
+        converted. Missing and non-numeric values are NaN in the first array.
+        """
+        pair = self._as_float.get(spec)
+        if pair is None:
+            values = np.full(len(self.products), np.nan)
+            ok = np.zeros(len(self.products), dtype=bool)
+            for i, v in enumerate(self.text(spec)):
+                if v is None:
+                    continue
+                try:
+                    values[i] = float(v)
+                    ok[i] = True
+                except (ValueError, TypeError):
+                    pass
+            pair = self._as_float[spec] = (values, ok)
+        return pair
+
+
+def _hard_filter_mask(
+    store: ProductColumnStore,
+    request: RecommendRequest,
+    terms: _RequestTerms,
+) -> np.ndarray:
+    """
+    Vectorized Phase 1: True for products that pass every hard constraint.
+    Mirrors _check_hard_constraints, which still builds the failure reasons.
+
+    The numeric constraints are whole-column comparisons and run first; the
+    text and certification checks need a Python call per product, so they
+    only visit the products still passing.
+    """
+    hard_constraints, required_certs = terms.hard_constraints, terms.required_certs
+    ok = np.ones(len(store), dtype=bool)
+
+    req_voltage = request.structured_specs.get('voltage_v') or hard_constraints.get('voltage_v')
+    if req_voltage:
+        volts = store.numeric('voltage_v')
+        # NaN (unknown) and 0 are treated as unset, as in the scalar check
+        ok &= ~((volts != 0) & ~np.isnan(volts) & (volts != int(req_voltage)))
+
+    for dim_col, max_val in terms.dim_maxes:
+        dims = store.numeric(dim_col)
+        ok &= ~((dims != 0) & (dims > float(max_val)))
+
+    req_tmin, req_tmax = terms.req_tmin, terms.req_tmax
+    if req_tmin is not None:
+        ok &= ~(store.numeric('temp_range_min_c') > req_tmin + 0.5)
+    if req_tmax is not None:
+        ok &= ~(store.numeric('temp_range_max_c') < req_tmax - 0.5)
+
+    def keep_passing(test: Callable[[Product], bool]) -> None:
+        idx = np.flatnonzero(ok)
+        products = store.products
+        ok[idx] = np.fromiter(
+            (test(products[i]) for i in idx.tolist()), dtype=bool, count=len(idx))
+
+    def text_matches(spec: str, wanted: Any) -> Callable[[Product], bool]:
+        # A missing/empty product value never fails a text constraint
+        def test(p: Product) -> bool:
+            v = _get_spec(p, spec)
+            return not v or v == wanted
+        return test
+
+    pt = hard_constraints.get('product_type')
+    if pt:
+        keep_passing(text_matches('product_type', pt))
+
+    req_door = hard_constraints.get('door_type')
+    if req_door:
+        keep_passing(text_matches('door_type', req_door))
+
+    if required_certs:
+        required = _normalized_certs(tuple(required_certs))
+        keep_passing(lambda p: required <= p.certification_set)
+    return ok
+
+
+def _check_hard_constraints(
+    ps: ProductScore,
+    request: RecommendRequest,
+    hard_constraints: dict[str, Any],
+    required_certs: tuple[str, ...],
+    dim_maxes: tuple[tuple[str, Any], ...],
+    req_tmin: Optional[float],
+    req_tmax: Optional[float],
+) -> None:
+    """Phase 1 of score_product: record each hard-constraint failure on ps."""
+    product = ps.product
 
     # Family filter
     # Note: in production, family_id would be resolved to family_code
@@ -526,22 +847,14 @@ def score_product(
                 f"Door type mismatch: need {req_door}, got {product.door_type}")
 
     # Dimension maximums (must fit in space)
-    for dim_spec, dim_col in [
-        ('max_width_in', 'ext_width_in'),
-        ('max_depth_in', 'ext_depth_in'),
-        ('max_height_in', 'ext_height_in'),
-    ]:
-        max_val = request.structured_specs.get(dim_spec) or spec_maxs.get(dim_col)
-        if max_val:
-            prod_val = getattr(product, dim_col, None)
-            if prod_val and prod_val > float(max_val):
-                ps.hard_pass = False
-                ps.hard_fail_reasons.append(
-                    f"Exceeds max {dim_col}: {prod_val}\" > {max_val}\"")
+    for dim_col, max_val in dim_maxes:
+        prod_val = getattr(product, dim_col, None)
+        if prod_val and prod_val > float(max_val):
+            ps.hard_pass = False
+            ps.hard_fail_reasons.append(
+                f"Exceeds max {dim_col}: {prod_val}\" > {max_val}\"")
 
     # Temperature range must cover requirements
-    req_tmin = spec_mins.get('temp_range_min_c')
-    req_tmax = spec_maxs.get('temp_range_max_c')
     if req_tmin is not None and product.temp_range_min_c is not None:
         if product.temp_range_min_c > req_tmin + 0.5:
             ps.hard_pass = False
@@ -556,18 +869,66 @@ def score_product(
     # Required certifications
     if required_certs:
         cert_score, missing = score_certification_match(
-            required_certs, product.certifications
+            required_certs, product.certification_set
         )
         ps.missing_certs = missing
         if missing:
             ps.hard_pass = False
             ps.hard_fail_reasons.append(
                 f"Missing required certifications: {', '.join(missing)}")
-        ps.compliance_results.append(ComplianceResult(
-            rule='required_certifications',
-            status='pass' if not missing else 'fail',
-            details=f"Required: {required_certs}. Missing: {missing or 'none'}",
-        ))
+        ps.compliance_results.append(_cert_compliance(required_certs, missing))
+
+
+def _cert_compliance(required_certs: tuple[str, ...], missing: list[str]) -> ComplianceResult:
+    return ComplianceResult.model_construct(
+        rule='required_certifications',
+        status='pass' if not missing else 'fail',
+        details=f"Required: {list(required_certs)}. Missing: {missing or 'none'}",
+    )
+
+
+def score_product(
+    product: Product,
+    request: RecommendRequest,
+    use_case: Optional[UseCaseProfile] = None,
+    weights: ScoringWeights = DEFAULT_WEIGHTS,
+    capacity_score: Optional[float] = None,
+    hard_checked: bool = False,
+    terms: Optional[_RequestTerms] = None,
+    detail: bool = True,
+) -> ProductScore:
+    """
+    Score a single product against a recommendation request.
+    Returns a ProductScore with full breakdown.
+
+    capacity_score, when given, is this product's precomputed
+    score_numeric_match for the requested capacity, and hard_checked=True
+    means the product is already known to pass the hard constraints (see
+    RecommendationEngine.recommend, which handles both for the whole pool
+    and derives ``terms`` once per request). detail=False skips the spec
+    match and compliance records and only sets total_score, which is
+    identical either way.
+    """
+    ps = ProductScore(product=product)
+    component_scores: list[tuple[float, float]] = []  # (score, weight)
+
+    if terms is None:
+        terms = _request_terms(request, use_case)
+    hard_constraints = terms.hard_constraints
+    required_certs = terms.required_certs
+    req_tmin, req_tmax = terms.req_tmin, terms.req_tmax
+
+    # ----------------------------------------------------------
+    # Phase 1: Hard Constraints (binary pass/fail)
+    # ----------------------------------------------------------
+    if hard_checked:
+        # Already passed _hard_filter_mask; only the compliance record is left
+        if required_certs and detail:
+            ps.compliance_results.append(_cert_compliance(required_certs, []))
+    else:
+        _check_hard_constraints(
+            ps, request, hard_constraints, required_certs,
+            terms.dim_maxes, req_tmin, req_tmax)
 
     # If hard fail, score = 0 and return early
     if not ps.hard_pass:
@@ -581,20 +942,24 @@ def score_product(
     # Capacity scoring
     req_cap = request.structured_specs.get('storage_capacity_cuft')
     if req_cap and product.storage_capacity_cuft:
-        cap_score = score_numeric_match(
-            float(req_cap), product.storage_capacity_cuft,
-            tolerance_pct=0.20, prefer_higher=True)
+        cap_score = capacity_score
+        if cap_score is None:
+            cap_score = score_numeric_match(
+                float(req_cap), product.storage_capacity_cuft,
+                tolerance_pct=0.20, prefer_higher=True)
         component_scores.append((cap_score, weights.capacity_weight))
-        ps.spec_matches.append(SpecMatchResult(
-            spec='storage_capacity_cuft',
-            display_name='Storage Capacity',
-            value_required=req_cap,
-            value_product=product.storage_capacity_cuft,
-            unit='cu.ft.',
-            delta_pct=_delta_pct(float(req_cap), product.storage_capacity_cuft),
-            within_tolerance=abs(_delta_pct(float(req_cap), product.storage_capacity_cuft) or 0) <= 20,
-            score=cap_score,
-        ))
+        if detail:
+            cap_delta = _delta_pct(float(req_cap), product.storage_capacity_cuft)
+            ps.spec_matches.append(SpecMatchResult.model_construct(
+                spec='storage_capacity_cuft',
+                display_name='Storage Capacity',
+                value_required=req_cap,
+                value_product=product.storage_capacity_cuft,
+                unit='cu.ft.',
+                delta_pct=cap_delta,
+                within_tolerance=abs(cap_delta or 0) <= 20,
+                score=cap_score,
+            ))
 
     # Temperature range scoring
     if product.temp_range_min_c is not None and product.temp_range_max_c is not None:
@@ -603,34 +968,35 @@ def score_product(
             product.temp_range_min_c, product.temp_range_max_c,
         )
         component_scores.append((temp_score, weights.temperature_weight))
-        ps.spec_matches.append(SpecMatchResult(
-            spec='temp_range',
-            display_name='Temperature Range',
-            value_required=f"{req_tmin or '?'}°C to {req_tmax or '?'}°C",
-            value_product=f"{product.temp_range_min_c}°C to {product.temp_range_max_c}°C",
-            unit='°C',
-            score=temp_score,
-        ))
+        if detail:
+            ps.spec_matches.append(SpecMatchResult.model_construct(
+                spec='temp_range',
+                display_name='Temperature Range',
+                value_required=f"{req_tmin or '?'}°C to {req_tmax or '?'}°C",
+                value_product=f"{product.temp_range_min_c}°C to {product.temp_range_max_c}°C",
+                unit='°C',
+                score=temp_score,
+            ))
 
     # Performance specs (uniformity, stability)
     perf_scores = []
-    for perf_spec in ['uniformity_c', 'stability_c']:
+    for perf_spec in terms.perf_specs:
         prod_val = _get_spec(product, perf_spec)
-        pref_weight = soft_prefs.get(perf_spec, 0)
-        if prod_val is not None and pref_weight > 0:
+        if prod_val is not None:
             # Lower uniformity/stability = better
             # Score inversely — ±1.0°C is excellent, ±3.0°C is poor
             try:
                 val = float(prod_val)
                 s = max(0.0, min(1.0, 1.0 - (val - 0.5) / 3.0))
                 perf_scores.append(s)
-                ps.spec_matches.append(SpecMatchResult(
-                    spec=perf_spec,
-                    display_name=perf_spec.replace('_', ' ').title(),
-                    value_product=f"±{val}°C",
-                    unit='±°C',
-                    score=s,
-                ))
+                if detail:
+                    ps.spec_matches.append(SpecMatchResult.model_construct(
+                        spec=perf_spec,
+                        display_name=_display_name(perf_spec),
+                        value_product=f"±{val}°C",
+                        unit='±°C',
+                        score=s,
+                    ))
             except (ValueError, TypeError):
                 pass
 
@@ -647,10 +1013,11 @@ def score_product(
             # Typical range: 0.5–3.0 kWh/day
             s = max(0.0, min(1.0, 1.0 - (e - 0.5) / 3.0))
             eff_scores.append(s)
-            ps.spec_matches.append(SpecMatchResult(
-                spec='energy_kwh_day', display_name='Energy Consumption',
-                value_product=f"{e} kWh/day", unit='kWh/day', score=s,
-            ))
+            if detail:
+                ps.spec_matches.append(SpecMatchResult.model_construct(
+                    spec='energy_kwh_day', display_name='Energy Consumption',
+                    value_product=f"{e} kWh/day", unit='kWh/day', score=s,
+                ))
         except (ValueError, TypeError):
             pass
 
@@ -661,10 +1028,11 @@ def score_product(
             # Typical range: 35–55 dBA
             s = max(0.0, min(1.0, 1.0 - (n - 35) / 25.0))
             eff_scores.append(s)
-            ps.spec_matches.append(SpecMatchResult(
-                spec='noise_dba', display_name='Noise Level',
-                value_product=f"{n} dBA", unit='dBA', score=s,
-            ))
+            if detail:
+                ps.spec_matches.append(SpecMatchResult.model_construct(
+                    spec='noise_dba', display_name='Noise Level',
+                    value_product=f"{n} dBA", unit='dBA', score=s,
+                ))
         except (ValueError, TypeError):
             pass
 
@@ -673,26 +1041,23 @@ def score_product(
         component_scores.append((avg_eff, weights.efficiency_weight))
 
     # Certification bonus (beyond required)
-    bonus_certs = ['Energy_Star', 'EPA_SNAP']
-    bonus = sum(1 for c in bonus_certs if c in product.certifications)
+    bonus_held = [c for c in _BONUS_CERTS if c in product.certifications]
+    bonus = len(bonus_held)
     if bonus:
         cert_bonus = min(1.0, 0.5 + bonus * 0.25)
         component_scores.append((cert_bonus, weights.certification_weight))
-        ps.compliance_results.append(ComplianceResult(
-            rule='bonus_certifications',
-            status='pass',
-            details=f"Has {bonus} bonus certifications: "
-                    f"{[c for c in bonus_certs if c in product.certifications]}",
-        ))
+        if detail:
+            ps.compliance_results.append(ComplianceResult.model_construct(
+                rule='bonus_certifications',
+                status='pass',
+                details=f"Has {bonus} bonus certifications: {bonus_held}",
+            ))
 
     # Dimensional fit scoring
     dim_scores = []
-    for dim_spec in ['ext_width_in', 'ext_depth_in', 'ext_height_in']:
-        req_max = request.structured_specs.get(f'max_{dim_spec.replace("ext_", "")}')
-        if not req_max:
-            req_max = spec_maxs.get(dim_spec)
+    for dim_spec, req_max in terms.dim_maxes:
         prod_val = getattr(product, dim_spec, None)
-        if req_max and prod_val:
+        if prod_val:
             # Closer to max = better fit (uses space efficiently)
             ratio = float(prod_val) / float(req_max)
             if ratio <= 1.0:
@@ -734,14 +1099,33 @@ def score_product(
         ps.total_score = 0.5  # No specs to compare — neutral score
 
     # Apply use-case preference boosts
-    for spec_name, pref_weight in soft_prefs.items():
-        prod_val = _get_spec(product, spec_name)
-        if prod_val is not None and pref_weight > 0.5:
+    for spec_name, pref_weight in terms.boost_prefs:
+        if _get_spec(product, spec_name) is not None:
             ps.total_score = min(1.0, ps.total_score * (1.0 + pref_weight * 0.05))
 
     return ps
 
 
+def _score_shard(
+    products: list[Product],
+    request: RecommendRequest,
+    use_case: Optional[UseCaseProfile],
+    capacity_scores: list[Optional[float]],
+    terms: _RequestTerms,
+) -> list[float]:
+    """
+    Total scores for a slice of products that passed _hard_filter_mask
+    (module-level so pools can pickle it). The breakdown is skipped here;
+    recommend rebuilds it for the few products it returns.
+    """
+    return [
+        score_product(
+            product, request, use_case, capacity_score=cap_score,
+            hard_checked=True, terms=terms, detail=False).total_score
+        for product, cap_score in zip(products, capacity_scores)
+    ]
+
+
 # ============================================================
 # Recommendation Engine
 # ============================================================
@@ -753,18 +1137,49 @@ class RecommendationEngine:
       scoring → ranking → response assembly
     """
 
-    def __init__(self, repo: Any):
+    def __init__(
+        self,
+        repo: Any,
+        executor: Optional[Executor] = None,
+        shard_size: int = 200,
+    ):
         """
         Args:
             repo: ProductRepository (from ingestion_orchestrator module)
+            executor: optional process pool for candidate scoring; pools
+                larger than shard_size are split across it. Scoring runs
+                inline when unset.
+            shard_size: candidates per executor task
         """
         self.repo = repo
+        self.executor = executor
+        self.shard_size = shard_size
 
     async def recommend(
         self, request: RecommendRequest
     ) -> RecommendResponse:
         """Generate product recommendations for a request."""
+        return await self._recommend(request, None)
+
+    async def recommend_many(
+        self, requests: list[RecommendRequest]
+    ) -> list[RecommendResponse]:
+        """
+        Recommendations for several requests, in request order. The product
+        catalog is read from the repository once, and its spec columns are
+        built once, for all of them.
+        """
+        catalog = ProductColumnStore(await self._get_all_products())
+        return [await self._recommend(r, catalog) for r in requests]
+
+    async def _recommend(
+        self,
+        request: RecommendRequest,
+        catalog: Optional[ProductColumnStore],
+    ) -> RecommendResponse:
         start = time.monotonic()
+        # One wall-clock stamp for every trace step of this request
+        now = _now()
         trace: list[DecisionTrace] = []
         warnings: list[str] = []
         clarifications: list[dict] = []
@@ -783,23 +1198,30 @@ class RecommendationEngine:
                 step='use_case_resolution',
                 detail=f"Resolved to: {use_case.name} — {use_case.description}",
                 products_remaining=0,
-                timestamp=_now(),
+                timestamp=now,
             ))
         else:
             trace.append(DecisionTrace(
                 step='use_case_resolution',
                 detail='No specific use case matched; using general matching',
                 products_remaining=0,
-                timestamp=_now(),
+                timestamp=now,
             ))
 
         # --- Step 2: Get candidate products ---
-        candidates = await self._get_candidates(request, use_case)
+        if catalog is None:
+            candidates = await self._get_candidates(request, use_case)
+            store = ProductColumnStore(candidates)
+        else:
+            rows = np.array(
+                self._candidate_rows(request, use_case, catalog.products), dtype=np.intp)
+            store = catalog.take(rows)
+            candidates = store.products
         trace.append(DecisionTrace(
             step='candidate_pool',
             detail=f"Initial candidate pool: {len(candidates)} products",
             products_remaining=len(candidates),
-            timestamp=_now(),
+            timestamp=now,
         ))
 
         if not candidates:
@@ -818,46 +1240,82 @@ class RecommendationEngine:
             )
 
         # --- Step 3: Score all candidates ---
-        scored: list[ProductScore] = []
-        for product in candidates:
-            ps = score_product(product, request, use_case)
-            scored.append(ps)
+        # Hard constraints and capacity are evaluated for the whole pool in
+        # vectorized passes over a columnar view of the candidates
+        terms = _request_terms(request, use_case)
+        hard_mask = _hard_filter_mask(store, request, terms)
+        pass_idx = np.flatnonzero(hard_mask)
+        pool = [candidates[i] for i in pass_idx.tolist()]
+        cap_scores: list[Optional[float]] = [None] * len(pool)
+        req_cap = request.structured_specs.get('storage_capacity_cuft')
+        if req_cap:
+            cap_scores = score_numeric_match_batch(
+                float(req_cap), store.numeric('storage_capacity_cuft')[pass_idx],
+                tolerance_pct=0.20, prefer_higher=True).tolist()
+
+        if self.executor is not None and len(pool) > self.shard_size:
+            loop = asyncio.get_running_loop()
+            n = self.shard_size
+            shards = await asyncio.gather(*(
+                loop.run_in_executor(
+                    self.executor, _score_shard,
+                    pool[i:i + n], request, use_case, cap_scores[i:i + n], terms)
+                for i in range(0, len(pool), n)
+            ))
+            scores = [score for shard in shards for score in shard]
+        else:
+            scores = _score_shard(pool, request, use_case, cap_scores, terms)
 
         # --- Step 4: Separate pass/fail ---
-        passing = [s for s in scored if s.hard_pass]
-        failing = [s for s in scored if not s.hard_pass]
+        # Failing products are only scored (for their reasons) if they are
+        # needed as alternates below
+        n_failing = len(candidates) - len(pool)
 
         trace.append(DecisionTrace(
             step='hard_filter',
-            detail=f"{len(passing)} pass hard constraints, "
-                   f"{len(failing)} filtered out",
-            products_remaining=len(passing),
-            timestamp=_now(),
+            detail=f"{len(pool)} pass hard constraints, "
+                   f"{n_failing} filtered out",
+            products_remaining=len(pool),
+            timestamp=now,
         ))
 
         # --- Step 5: Rank by score ---
-        passing.sort(key=lambda s: s.total_score, reverse=True)
+        # Only the top few are used; nlargest matches a stable descending
+        # sort. Their full breakdowns are built now, from the same inputs.
+        top_n = request.top_n or 5
+        ranked = [
+            score_product(
+                pool[i], request, use_case, capacity_score=cap_scores[i],
+                hard_checked=True, terms=terms)
+            for i in heapq.nlargest(
+                top_n + (3 if request.include_alternates else 0),
+                range(len(pool)), key=scores.__getitem__)
+        ]
 
         # --- Step 6: Build response ---
-        top_n = request.top_n or 5
-        primary = passing[:top_n]
-        alternates = passing[top_n:top_n + 3] if request.include_alternates else []
+        primary = ranked[:top_n]
+        alternates = ranked[top_n:]
 
         # If too few passing, suggest best-failing as alternates
-        if len(primary) < top_n and failing:
-            failing.sort(key=lambda s: s.total_score, reverse=True)
-            for f in failing[:3]:
+        if len(primary) < top_n and n_failing:
+            # Failing products all score 0.0, so the stable sort used to
+            # leave the first three in candidate order
+            failing = [
+                score_product(candidates[i], request, use_case, terms=terms)
+                for i in np.flatnonzero(~hard_mask)[:3].tolist()
+            ]
+            for f in failing:
                 f.notes.append(
                     f"Does not meet all requirements: "
                     f"{'; '.join(f.hard_fail_reasons)}")
-            alternates.extend(failing[:3])
+            alternates.extend(failing)
 
         trace.append(DecisionTrace(
             step='ranking',
             detail=f"Top {len(primary)} recommendations, "
                    f"{len(alternates)} alternates",
             products_remaining=len(primary),
-            timestamp=_now(),
+            timestamp=now,
         ))
 
         # --- Step 7: Generate clarifications if needed ---
@@ -891,11 +1349,8 @@ class RecommendationEngine:
 
     async def compare(self, request: CompareRequest) -> CompareResponse:
         """Compare multiple products side-by-side."""
-        products: list[Product] = []
-        for pid in request.product_ids:
-            p = await self._get_product_by_id(pid)
-            if p:
-                products.append(p)
+        found = await self._get_products_by_id(request.product_ids)
+        products = [found[pid] for pid in request.product_ids if pid in found]
 
         if len(products) < 2:
             return CompareResponse(
@@ -908,22 +1363,24 @@ class RecommendationEngine:
         # Determine which specs to compare
         all_specs = set()
         for p in products:
-            # Fixed columns
-            for col in SPEC_IMPORTANCE:
-                val = _get_spec(p, col)
-                if val is not None:
-                    all_specs.add(col)
+            # Fixed columns (a None column falling back to specs is covered
+            # by the dynamic keys below)
+            all_specs.update(
+                col for col in _FIXED_SPEC_COLS if getattr(p, col) is not None)
             # Dynamic specs
-            for k in p.specs:
-                if not k.startswith('_unknown_'):
-                    all_specs.add(k)
+            all_specs.update(k for k in p.specs if not k.startswith('_unknown_'))
 
         # Build comparison rows
         specs_compared = []
-        for spec in sorted(all_specs, key=lambda s: SPEC_IMPORTANCE.get(s, 0.1), reverse=True):
+        ordered_specs = [
+            *(s for s in _SPEC_ORDER_HEAD if s in all_specs),
+            *sorted(all_specs.difference(SPEC_RANK)),
+            *(s for s in _SPEC_ORDER_TAIL if s in all_specs),
+        ]
+        for spec in ordered_specs:
             row = {
                 'spec': spec,
-                'display_name': spec.replace('_', ' ').title(),
+                'display_name': _display_name(spec),
                 'values': {},
                 'has_difference': False,
             }
@@ -952,8 +1409,9 @@ class RecommendationEngine:
             scores = [0.0] * len(products)
 
         # Generate summary
-        if scores and max(scores) > 0:
-            best_idx = scores.index(max(scores))
+        # One pass; max() keeps the first of tied scores, like index(max(...))
+        best_idx = max(range(len(scores)), key=scores.__getitem__, default=None)
+        if best_idx is not None and scores[best_idx] > 0:
             summary = (
                 f"Based on your requirements, the {products[best_idx].model_number} "
                 f"scores highest at {scores[best_idx]:.0%}. "
@@ -1006,54 +1464,59 @@ class RecommendationEngine:
             required_match = ['door_type', 'refrigerant', 'voltage_v']
 
         all_products = await self._get_all_products()
-        equivalents: list[tuple[Product, float]] = []
-
-        for candidate in all_products:
-            if candidate.id == product.id:
-                continue
-
-            # Check required exact matches
-            exact_fail = False
-            for spec in required_match:
-                ref_val = _get_spec(product, spec)
-                cand_val = _get_spec(candidate, spec)
-                if ref_val is not None and cand_val is not None:
-                    if normalize_val(ref_val) != normalize_val(cand_val):
-                        exact_fail = True
-                        break
-            if exact_fail:
-                continue
-
-            # Score similarity
-            sim_scores: list[float] = []
-            for spec, tol in tolerance_map.items():
-                ref_val = _get_spec(product, spec)
-                cand_val = _get_spec(candidate, spec)
-                if ref_val is not None and cand_val is not None:
-                    try:
-                        r, c = float(ref_val), float(cand_val)
-                        denom = max(abs(r), 1e-9)
-                        delta = abs(r - c) / denom
-                        if delta > tol * 2:
-                            exact_fail = True
-                            break
-                        sim_scores.append(max(0.0, 1.0 - delta / tol))
-                    except (ValueError, TypeError):
-                        if normalize_val(ref_val) == normalize_val(cand_val):
-                            sim_scores.append(1.0)
-                        else:
-                            sim_scores.append(0.0)
-
-            if exact_fail:
+        others = [c for c in all_products if c.id != product.id]
+        # Every candidate is checked at once, one spec column at a time
+        store = ProductColumnStore(others)
+        keep = np.ones(len(store), dtype=bool)
+
+        # Check required exact matches
+        for spec in required_match:
+            ref_val = _get_spec(product, spec)
+            if ref_val is not None:
+                keep &= ~store.present(spec) | (
+                    store.normalized_str(spec) == normalize_val(ref_val))
+
+        # Score similarity
+        sim_sum = np.zeros(len(store))
+        sim_count = np.zeros(len(store), dtype=np.intp)
+        for spec, tol in tolerance_map.items():
+            ref_val = _get_spec(product, spec)
+            if ref_val is None:
                 continue
-
-            if sim_scores:
-                similarity = sum(sim_scores) / len(sim_scores)
-                if similarity >= 0.5:
-                    equivalents.append((candidate, similarity))
-
-        equivalents.sort(key=lambda x: x[1], reverse=True)
-        return equivalents
+            present = store.present(spec)
+            try:
+                r = float(ref_val)
+            except (ValueError, TypeError):
+                r = None
+            if r is not None:
+                cand, numeric = store.as_float(spec)
+                delta = np.abs(r - cand) / max(abs(r), 1e-9)
+                keep &= ~(numeric & (delta > tol * 2))
+                # fmax maps NaN deltas to 0.0, like max(0.0, nan)
+                sim = np.fmax(0.0, 1.0 - delta / tol)
+            else:
+                numeric = np.zeros(len(store), dtype=bool)
+                sim = np.zeros(len(store))
+            # Values that are not numbers only score on an exact match
+            text_equal = ~numeric & present & (
+                store.normalized_str(spec) == normalize_val(ref_val))
+            sim[text_equal] = 1.0
+            sim[~present] = 0.0
+            sim_sum += sim
+            sim_count += present
+
+        keep &= sim_count > 0
+        idx = np.flatnonzero(keep)
+        similarity = sim_sum[idx] / sim_count[idx]
+        close = similarity >= 0.5
+        idx, similarity = idx[close], similarity[close]
+        # Stable on the negated scores: ties keep catalog order, as the
+        # previous list.sort(reverse=True) did
+        order = np.argsort(-similarity, kind='stable')
+        return [
+            (others[i], sim)
+            for i, sim in zip(idx[order].tolist(), similarity[order].tolist())
+        ]
 
     # ----------------------------------------------------------
     # Internal Helpers
@@ -1071,33 +1534,46 @@ class RecommendationEngine:
         # In production, this would be a SQL query with WHERE clauses
         # For now, get all and filter in-memory
         all_products = await self._get_all_products()
-        candidates = []
+        return [all_products[i] for i in self._candidate_rows(request, use_case, all_products)]
 
-        for p in all_products:
+    def _candidate_rows(
+        self,
+        request: RecommendRequest,
+        use_case: Optional[UseCaseProfile],
+        products: list[Product],
+    ) -> list[int]:
+        """Positions in products that pass the candidate pre-filters."""
+        rows = []
+
+        # Request-level filter terms, resolved once rather than per product
+        skip_statuses = () if request.include_discontinued else (
+            ProductStatus.DISCONTINUED, ProductStatus.DEPRECATED)
+        brands = frozenset(request.brand_filter or ())
+        # Family filter from use case: only excluded families outside the
+        # required set are ever dropped
+        excluded_families = frozenset()
+        if use_case and use_case.required_families:
+            excluded_families = use_case.excluded_families - use_case.required_families
+
+        for i, p in enumerate(products):
             # Skip discontinued unless requested
-            if not request.include_discontinued:
-                if hasattr(p, 'status') and p.status in (
-                    ProductStatus.DISCONTINUED, ProductStatus.DEPRECATED
-                ):
-                    continue
+            if p.status in skip_statuses:
+                continue
 
             # Brand filter
-            if request.brand_filter:
+            if brands:
                 brand = _get_spec(p, 'brand_code')
-                if brand and brand not in request.brand_filter:
+                if brand and brand not in brands:
                     continue
 
-            # Family filter from use case
-            if use_case and use_case.required_families:
+            if excluded_families:
                 family = _get_spec(p, 'family_code')
-                if family and family not in use_case.required_families:
-                    # Don't hard-filter on family if not in excluded
-                    if use_case.excluded_families and family in use_case.excluded_families:
-                        continue
+                if family and family in excluded_families:
+                    continue
 
-            candidates.append(p)
+            rows.append(i)
 
-        return candidates
+        return rows
 
     async def _get_all_products(self) -> list[Product]:
         """Get all active products. In production: paginated SQL query."""
@@ -1105,17 +1581,26 @@ class RecommendationEngine:
             return list(self.repo.products.values())
         return []
 
-    async def _get_product_by_id(self, product_id: str) -> Optional[Product]:
-        """Get product by ID string."""
+    async def _get_products_by_id(self, product_ids: list[str]) -> dict[str, Product]:
+        """Get products by ID string or model number, in one repository call."""
+        if hasattr(self.repo, 'get_products'):
+            return await self.repo.get_products(product_ids)
+        found: dict[str, Product] = {}
         if hasattr(self.repo, 'products'):
+            wanted = set(product_ids)
             for p in self.repo.products.values():
-                if str(p.id) == product_id or p.model_number == product_id:
-                    return p
-        return None
+                for key in (str(p.id), p.model_number):
+                    if key in wanted and key not in found:
+                        found[key] = p
+        return found
 
     def _to_recommendation(self, ps: ProductScore) -> ProductRecommendation:
-        """Convert a ProductScore to a ProductRecommendation response."""
-        return ProductRecommendation(
+        """
+        Convert a ProductScore to a ProductRecommendation response.
+        Scoring produces already-typed values, so the response records are
+        built with model_construct (here and in score_product).
+        """
+        return ProductRecommendation.model_construct(
             product_id=str(ps.product.id),
             model_number=ps.product.model_number,
             brand='',  # Resolved in production from brand_id
@@ -1137,14 +1622,20 @@ class RecommendationEngine:
 def _get_spec(product: Product, spec_name: str) -> Any:
     """Get a spec value from product fixed columns or dynamic specs."""
     # Check fixed columns first
-    if hasattr(product, spec_name):
-        val = getattr(product, spec_name, None)
+    if spec_name in _PRODUCT_FIXED_COLS:
+        val = getattr(product, spec_name)
         if val is not None:
             return val
     # Check dynamic specs
     return product.specs.get(spec_name)
 
 
+@lru_cache(maxsize=1024)
+def _display_name(spec_name: str) -> str:
+    """Human-readable spec label, e.g. 'uniformity_c' -> 'Uniformity C'."""
+    return spec_name.replace('_', ' ').title()
+
+
 def _delta_pct(a: float, b: float) -> Optional[float]:
     """Calculate percentage delta between two values."""
     if a == 0:
@@ -1156,7 +1647,13 @@ def normalize_val(val: Any) -> str:
     """Normalize a value for comparison."""
     if val is None:
         return ''
-    return str(val).strip().lower().replace(' ', '_').replace('-', '_')
+    return _normalize_text(str(val))
+
+
+@lru_cache(maxsize=4096)
+def _normalize_text(text: str) -> str:
+    # Spec columns repeat a small set of values across the catalog
+    return text.strip().lower().replace(' ', '_').replace('-', '_')
 
 
 def _now() -> str:
@@ -1167,6 +1664,88 @@ def _now() -> str:
 # Example / Integration Test
 # ============================================================
 
+# Example catalog: (brand code, family code, Product fields). _example
+# copies the list/dict fields per build so runs never share them.
+_SAMPLE_PRODUCTS: tuple[tuple[str, str, dict[str, Any]], ...] = (
+    ('ABS', 'premier_lab_ref', dict(
+        model_number='ABT-HC-26S',
+        product_line='Premier',
+        storage_capacity_cuft=26.0,
+        temp_range_min_c=1.0, temp_range_max_c=10.0,
+        door_count=1, door_type='solid',
+        shelf_count=4, refrigerant='R290',
+        voltage_v=115, amperage=3.0,
+        product_weight_lbs=235.0,
+        ext_width_in=28.375, ext_depth_in=36.75, ext_height_in=81.75,
+        certifications=['ETL', 'C-ETL', 'UL471', 'Energy_Star'],
+        specs={
+            'uniformity_c': 1.4, 'stability_c': 1.3,
+            'energy_kwh_day': 1.15, 'noise_dba': 41,
+            'product_type': 'refrigerator',
+            'controller_type': 'microprocessor',
+            'defrost_type': 'cycle',
+        },
+    )),
+    ('ABS', 'premier_lab_ref', dict(
+        model_number='ABT-HC-49S',
+        product_line='Premier',
+        storage_capacity_cuft=49.0,
+        temp_range_min_c=1.0, temp_range_max_c=10.0,
+        door_count=2, door_type='solid',
+        shelf_count=8, refrigerant='R290',
+        voltage_v=115, amperage=4.5,
+        product_weight_lbs=396.0,
+        ext_width_in=56.0, ext_depth_in=36.75, ext_height_in=81.75,
+        certifications=['ETL', 'C-ETL', 'UL471', 'Energy_Star'],
+        specs={
+            'uniformity_c': 1.6, 'stability_c': 1.5,
+            'energy_kwh_day': 1.50, 'noise_dba': 44,
+            'product_type': 'refrigerator',
+            'controller_type': 'microprocessor',
+            'defrost_type': 'cycle',
+        },
+    )),
+    ('ABS', 'pharmacy_nsf_ref', dict(
+        model_number='PH-ABT-NSF-UCFS-0504',
+        product_line='Pharmacy NSF',
+        storage_capacity_cuft=5.2,
+        temp_range_min_c=2.0, temp_range_max_c=8.0,
+        door_count=1, door_type='solid',
+        shelf_count=2, refrigerant='R600a',
+        voltage_v=115, amperage=1.5,
+        product_weight_lbs=90.0,
+        ext_width_in=23.75, ext_depth_in=24.0, ext_height_in=34.0,
+        certifications=['ETL', 'C-ETL', 'NSF_ANSI_456', 'Energy_Star'],
+        specs={
+            'uniformity_c': 0.8, 'stability_c': 0.7,
+            'energy_kwh_day': 0.65, 'noise_dba': 38,
+            'product_type': 'refrigerator',
+            'nsf_ansi_456_certified': True,
+            'controller_type': 'touchscreen_microprocessor',
+        },
+    )),
+    ('ABS', 'premier_lab_ref', dict(
+        model_number='ABT-HC-26G',
+        product_line='Premier',
+        storage_capacity_cuft=26.0,
+        temp_range_min_c=1.0, temp_range_max_c=10.0,
+        door_count=1, door_type='glass',
+        shelf_count=4, refrigerant='R290',
+        voltage_v=115, amperage=3.1,
+        product_weight_lbs=240.0,
+        ext_width_in=28.375, ext_depth_in=36.75, ext_height_in=81.75,
+        certifications=['ETL', 'C-ETL', 'UL471', 'Energy_Star'],
+        specs={
+            'uniformity_c': 1.5, 'stability_c': 1.4,
+            'energy_kwh_day': 1.25, 'noise_dba': 42,
+            'product_type': 'refrigerator',
+            'controller_type': 'microprocessor',
+            'defrost_type': 'cycle',
+        },
+    )),
+)
+
+
 async def _example():
     """Demonstrate the recommendation engine."""
     from ingestion_orchestrator import InMemoryRepository
@@ -1190,197 +1769,133 @@ async def _example():
     # Create sample products
     products = [
         Product(
-            model_number='ABT-HC-26S',
-            brand_id=repo.brands['ABS'].id,
-            family_id=repo.families['premier_lab_ref'].id,
-            product_line='Premier',
-            storage_capacity_cuft=26.0,
-            temp_range_min_c=1.0, temp_range_max_c=10.0,
-            door_count=1, door_type='solid',
-            shelf_count=4, refrigerant='R290',
-            voltage_v=115, amperage=3.0,
-            product_weight_lbs=235.0,
-            ext_width_in=28.375, ext_depth_in=36.75, ext_height_in=81.75,
-            certifications=['ETL', 'C-ETL', 'UL471', 'Energy_Star'],
-            specs={
-                'uniformity_c': 1.4, 'stability_c': 1.3,
-                'energy_kwh_day': 1.15, 'noise_dba': 41,
-                'product_type': 'refrigerator',
-                'controller_type': 'microprocessor',
-                'defrost_type': 'cycle',
-            },
-        ),
-        Product(
-            model_number='ABT-HC-49S',
-            brand_id=repo.brands['ABS'].id,
-            family_id=repo.families['premier_lab_ref'].id,
-            product_line='Premier',
-            storage_capacity_cuft=49.0,
-            temp_range_min_c=1.0, temp_range_max_c=10.0,
-            door_count=2, door_type='solid',
-            shelf_count=8, refrigerant='R290',
-            voltage_v=115, amperage=4.5,
-            product_weight_lbs=396.0,
-            ext_width_in=56.0, ext_depth_in=36.75, ext_height_in=81.75,
-            certifications=['ETL', 'C-ETL', 'UL471', 'Energy_Star'],
-            specs={
-                'uniformity_c': 1.6, 'stability_c': 1.5,
-                'energy_kwh_day': 1.50, 'noise_dba': 44,
-                'product_type': 'refrigerator',
-                'controller_type': 'microprocessor',
-                'defrost_type': 'cycle',
-            },
-        ),
-        Product(
-            model_number='PH-ABT-NSF-UCFS-0504',
-            brand_id=repo.brands['ABS'].id,
-            family_id=repo.families['pharmacy_nsf_ref'].id,
-            product_line='Pharmacy NSF',
-            storage_capacity_cuft=5.2,
-            temp_range_min_c=2.0, temp_range_max_c=8.0,
-            door_count=1, door_type='solid',
-            shelf_count=2, refrigerant='R600a',
-            voltage_v=115, amperage=1.5,
-            product_weight_lbs=90.0,
-            ext_width_in=23.75, ext_depth_in=24.0, ext_height_in=34.0,
-            certifications=['ETL', 'C-ETL', 'NSF_ANSI_456', 'Energy_Star'],
-            specs={
-                'uniformity_c': 0.8, 'stability_c': 0.7,
-                'energy_kwh_day': 0.65, 'noise_dba': 38,
-                'product_type': 'refrigerator',
-                'nsf_ansi_456_certified': True,
-                'controller_type': 'touchscreen_microprocessor',
-            },
-        ),
-        Product(
-            model_number='ABT-HC-26G',
-            brand_id=repo.brands['ABS'].id,
-            family_id=repo.families['premier_lab_ref'].id,
-            product_line='Premier',
-            storage_capacity_cuft=26.0,
-            temp_range_min_c=1.0, temp_range_max_c=10.0,
-            door_count=1, door_type='glass',
-            shelf_count=4, refrigerant='R290',
-            voltage_v=115, amperage=3.1,
-            product_weight_lbs=240.0,
-            ext_width_in=28.375, ext_depth_in=36.75, ext_height_in=81.75,
-            certifications=['ETL', 'C-ETL', 'UL471', 'Energy_Star'],
-            specs={
-                'uniformity_c': 1.5, 'stability_c': 1.4,
-                'energy_kwh_day': 1.25, 'noise_dba': 42,
-                'product_type': 'refrigerator',
-                'controller_type': 'microprocessor',
-                'defrost_type': 'cycle',
-            },
-        ),
+            brand_id=repo.brands[brand].id,
+            family_id=repo.families[family].id,
+            **{**fields,
+               'certifications': list(fields['certifications']),
+               'specs': dict(fields['specs'])},
+        )
+        for brand, family, fields in _SAMPLE_PRODUCTS
     ]
 
-    for p in products:
-        repo.products[p.id] = p
-        repo._model_index[p.model_number] = p.id
+    repo.products.update({p.id: p for p in products})
+    repo._model_index.update({p.model_number: p.id for p in products})
 
     engine = RecommendationEngine(repo)
+    ref = products[0]  # ABT-HC-26S
 
+    # The tests share the read-only repo and are independent, so they run
+    # concurrently; results are printed in test order below
+    (resp, resp2, resp5), comp, equivs = await asyncio.gather(
+        engine.recommend_many([
+            RecommendRequest(
+                use_case='vaccine_storage',
+                structured_specs={'storage_capacity_cuft': 5},
+            ),
+            RecommendRequest(
+                free_text='I need a lab refrigerator about 26 cubic feet with a solid door',
+                structured_specs={
+                    'storage_capacity_cuft': 26,
+                    'door_type': 'solid',
+                },
+            ),
+            RecommendRequest(
+                use_case='undercounter',
+                structured_specs={'max_height_in': 36},
+            ),
+        ]),
+        engine.compare(CompareRequest(
+            product_ids=['ABT-HC-26S', 'ABT-HC-26G'],
+            highlight_differences=True,
+        )),
+        engine.find_equivalents(ref),
+    )
+
+    # Each test's report is written in one call rather than line by line
     # --- Test 1: Vaccine storage recommendation ---
-    print("=" * 60)
-    print("TEST 1: Vaccine Storage Recommendation")
-    print("=" * 60)
-
-    resp = await engine.recommend(RecommendRequest(
-        use_case='vaccine_storage',
-        structured_specs={'storage_capacity_cuft': 5},
-    ))
-
-    print(f"Query ID: {resp.query_id}")
-    print(f"Response time: {resp.response_time_ms}ms")
-    print(f"\nDecision trace:")
+    out: list[str] = []
+    out.append("=" * 60)
+    out.append("TEST 1: Vaccine Storage Recommendation")
+    out.append("=" * 60)
+
+    out.append(f"Query ID: {resp.query_id}")
+    out.append(f"Response time: {resp.response_time_ms}ms")
+    out.append(f"\nDecision trace:")
     for t in resp.decision_trace:
-        print(f"  [{t.step}] {t.detail}")
+        out.append(f"  [{t.step}] {t.detail}")
 
-    print(f"\nRecommendations ({len(resp.products)}):")
+    out.append(f"\nRecommendations ({len(resp.products)}):")
     for r in resp.products:
-        print(f"  {r.model_number}: score={r.score:.2%}, pass={r.hard_pass}")
+        out.append(f"  {r.model_number}: score={r.score:.2%}, pass={r.hard_pass}")
         for m in r.match_breakdown:
-            print(f"    {m.display_name}: {m.value_product} (score={m.score:.2f})")
+            out.append(f"    {m.display_name}: {m.value_product} (score={m.score:.2f})")
         for c in r.compliance:
-            print(f"    [{c.status}] {c.rule}: {c.details}")
+            out.append(f"    [{c.status}] {c.rule}: {c.details}")
 
     if resp.alternates:
-        print(f"\nAlternates ({len(resp.alternates)}):")
+        out.append(f"\nAlternates ({len(resp.alternates)}):")
         for r in resp.alternates:
-            print(f"  {r.model_number}: score={r.score:.2%}, notes={r.notes}")
+            out.append(f"  {r.model_number}: score={r.score:.2%}, notes={r.notes}")
 
     if resp.clarifications_needed:
-        print(f"\nClarifications needed:")
+        out.append(f"\nClarifications needed:")
         for c in resp.clarifications_needed:
-            print(f"  {c['message']}")
+            out.append(f"  {c['message']}")
+    sys.stdout.write("\n".join(out) + "\n")
 
     # --- Test 2: Lab refrigerator with capacity requirement ---
-    print("\n" + "=" * 60)
-    print("TEST 2: Lab Refrigerator ~26 cu.ft.")
-    print("=" * 60)
-
-    resp2 = await engine.recommend(RecommendRequest(
-        free_text='I need a lab refrigerator about 26 cubic feet with a solid door',
-        structured_specs={
-            'storage_capacity_cuft': 26,
-            'door_type': 'solid',
-        },
-    ))
+    out = []
+    out.append("\n" + "=" * 60)
+    out.append("TEST 2: Lab Refrigerator ~26 cu.ft.")
+    out.append("=" * 60)
 
-    print(f"\nRecommendations ({len(resp2.products)}):")
+    out.append(f"\nRecommendations ({len(resp2.products)}):")
     for r in resp2.products:
-        print(f"  {r.model_number}: score={r.score:.2%}")
+        out.append(f"  {r.model_number}: score={r.score:.2%}")
         for m in r.match_breakdown:
-            print(f"    {m.display_name}: req={m.value_required}, "
-                  f"got={m.value_product}, score={m.score:.2f}")
+            out.append(f"    {m.display_name}: req={m.value_required}, "
+                       f"got={m.value_product}, score={m.score:.2f}")
+    sys.stdout.write("\n".join(out) + "\n")
 
     # --- Test 3: Product comparison ---
-    print("\n" + "=" * 60)
-    print("TEST 3: Compare ABT-HC-26S vs ABT-HC-26G")
-    print("=" * 60)
+    out = []
+    out.append("\n" + "=" * 60)
+    out.append("TEST 3: Compare ABT-HC-26S vs ABT-HC-26G")
+    out.append("=" * 60)
 
-    comp = await engine.compare(CompareRequest(
-        product_ids=['ABT-HC-26S', 'ABT-HC-26G'],
-        highlight_differences=True,
-    ))
-
-    print(f"Summary: {comp.summary}")
-    print(f"\nDifferences:")
+    out.append(f"Summary: {comp.summary}")
+    out.append(f"\nDifferences:")
     for row in comp.specs_compared:
-        print(f"  {row['display_name']}: {row['values']}")
+        out.append(f"  {row['display_name']}: {row['values']}")
+    sys.stdout.write("\n".join(out) + "\n")
 
     # --- Test 4: Equivalence detection ---
-    print("\n" + "=" * 60)
-    print("TEST 4: Find equivalents for ABT-HC-26S")
-    print("=" * 60)
+    out = []
+    out.append("\n" + "=" * 60)
+    out.append("TEST 4: Find equivalents for ABT-HC-26S")
+    out.append("=" * 60)
 
-    ref = products[0]  # ABT-HC-26S
-    equivs = await engine.find_equivalents(ref)
-    print(f"Equivalents for {ref.model_number}:")
+    out.append(f"Equivalents for {ref.model_number}:")
     for eq, sim in equivs:
-        print(f"  {eq.model_number}: similarity={sim:.2%}")
+        out.append(f"  {eq.model_number}: similarity={sim:.2%}")
+    sys.stdout.write("\n".join(out) + "\n")
 
     # --- Test 5: Undercounter constraint ---
-    print("\n" + "=" * 60)
-    print("TEST 5: Undercounter (max height 36\")")
-    print("=" * 60)
-
-    resp5 = await engine.recommend(RecommendRequest(
-        use_case='undercounter',
-        structured_specs={'max_height_in': 36},
-    ))
+    out = []
+    out.append("\n" + "=" * 60)
+    out.append("TEST 5: Undercounter (max height 36\")")
+    out.append("=" * 60)
 
-    print(f"Recommendations ({len(resp5.products)}):")
+    out.append(f"Recommendations ({len(resp5.products)}):")
     for r in resp5.products:
-        print(f"  {r.model_number}: score={r.score:.2%}")
+        out.append(f"  {r.model_number}: score={r.score:.2%}")
 
     if resp5.alternates:
-        print(f"Alternates ({len(resp5.alternates)}):")
+        out.append(f"Alternates ({len(resp5.alternates)}):")
         for r in resp5.alternates:
-            print(f"  {r.model_number}: {r.notes}")
+            out.append(f"  {r.model_number}: {r.notes}")
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 if __name__ == '__main__':
-    import asyncio
     asyncio.run(_example())
@@ -0,0 +1,26 @@
+"""
+Test setup: the service modules live at the repo root under hyphenated
+filenames but import each other by their underscore names (as they are
+laid out in the container), so register them under those names here.
+"""
+import importlib.util
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Dependency order: each module may import the ones before it
+_MODULES = [
+    ('extraction_pipeline', 'extraction-pipeline.py'),
+    ('ingestion_orchestrator', 'ingestion-orchestrator.py'),
+    ('rag_retrieval', 'rag-retrieval.py'),
+    ('recommendation_engine', 'recommendation-engine.py'),
+]
+
+for name, filename in _MODULES:
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, ROOT / filename)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
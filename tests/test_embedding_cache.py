@@ -0,0 +1,75 @@
+"""EmbeddingProvider's SQLite cache returns exactly what embedding would."""
+import asyncio
+
+import numpy as np
+import pytest
+
+from rag_retrieval import EmbeddingProvider
+
+TEXTS = [
+    'ABT-HC-26S lab refrigerator, 26 cu ft',
+    'Cabinet air uniformity ±1.4°C',
+    'Cabinet air uniformity ±1.4°C',  # repeated within the batch
+    '',
+    'R290 hydrocarbon refrigerant',
+]
+
+
+@pytest.mark.parametrize('dtype', ['float32', 'float16'])
+def test_disk_cache_matches_fresh_embeddings(tmp_path, dtype):
+    path = str(tmp_path / 'embeddings.sqlite')
+
+    async def run():
+        plain = EmbeddingProvider(dim=48, dtype=dtype, cache_size=0)
+        want = await plain.embed_batch(TEXTS)
+
+        # Never closed: each batch's rows must already be committed
+        writer = EmbeddingProvider(dim=48, dtype=dtype, cache_size=0, cache_path=path)
+        np.testing.assert_array_equal(await writer.embed_batch(TEXTS), want)
+
+        # A new process reads every vector back from disk, embedding nothing
+        reader = EmbeddingProvider(dim=48, dtype=dtype, cache_size=0, cache_path=path)
+
+        async def no_embedding(prefix, texts):
+            raise AssertionError(f'embedded {texts!r} despite the disk cache')
+
+        reader._embed_sub_batch = no_embedding
+        got = await reader.embed_batch(TEXTS)
+        assert got.dtype == want.dtype
+        np.testing.assert_array_equal(got, want)
+        reader.close()
+
+    asyncio.run(run())
+
+
+def test_disk_cache_is_keyed_by_model_and_skips_queries(tmp_path):
+    path = str(tmp_path / 'embeddings.sqlite')
+
+    async def run():
+        writer = EmbeddingProvider(model='model-a', dim=32, cache_path=path)
+        await writer.embed_batch(TEXTS)
+        await writer.embed_query('how cold does it get')
+        writer.close()
+
+        other = EmbeddingProvider(model='model-b', dim=32, cache_size=0, cache_path=path)
+        calls = []
+        embed = other._embed_sub_batch
+
+        async def counting(prefix, texts):
+            calls.append((prefix, len(texts)))
+            return await embed(prefix, texts)
+
+        other._embed_sub_batch = counting
+        want = await EmbeddingProvider(model='model-b', dim=32).embed_batch(TEXTS)
+        np.testing.assert_array_equal(await other.embed_batch(TEXTS), want)
+        await other.embed_query('how cold does it get')
+        other.close()
+        # Nothing from model-a was reused; distinct texts embedded once each
+        assert calls == [(b'passage: ', len(set(TEXTS))), (b'query: ', 1)]
+
+        reader = EmbeddingProvider(model='model-a', dim=32, cache_size=0, cache_path=path)
+        rows = reader._disk.execute('SELECT COUNT(*) FROM embeddings').fetchone()[0]
+        assert rows == 2 * len(set(TEXTS))  # passages of both models, no queries
+        reader.close()
+
+    asyncio.run(run())
@@ -0,0 +1,82 @@
+"""Concurrent batch ingestion against the same batch ingested one file at a time."""
+import asyncio
+import copy
+
+import pytest
+
+from ingestion_orchestrator import IngestionConfig, IngestionOrchestrator, InMemoryRepository
+
+SPEC_LINES = [
+    'Rated Amperage    3',
+    'Product Weight (lbs)    235',
+    'Storage capacity (cu. ft)    26',
+    'Refrigerant    Hydrocarbon, natural refrigerant (R290)',
+    'Shelves    Four adjustable shelves',
+    'Defrost    Cycle',
+]
+
+
+def _sheet(model: str, line: str, i: int) -> bytes:
+    return (
+        f'Product Data Sheet\n{model} Premier Laboratory Refrigerator\n\n'
+        f'{line}\n\nSheet {i}\n'
+    ).encode()
+
+
+class DetachedRepository(InMemoryRepository):
+    """
+    Hands out copies and yields on every read and write, as a database
+    would, so interleaved read-modify-write cycles can lose updates.
+    """
+
+    async def get_product_by_model(self, model_number):
+        await asyncio.sleep(0)
+        return copy.deepcopy(await super().get_product_by_model(model_number))
+
+    async def create_spec_conflicts(self, conflicts):
+        await asyncio.sleep(0)
+        return await super().create_spec_conflicts(conflicts)
+
+    async def update_product(self, product):
+        await asyncio.sleep(0)
+        return await super().update_product(copy.deepcopy(product))
+
+
+async def _ingest(files, max_concurrency: int):
+    repo = DetachedRepository()
+    orchestrator = IngestionOrchestrator(
+        repo, IngestionConfig(max_concurrency=max_concurrency))
+    _, stats = await orchestrator.ingest_batch(files)
+    products = {
+        p.model_number: (p.version, dict(p.specs), p.amperage,
+                         p.product_weight_lbs, p.storage_capacity_cuft)
+        for p in repo.products.values()
+    }
+    return products, stats
+
+
+@pytest.mark.parametrize('models', [['ABT-HC-26S'], ['ABT-HC-26S', 'LHT-5-FMP']])
+def test_concurrent_batch_matches_sequential(models):
+    files = [
+        {'filename': f'{model}_{i}.pdf', 'content': _sheet(model, line, i)}
+        for model in models for i, line in enumerate(SPEC_LINES)
+    ]
+    concurrent, c_stats = asyncio.run(_ingest(files, max_concurrency=8))
+    sequential, s_stats = asyncio.run(_ingest(files, max_concurrency=1))
+
+    assert concurrent == sequential
+    assert sorted(concurrent) == sorted(models)
+    for stats in (c_stats, s_stats):
+        assert stats.processed_files == len(files)
+        assert stats.new_products == len(models)
+        assert stats.updated_products == len(files) - len(models)
+
+
+def test_product_locks_are_released():
+    files = [
+        {'filename': f'{i}.pdf', 'content': _sheet(model, SPEC_LINES[0], i)}
+        for i, model in enumerate(['ABT-HC-26S', 'LHT-5-FMP', 'ABT-HC-26S'])
+    ]
+    orchestrator = IngestionOrchestrator(DetachedRepository())
+    asyncio.run(orchestrator.ingest_batch(files))
+    assert len(orchestrator._product_locks) == 0
@@ -0,0 +1,99 @@
+"""KeywordSearcher's inverted index against a brute-force BM25 scan."""
+import math
+import random
+from collections import Counter
+from uuid import uuid4
+
+import pytest
+
+from models import DocumentChunk
+from rag_retrieval import KeywordSearcher
+
+WORDS = [
+    'capacity', 'cubic', 'feet', 'uniformity', 'stability', 'freezer',
+    'refrigerator', 'vaccine', 'alarm', 'defrost', 'door', 'glass', 'solid',
+    'energy', 'kwh', 'r290', 'shelves', 'the', 'of', 'a',
+]
+
+
+def _chunk(content: str, **kwargs) -> DocumentChunk:
+    return DocumentChunk(document_id=uuid4(), chunk_index=0, content=content, **kwargs)
+
+
+def _brute_force(chunks, query, k1=1.2, b=0.75):
+    """Score every chunk from scratch, as a scan without the index would."""
+    terms = KeywordSearcher._tokenize(query)
+    docs = {c.id: KeywordSearcher._tokenize(c.content) for c in chunks}
+    n_docs = len(docs)
+    avg_len = sum(map(len, docs.values())) / n_docs or 1.0
+    df = Counter(t for toks in docs.values() for t in set(toks))
+    scores = {}
+    for c in chunks:
+        tfs = Counter(docs[c.id])
+        score, matched = 0.0, False
+        for term in terms:
+            tf = tfs.get(term)
+            if not tf:
+                continue
+            matched = True
+            idf = math.log(1.0 + (n_docs - df[term] + 0.5) / (df[term] + 0.5))
+            dl = len(docs[c.id])
+            score += idf * (tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl / avg_len)))
+        if not matched:
+            continue
+        spec_names = {s.lower().replace('_', ' ') for s in c.spec_names}
+        section = c.section_title.lower() if c.section_title else None
+        for term in terms:
+            if term in spec_names:
+                score += 2.0
+            if section and term in section:
+                score += 1.5
+        for pid in c.product_ids:
+            if str(pid).lower() in query.lower():
+                score += 3.0
+        scores[c.id] = score
+    return scores
+
+
+def _random_text(rng: random.Random) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 30)))
+
+
+def test_search_matches_brute_force_bm25():
+    rng = random.Random(7)
+    chunks = [
+        _chunk(_random_text(rng),
+               spec_names=rng.sample(['uniformity_c', 'energy_kwh_day', 'door_type'], 1),
+               section_title=rng.choice([None, 'Performance', 'Energy Data']))
+        for _ in range(60)
+    ]
+    searcher = KeywordSearcher()
+    for c in chunks:
+        searcher.index_chunk(c)
+
+    for _ in range(50):
+        query = _random_text(rng)
+        got = {c.id: s for c, s in searcher.search(query, top_k=len(chunks))}
+        want = _brute_force(chunks, query)
+        assert got.keys() == want.keys()
+        for cid, score in want.items():
+            assert got[cid] == pytest.approx(score)
+
+
+def test_reindex_after_in_place_edit_matches_fresh_index():
+    edited = _chunk('lab refrigerator capacity cubic feet')
+    other = _chunk('freezer alarm defrost')
+    searcher = KeywordSearcher()
+    searcher.index_chunk(edited)
+    searcher.index_chunk(other)
+
+    edited.content = 'vaccine freezer uniformity'
+    searcher.index_chunk(edited)
+
+    fresh = KeywordSearcher()
+    fresh.index_chunk(other)
+    fresh.index_chunk(edited)
+    for query in ('freezer vaccine', 'capacity cubic feet', 'alarm'):
+        assert ([(c.id, s) for c, s in searcher.search(query)]
+                == [(c.id, s) for c, s in fresh.search(query)])
+    assert 'capacity' not in searcher._postings
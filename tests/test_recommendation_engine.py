@@ -0,0 +1,128 @@
+"""Columnar candidate filtering and batched recommendation against the per-product paths."""
+import asyncio
+import random
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from ingestion_orchestrator import InMemoryRepository
+from models import Product, RecommendRequest
+from recommendation_engine import (
+    USE_CASE_PROFILES, ProductColumnStore, ProductScore, RecommendationEngine,
+    _SAMPLE_PRODUCTS, _check_hard_constraints, _hard_filter_mask,
+    _request_terms,
+)
+
+CERTS = ['ETL', 'C-ETL', 'UL471', 'Energy_Star', 'NSF_ANSI_456', 'FDA', 'NFPA_45']
+
+
+def _maybe(rng: random.Random, value, p: float = 0.8):
+    return value if rng.random() < p else None
+
+
+def _random_product(rng: random.Random, i: int) -> Product:
+    tmin = rng.choice([-86.0, -30.0, -20.0, 1.0, 2.0, 4.0])
+    return Product(
+        model_number=f'TEST-{i}', brand_id=uuid4(), family_id=uuid4(),
+        storage_capacity_cuft=_maybe(rng, rng.choice([1.5, 5.2, 12.0, 26.0, 49.0])),
+        temp_range_min_c=_maybe(rng, tmin),
+        temp_range_max_c=_maybe(rng, tmin + rng.choice([6.0, 9.0, 20.0])),
+        door_type=_maybe(rng, rng.choice(['solid', 'glass'])),
+        voltage_v=_maybe(rng, rng.choice([0, 115, 220])),
+        amperage=_maybe(rng, rng.uniform(1, 6)),
+        ext_width_in=_maybe(rng, rng.choice([0.0, 23.75, 28.375, 56.0])),
+        ext_depth_in=_maybe(rng, rng.choice([24.0, 36.75])),
+        ext_height_in=_maybe(rng, rng.choice([34.0, 81.75])),
+        certifications=rng.sample(CERTS, rng.randint(0, 4)),
+        specs={
+            k: v for k, v in (
+                ('product_type', _maybe(rng, rng.choice(['refrigerator', 'freezer', '']))),
+                ('uniformity_c', _maybe(rng, rng.uniform(0.5, 3))),
+                ('stability_c', _maybe(rng, rng.uniform(0.5, 3))),
+                ('energy_kwh_day', _maybe(rng, rng.uniform(0.5, 3))),
+                ('noise_dba', _maybe(rng, rng.randint(35, 55))),
+            ) if v is not None
+        },
+    )
+
+
+def _random_request(rng: random.Random) -> RecommendRequest:
+    structured = {}
+    for key, values in (
+        ('voltage_v', [115, 220]),
+        ('max_width_in', [24, 30, 60]),
+        ('max_height_in', [40, 84]),
+        ('storage_capacity_cuft', [5, 20, 40]),
+    ):
+        if rng.random() < 0.3:
+            structured[key] = rng.choice(values)
+    constraints = {}
+    if rng.random() < 0.3:
+        constraints['product_type'] = rng.choice(['refrigerator', 'freezer'])
+    if rng.random() < 0.3:
+        constraints['door_type'] = rng.choice(['solid', 'glass'])
+    return RecommendRequest(
+        use_case=rng.choice([None, *USE_CASE_PROFILES]),
+        structured_specs=structured,
+        constraints=constraints,
+        top_n=rng.choice([1, 3, 5]),
+    )
+
+
+def test_hard_filter_mask_matches_scalar_checks():
+    rng = random.Random(21)
+    products = [_random_product(rng, i) for i in range(300)]
+    catalog = ProductColumnStore(products)
+    for _ in range(80):
+        request = _random_request(rng)
+        terms = _request_terms(request, USE_CASE_PROFILES.get(request.use_case))
+
+        want = np.empty(len(products), dtype=bool)
+        for i, p in enumerate(products):
+            ps = ProductScore(product=p)
+            _check_hard_constraints(
+                ps, request, terms.hard_constraints, terms.required_certs,
+                terms.dim_maxes, terms.req_tmin, terms.req_tmax)
+            want[i] = ps.hard_pass
+
+        np.testing.assert_array_equal(_hard_filter_mask(catalog, request, terms), want)
+
+        # A take() view of the shared catalog filters its rows identically
+        idx = np.array(sorted(rng.sample(range(len(products)), 50)))
+        np.testing.assert_array_equal(
+            _hard_filter_mask(catalog.take(idx), request, terms), want[idx])
+
+
+def _response_fields(response) -> dict:
+    data = response.model_dump(exclude={'query_id', 'response_time_ms'})
+    for step in data['decision_trace']:
+        step.pop('timestamp')
+    return data
+
+
+@pytest.mark.parametrize('n_random', [0, 200])
+def test_recommend_many_matches_recommend(n_random):
+    rng = random.Random(22)
+    repo = InMemoryRepository()
+    products = [
+        Product(brand_id=uuid4(), family_id=uuid4(),
+                **{**fields, 'certifications': list(fields['certifications']),
+                   'specs': dict(fields['specs'])})
+        for _, _, fields in _SAMPLE_PRODUCTS
+    ] + [_random_product(rng, i) for i in range(n_random)]
+    repo.products.update({p.id: p for p in products})
+    repo._model_index.update({p.model_number: p.id for p in products})
+
+    engine = RecommendationEngine(repo)
+    requests = [_random_request(rng) for _ in range(30)]
+    requests.append(RecommendRequest(free_text='vaccine storage for a pharmacy'))
+
+    async def run():
+        return (
+            await engine.recommend_many(requests),
+            [await engine.recommend(r) for r in requests],
+        )
+
+    batched, single = asyncio.run(run())
+    assert [_response_fields(r) for r in batched] == [_response_fields(r) for r in single]
@@ -0,0 +1,104 @@
+"""SemanticCache against a brute-force entry list, and retrieval with it on vs off."""
+import asyncio
+import random
+from uuid import uuid4
+
+import numpy as np
+
+from ingestion_orchestrator import InMemoryRepository
+from models import DocumentChunk
+from rag_retrieval import (
+    EmbeddingProvider, InMemoryVectorStore, KeywordSearcher, RAGConfig,
+    RAGPipeline, SemanticCache,
+)
+
+DIM = 16
+
+
+def _unit(v: np.ndarray) -> np.ndarray:
+    return (v / np.linalg.norm(v)).astype(np.float32)
+
+
+def test_lookup_matches_brute_force():
+    rng = np.random.default_rng(3)
+    cache = SemanticCache(DIM, max_size=512, ttl_s=3600.0, threshold=0.9)
+    entries: list[list] = []  # [vector, scope, value]
+
+    def best(vec, scope):
+        scored = [(float(e[0] @ vec), i) for i, e in enumerate(entries) if e[1] == scope]
+        return max(scored, default=(0.0, None))
+
+    bases = [_unit(rng.normal(size=DIM)) for _ in range(8)]
+    hits = 0
+    for step in range(400):
+        # Queries cluster around a few bases, so near-duplicates do occur
+        noise = rng.normal(scale=rng.uniform(0.02, 0.15), size=DIM)
+        vec = _unit(bases[rng.integers(len(bases))] + noise)
+        scope = ('spec_lookup', ('ABT-HC-26S',)) if rng.random() < 0.5 else ('compare', ())
+        sim, i = best(vec, scope)
+        want = entries[i][2] if i is not None and sim >= cache.threshold else None
+        assert cache.get(vec, scope) == want
+        hits += want is not None
+
+        if want is None:
+            cache.put(vec, scope, step)
+            entries.append([vec, scope, step])
+    assert 50 < hits < 350
+
+
+def test_expired_and_evicted_entries_miss():
+    cache = SemanticCache(DIM, max_size=2, ttl_s=3600.0, threshold=0.99)
+    a, b, c = (_unit(np.eye(DIM)[i] + 0.01) for i in range(3))
+    cache.put(a, 'scope', 'a')
+    cache.put(b, 'scope', 'b')
+    assert cache.get(a, 'scope') == 'a'  # b is now least recently used
+    cache.put(c, 'scope', 'c')
+    assert cache.get(b, 'scope') is None
+    assert cache.get(a, 'scope') == 'a'
+    assert cache.get(c, 'other scope') is None
+
+    cache.ttl_s = -1.0
+    cache.put(b, 'scope', 'b')
+    assert cache.get(b, 'scope') is None
+
+
+def _pipeline(config: RAGConfig) -> RAGPipeline:
+    return RAGPipeline(
+        InMemoryVectorStore(), KeywordSearcher(),
+        EmbeddingProvider(dim=64), InMemoryRepository(), config=config)
+
+
+def test_retrieve_with_cache_matches_uncached():
+    rng = random.Random(5)
+    words = ['capacity', 'uniformity', 'freezer', 'vaccine', 'alarm',
+             'defrost', 'door', 'energy', 'shelves', 'refrigerant']
+    chunks = [
+        DocumentChunk(
+            document_id=uuid4(), chunk_index=i,
+            content=' '.join(rng.choice(words) for _ in range(20)),
+            chunk_type=rng.choice(['spec_block', 'description', 'text']),
+            metadata={'brand': 'ABS'},
+        )
+        for i in range(40)
+    ]
+    queries = ['freezer capacity', 'what is the uniformity', 'vaccine alarm',
+               'freezer capacity', 'what is the uniformity', 'defrost door energy',
+               '26 cu ft lab freezer', '49 cu ft lab freezer', '1.5 cu ft lab freezer',
+               '26 cu ft lab freezer']
+
+    async def run(config: RAGConfig) -> list:
+        pipeline = _pipeline(config)
+        await pipeline.index_chunks(chunks)
+        out = []
+        for q in queries:
+            context, messages = await pipeline.retrieve(q)
+            out.append(([(sc.chunk.id, sc.score) for sc in context.chunks], messages))
+        return out
+
+    # Any in-scope entry is a hit, so only the scope keeps these apart
+    # (min_relevance_score=0 keeps every ranked chunk in the context)
+    cached = asyncio.run(run(RAGConfig(
+        min_relevance_score=0.0,
+        semantic_cache_size=64, semantic_cache_threshold=-1.0)))
+    uncached = asyncio.run(run(RAGConfig(min_relevance_score=0.0, semantic_cache_size=0)))
+    assert cached == uncached
@@ -0,0 +1,70 @@
+"""int8 InMemoryVectorStore against the float32 store it approximates."""
+import asyncio
+from uuid import uuid4
+
+import numpy as np
+
+from models import DocumentChunk
+from rag_retrieval import InMemoryVectorStore
+
+DIM = 64
+N = 600  # more than one int8 scoring block
+
+
+def _stores(rng: np.random.Generator):
+    vectors = rng.normal(size=(N, DIM)).astype(np.float32)
+    chunks = [
+        DocumentChunk(
+            document_id=uuid4(), chunk_index=i, content=f'chunk {i}',
+            chunk_type=('spec_block', 'description', 'text')[i % 3],
+            metadata={'brand': ('ABS', 'LABRepCo', None)[i // 3 % 3]},
+        )
+        for i in range(N)
+    ]
+    stores = InMemoryVectorStore(), InMemoryVectorStore(quantization='int8')
+
+    async def fill(store):
+        await store.upsert_batch([c.id for c in chunks[:N // 2]], vectors[:N // 2])
+        for c, v in zip(chunks[N // 2:], vectors[N // 2:]):
+            await store.upsert(c.id, v)
+        for c in chunks:
+            store.register_chunk(c)
+
+    for store in stores:
+        asyncio.run(fill(store))
+    return stores
+
+
+def test_int8_scores_are_exact_for_dequantized_rows():
+    rng = np.random.default_rng(11)
+    _, quantized = _stores(rng)
+    dequantized = quantized._matrix[:N].astype(np.float32) * quantized._scales[:N, None]
+    for _ in range(10):
+        query = rng.normal(size=DIM).astype(np.float32)
+        unit = query / np.linalg.norm(query)
+        want = dequantized @ unit
+        got = asyncio.run(quantized.search(query, top_k=N))
+        rows = [quantized._rows[c.id] for c, _ in got]
+        np.testing.assert_allclose([s for _, s in got], want[rows], rtol=1e-5, atol=1e-6)
+        assert sorted(rows) == list(range(N))
+
+
+def test_int8_search_tracks_float32_search():
+    rng = np.random.default_rng(12)
+    exact, quantized = _stores(rng)
+    for filters in (None, {'chunk_types': ['spec_block']}, {'brands': ['ABS']}):
+        for _ in range(10):
+            query = rng.normal(size=DIM).astype(np.float32)
+            want = asyncio.run(exact.search(query, top_k=N, filters=filters))
+            got = dict((c.id, s) for c, s in asyncio.run(
+                quantized.search(query, top_k=N, filters=filters)))
+            # Same rows pass the filters; each score within the int8 error
+            assert got.keys() == {c.id for c, _ in want}
+            for chunk, score in want:
+                assert abs(got[chunk.id] - score) < 0.02
+
+            # The top hit is stable when it clearly leads
+            (first, s1), (_, s2) = want[:2]
+            if s1 - s2 > 0.04:
+                top = asyncio.run(quantized.search(query, top_k=1, filters=filters))
+                assert top[0][0].id == first.id